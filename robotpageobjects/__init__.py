@@ -1,4 +1,4 @@
-from .base import Override, robot_alias, not_keyword
+from .base import Override, robot_alias, not_keyword, not_wrapped
 from .page import Page
 from .component import Component
 
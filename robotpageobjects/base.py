@@ -3,16 +3,28 @@ import re
 import importlib
 import inspect
 import warnings
+from collections import namedtuple
 
-from robot.utils import asserts
+from robot.utils import asserts, timestr_to_secs
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.remote.webelement import WebElement
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from Selenium2Library import Selenium2Library
 from Selenium2Library.keywords.keywordgroup import KeywordGroupMetaClass
 
 from . import abstractedlogger
+from . import domwait
+from . import elementcache
 from . import exceptions
+from . import implicitwait
+from . import selectorprofile
+from . import selectortemplate
+from . import waiting
+from . import xpathtocss
+from .keywordwrapper import wrap_keyword, is_not_wrapped, not_wrapped
+from .locator import Locator, LocatorElementFinder, to_script_locator
+from .monkeypatches import do_monkeypatches
 from .context import Context
 from .optionhandler import OptionHandler
 
@@ -30,6 +42,10 @@ class _Keywords(object):
     _aliases = {}
     _alias_delimiter = "__name__"
 
+    # Bumped whenever an alias is registered, so that caches built from
+    # _aliases (see _KeywordTable.get_alias_index) know to rebuild.
+    aliases_version = 0
+
     has_registered_s2l_keywords = False
 
     @classmethod
@@ -51,32 +67,17 @@ class _Keywords(object):
 
     @classmethod
     def is_obj_keyword_by_name(cls, name, inst):
-        """ Determines whether a given name from the given class instance is a keyword.
-        This is used by `get_keyword_names` in `robotpageobjects.page.Page` to decide
-        what keyword names to report.
+        """ Determines whether a given name from the given class instance is a keyword,
+        by looking it up in the keyword table of its class (see `_KeywordTable`), which
+        is what `get_keyword_names` in `robotpageobjects.page.Page` reports.
         :param name: The name of the member to check
         :type name: str
-        :param inst: The class instance to check (such as a page object)
+        :param inst: The class instance to check (such as a page object), or its class
         :type inst: object
         """
-        obj = None
-        # If obj is a @property as oppose to a regular method or attribute,
-        # its method will be called immediately. This could cause an attempt
-        # to retrieve an element via webdriver, but when this method is called
-        # no browser is open, so that will cause Selenium2Library's decorator
-        # to attempt a screenshot - which will fail, because no browser is open.
-        # To prevent this, we temporarily set inst._has_run_on_failure to True.
-        # (_has_run_on_failure is used by Selenium2Library's decorator to prevent
-        # redundant screenshot attempts.)
-        inst._has_run_on_failure = True
-        try:
-            obj = getattr(inst, name)
-        except Exception:
-            inst._has_run_on_failure = False
-            return False
-        inst._has_run_on_failure = False
-
-        return cls.is_obj_keyword(obj)
+        klass = inst if isinstance(inst, type) else inst.__class__
+        entry = _KeywordTable.for_class(klass).by_name.get(name)
+        return entry is not None and _KeywordTable.is_exposed(entry)
 
     @classmethod
     def is_method_excluded(cls, name):
@@ -112,24 +113,6 @@ class _Keywords(object):
 
         return ret
 
-    @classmethod
-    def get_funcname_from_robot_alias(cls, alias, pageobject_name):
-        """
-        Gets the real method name given a robot alias.
-        :param alias: The name of the alias
-        :type alias: str
-        :param pageobject_name: The placeholder name to replace
-        :type pageobject_name: str
-        :returns: str
-        """
-        # Look for a stub matching the alias in the aliases dict.
-        # If we find one, return the original func name.
-        for fname, stub in cls._aliases.iteritems():
-            if alias == stub.replace(cls._alias_delimiter, "_" + pageobject_name + "_"):
-                return fname
-                # We didn't find a match, so take the class name off the end.
-        return alias.replace("_" + pageobject_name, "")
-
     @classmethod
     def not_keyword(cls, f):
         """
@@ -178,6 +161,7 @@ class _Keywords(object):
 
         def makefunc(f):
             cls._aliases[f.__name__] = stub
+            cls.aliases_version += 1
             return f
 
         return makefunc
@@ -207,6 +191,146 @@ def robot_alias(stub):
     return _Keywords.robot_alias(stub)
 
 
+_KeywordEntry = namedtuple("_KeywordEntry", "name func_name owner in_s2l defined_in_s2l")
+
+
+class _KeywordTable(object):
+    """
+    Per-class table of the methods a page object class can expose as keywords.
+
+    It's built once, by `robotpageobjects.page._PageMeta`, when the class is created,
+    by walking the __dict__ of each class in the MRO. That way `get_keyword_names`
+    and `run_keyword` don't have to call dir() and getattr() on every member of
+    a page object instance, which would also evaluate its properties.
+
+    The entries are never modified after the table is built. Since `not_keyword` and
+    `robot_alias` register names globally, and can be applied after the class is created,
+    exclusions and aliases are looked up when the keyword names are reported, not stored
+    in the entries. The reverse alias indexes used by `run_keyword` are cached on the
+    table and thrown away when an alias is registered.
+
+    Each entry records:
+
+    - name: the attribute name of the method
+    - func_name: the __name__ of the underlying function
+    - owner: the class in the MRO that defines the method
+    - in_s2l: whether the name is one of Selenium2Library's keywords, inherited
+      rather than defined by the class itself
+    - defined_in_s2l: whether the method is Selenium2Library's own implementation
+    """
+
+    # Like the checks get_keyword_names used to do, only look at Selenium2Library
+    # and its direct base classes, not those classes' ancestors.
+    s2l_classes = (Selenium2Library,) + Selenium2Library.__bases__
+    s2l_names = frozenset(name for klass in s2l_classes for name in klass.__dict__)
+
+    def __init__(self, klass):
+        entries = []
+        seen = set()
+        for owner in inspect.getmro(klass):
+            for name, obj in owner.__dict__.iteritems():
+                # The first class in the MRO to define a name shadows the rest,
+                # whether or not what it defines is a method.
+                if name in seen:
+                    continue
+                seen.add(name)
+                func = self._get_function(obj)
+                if func is None or name.startswith("_") or not _Keywords.is_obj_keyword(func):
+                    continue
+                in_s2l = owner is not klass and name in self.s2l_names
+                entries.append(_KeywordEntry(name, func.__name__, owner, in_s2l, owner in self.s2l_classes))
+
+        # Keep the order dir() used to give us.
+        entries.sort(key=lambda entry: entry.name)
+        self.entries = tuple(entries)
+        self.by_name = dict((entry.name, entry) for entry in entries)
+
+        self._alias_indexes = {}
+        self._aliases_version = _Keywords.aliases_version
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def _get_function(obj):
+        """
+        Gets the function that will be bound when the member is looked up on an instance.
+        Properties and static methods are never keywords, so they return None.
+        """
+        if isinstance(obj, classmethod):
+            return obj.__func__
+        elif inspect.isfunction(obj):
+            return obj
+        return None
+
+    @classmethod
+    def for_class(cls, klass):
+        """
+        Gets the keyword table for a class, building it if the class doesn't have one
+        of its own yet.
+        :param klass: The page object class
+        :type klass: type
+        :returns: _KeywordTable
+        """
+        table = klass.__dict__.get("_keyword_table")
+        if table is None:
+            table = cls(klass)
+            klass._keyword_table = table
+        return table
+
+    def get_alias_index(self, pageobject_name):
+        """
+        Gets a dict mapping the @robot_alias names this class exposes for a page object
+        name back to the names of the methods they alias. It's built once per page
+        object name, and rebuilt only when a new alias is registered.
+        :param pageobject_name: The underscored page object name substituted into the aliases
+        :type pageobject_name: str
+        :returns: dict
+        """
+        if self._aliases_version != _Keywords.aliases_version:
+            self._alias_indexes = {}
+            self._aliases_version = _Keywords.aliases_version
+
+        try:
+            return self._alias_indexes[pageobject_name]
+        except KeyError:
+            index = {}
+            for entry in self.entries:
+                if entry.name in _Keywords._aliases:
+                    index[_Keywords.get_robot_aliases(entry.name, pageobject_name)[0]] = entry.name
+            self._alias_indexes[pageobject_name] = index
+            return index
+
+    def get_funcname_from_robot_alias(self, alias, pageobject_name):
+        """
+        Gets the real method name given a robot alias, looking only at the aliases of
+        this class's methods, in the reverse index.
+        :param alias: The name of the alias
+        :type alias: str
+        :param pageobject_name: The placeholder name to replace
+        :type pageobject_name: str
+        :returns: str
+        """
+        try:
+            return self.get_alias_index(pageobject_name)[alias]
+        except KeyError:
+            # Not an @robot_alias name, so take the page object name off the end.
+            return alias.replace("_" + pageobject_name, "")
+
+    @staticmethod
+    def is_exposed(entry):
+        """
+        Checks whether a keyword table entry has been excluded with `not_keyword`.
+        :param entry: The entry to check
+        :type entry: _KeywordEntry
+        :returns: bool
+        """
+        return not (_Keywords.is_method_excluded(entry.name) or _Keywords.is_method_excluded(entry.func_name))
+
+
 class Override(object):
     def __init__(self, obj):
         self.obj = obj
@@ -260,18 +384,50 @@ class KeyUniquenessDict(dict):
             self.add(key, value)
 
 
+class _KeywordGroupMeta(KeywordGroupMetaClass):
+    """
+    Meta class that wraps the public methods of page objects and components,
+    like Selenium2Library's KeywordGroupMetaClass does for its keywords, but with
+    `keywordwrapper.wrap_keyword`. That wrapper also does the "must return" check
+    for page object keywords, so there's only one wrapper per method. Methods decorated
+    with `not_wrapped` are left as they are.
+    """
+
+    @classmethod
+    def _is_must_return(cls, func):
+        """
+        Whether calling `func` should raise an exception if it returns None.
+        See `robotpageobjects.page._PageMeta`.
+        """
+        return False
+
+    def __new__(cls, name, bases, classdict):
+        for member_name, obj in classdict.items():
+            if not member_name.startswith("_") and inspect.isfunction(obj) and not is_not_wrapped(obj):
+                classdict[member_name] = wrap_keyword(obj, cls._is_must_return(obj))
+
+        # Skip KeywordGroupMetaClass.__new__, since it would wrap the methods again.
+        return type.__new__(cls, name, bases, classdict)
+
+
 class _S2LWrapper(Selenium2Library):
     """
     Helper class that wraps Selenium2Library and manages the browser cache.
     """
+    __metaclass__ = _KeywordGroupMeta
 
     def __init__(self, *args, **kwargs):
+        # Patch Selenium2Library before its first instance is created, not on import.
+        do_monkeypatches()
+
         if not Context.in_robot():
             kwargs["run_on_failure"] = "Nothing"
             # S2L checks if its "run_on_failure" keyword is "Nothing". If it is, it won't do anything on failure.
             # We need this to prevent S2L from attempting to take a screenshot outside Robot.
-        else:
+        elif not Context.has_current_page():
             # This is for disambiguating keywords that are defined in multiple libraries.
+            # Once a page is current, page objects and components built inside keywords
+            # shouldn't reset the search order.
             Context.set_current_page("Selenium2Library")
 
         # Use Selenium2Library's cache for our page objects. That way you can run a keyword from any page object,
@@ -294,6 +450,7 @@ class _S2LWrapper(Selenium2Library):
             return None
 
     @not_keyword
+    @not_wrapped
     def get_current_browser(self):
         """
         Legacy wrapper for self.driver
@@ -306,13 +463,132 @@ class SelectorsDict(KeyUniquenessDict):
     def add(self, key, value):
         self[str(key)] = value
 
+    @staticmethod
+    def _get_references(value):
+        """
+        Gets the keys a selector refers to with the %(key)s syntax.
+        """
+        if isinstance(value, (list, tuple)):
+            return [ref for alternative in value for ref in SelectorsDict._get_references(alternative)]
+        if not isinstance(value, basestring):
+            return []
+        refs = []
+        i = value.find("%")
+        while i != -1 and i + 1 < len(value):
+            if value[i + 1] == "(":
+                # Like Python's % formatting, allow parentheses in the key if they're balanced.
+                depth = 1
+                j = i + 2
+                while j < len(value) and depth:
+                    if value[j] == "(":
+                        depth += 1
+                    elif value[j] == ")":
+                        depth -= 1
+                    j += 1
+                refs.append(value[i + 2:j - 1])
+                i = value.find("%", j)
+            else:
+                # "%%", or a conversion without a key.
+                i = value.find("%", i + 2)
+        return refs
+
+    @staticmethod
+    def _expand(key, value, resolved):
+        """
+        Expands a selector's references to other selectors, which must already be expanded.
+        A list of alternative locators is expanded into a tuple.
+        """
+        if isinstance(value, (list, tuple)):
+            return tuple(SelectorsDict._expand(key, alternative, resolved) for alternative in value)
+        if not isinstance(value, basestring) or "%" not in value:
+            return value
+        for ref in SelectorsDict._get_references(value):
+            if isinstance(resolved.get(ref), tuple):
+                raise exceptions.SelectorError("Selector \"%s\" refers to selector \"%s\", which is a list of "
+                                               "alternatives, so can't be part of another locator." % (key, ref))
+        try:
+            return value % resolved
+        except KeyError, e:
+            raise exceptions.SelectorError("Selector \"%s\" refers to selector \"%s\", which isn't defined."
+                                           % (key, e.args[0]))
+        except (TypeError, ValueError), e:
+            raise exceptions.SelectorError("Selector \"%s\" isn't a valid selector: %s" % (key, e))
+
+    def resolve(self):
+        """
+        Expands the %(key)s references between the selectors, once.
+        Raises exceptions.SelectorError if a selector refers to one that isn't
+        defined, or if selectors refer to each other in a cycle.
+        :returns: ResolvedSelectorsDict
+        """
+        raw = dict(self)
+        resolved = {}
+        for key in raw:
+            if key in resolved:
+                continue
+
+            # Resolve what the selector refers to depth first, without recursing, so that
+            # long chains of references can't hit the recursion limit.
+            path = [key]
+            on_path = set(path)
+            stack = [(key, iter(self._get_references(raw[key])))]
+            while stack:
+                name, refs = stack[-1]
+                for ref in refs:
+                    if ref in resolved:
+                        continue
+                    elif ref not in raw:
+                        raise exceptions.SelectorError(
+                            "Selector \"%s\" refers to selector \"%s\", which isn't defined." % (name, ref))
+                    elif ref in on_path:
+                        cycle = path[path.index(ref):] + [ref]
+                        raise exceptions.SelectorError(
+                            "Selectors refer to each other in a cycle: %s" % " -> ".join('"%s"' % k for k in cycle))
+                    path.append(ref)
+                    on_path.add(ref)
+                    stack.append((ref, iter(self._get_references(raw[ref]))))
+                    break
+                else:
+                    stack.pop()
+                    on_path.discard(path.pop())
+                    resolved[name] = self._expand(name, raw[name], resolved)
+        return ResolvedSelectorsDict(resolved)
+
+
+class ResolvedSelectorsDict(SelectorsDict):
+    """
+    Selectors whose %(key)s references have been expanded by `SelectorsDict.resolve`,
+    so that looking up a selector is a plain dict read. Selectors added later are
+    expanded when they're added, using the selectors already there.
+    """
+
+    __getitem__ = dict.__getitem__
+
+    # The selectors rewritten from XPath to CSS, by name, as (XPath, CSS) tuples.
+    # See _ComponentsManagerMeta._compile_selectors.
+    compiled = {}
+
+    def __setitem__(self, key, value):
+        references = self
+        if self.compiled:
+            # Refer to rewritten selectors as they were written, since they're usually extended with more XPath.
+            references = dict(self)
+            for name, (xpath, css) in self.compiled.iteritems():
+                if references.get(name) == css:
+                    references[name] = xpath
+        dict.__setitem__(self, key, self._expand(key, value, references))
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).iteritems():
+            self[key] = value
+
 
 class ComponentsDict(KeyUniquenessDict):
     dict_type = "component"
     def add(self, key, value):
         self[key] = value
 
-class _ComponentsManagerMeta(KeywordGroupMetaClass):
+class _ComponentsManagerMeta(_KeywordGroupMeta):
     @classmethod
     def _get_class_components(cls, bases, classdict):
         def get_components(cdict, cbases):
@@ -366,10 +642,78 @@ class _ComponentsManagerMeta(KeywordGroupMetaClass):
             if singular_name not in classdict:
                 classdict[singular_name] = property(mkfnc_singular(component_class))
 
+    @classmethod
+    def _get_class_selectors(cls, klass):
+        """
+        Gets the selectors from a class and all its ancestors, merged, overriding any
+        ancestors' selectors with subclasses' selectors. Classes created by this meta
+        class keep their merged selectors in _class_selectors, so they're merged (and any
+        KeyOverrideWarning is raised) once per class, not every time a page object or
+        component is created.
+        """
+        try:
+            return klass.__dict__["_class_selectors"]
+        except KeyError:
+            pass
+
+        all_selectors = SelectorsDict()
+        own_selectors = klass.__dict__.get("selectors", {})
+
+        # Get all the selectors dicts defined by the bases
+        base_dicts = [cls._get_class_selectors(base) for base in klass.__bases__ if hasattr(base, "selectors")]
+
+        # Add the selectors for the bases to the return dict
+        [all_selectors.merge(base_dict) for base_dict in base_dicts]
+
+        # Update the return dict with this class's selectors, overriding the bases
+        all_selectors.merge(own_selectors, from_subclass=True)
+        return all_selectors
+
+    @classmethod
+    def _get_resolved_selectors(cls, klass):
+        """
+        Gets a class's merged selectors with their references to each other expanded.
+        A subclass can override a selector its ancestors' selectors refer to, so
+        they're expanded for each class, from the class's merged selectors.
+        See SelectorsDict.resolve.
+        """
+        try:
+            return klass.__dict__["_resolved_selectors"]
+        except KeyError:
+            return cls._get_class_selectors(klass).resolve()
+
+    @classmethod
+    def _compile_selectors(cls, klass):
+        """
+        If the class's xpath_to_css is set, rewrites the XPath selectors in its resolved
+        selectors that have a CSS equivalent into CSS selectors. See robotpageobjects.xpathtocss.
+        :returns: A dict of the rewritten selectors' names to their (XPath, CSS) locators
+        """
+        if not getattr(klass, "xpath_to_css", False):
+            return {}
+        resolved = klass.__dict__["_resolved_selectors"]
+        compiled = {}
+        for key, value in resolved.iteritems():
+            if isinstance(value, tuple):
+                css = tuple(xpathtocss.compile_locator(alternative, scoped=klass._selectors_scoped) or alternative
+                            for alternative in value)
+                css = None if css == value else css
+            else:
+                css = xpathtocss.compile_locator(value, scoped=klass._selectors_scoped)
+            if css is not None:
+                compiled[key] = (value, css)
+        for key, (xpath, css) in compiled.iteritems():
+            dict.__setitem__(resolved, key, css)
+        return compiled
+
     def __new__(cls, name, bases, classdict):
         components = cls._get_class_components(bases, classdict)
         cls._set_components(components, classdict)
-        return KeywordGroupMetaClass.__new__(cls, name, bases, classdict)
+        klass = _KeywordGroupMeta.__new__(cls, name, bases, classdict)
+        klass._class_selectors = cls._get_class_selectors(klass)
+        klass._resolved_selectors = cls._get_resolved_selectors(klass)
+        klass._compiled_selectors = cls._compile_selectors(klass)
+        return klass
 
 
 class _ComponentsManager(object):
@@ -470,36 +814,34 @@ class _SelectorsManager(object):
 
     selectors = {}
 
+    # Whether to rewrite XPath selectors that have a CSS equivalent, like "xpath=//div[@id='results']",
+    # into CSS selectors, like "css=div#results", when the class is created. Browsers find elements by
+    # CSS selector faster. See robotpageobjects.xpathtocss.
+    xpath_to_css = False
+
+    # Whether selectors are searched for inside an element, rather than the whole page.
+    _selectors_scoped = False
+
     def __init__(self, *args, **kwargs):
         """
         Set instance selectors according to the class hierarchy.
         See _get_class_selectors.
         """
         super(_SelectorsManager, self).__init__(*args, **kwargs)
-        self.selectors = self._get_class_selectors()
+        # The merged selectors are shared by every instance of the class. Each instance
+        # gets a (shallow, and cheap) copy, so that adding a selector to one instance
+        # doesn't add it to the others.
+        self.selectors = ResolvedSelectorsDict(_ComponentsManagerMeta._get_resolved_selectors(self.__class__))
+        self.selectors.compiled = self.__class__.__dict__.get("_compiled_selectors", {})
 
     def _get_class_selectors(self):
         """
         Get the selectors from all parent classes and merge them,
         overriding any parent classes' selectors with subclasses'
-        selectors.
+        selectors. They're merged when the class is created.
+        See _ComponentsManagerMeta._get_class_selectors.
         """
-
-        def __get_class_selectors(klass):
-            all_selectors = SelectorsDict()
-            own_selectors = klass.__dict__.get("selectors", {})
-
-            # Get all the selectors dicts defined by the bases
-            base_dicts = [__get_class_selectors(base) for base in klass.__bases__ if hasattr(base, "selectors")]
-
-            # Add the selectors for the bases to the return dict
-            [all_selectors.merge(base_dict) for base_dict in base_dicts]
-
-            # Update the return dict with this class's selectors, overriding the bases
-            all_selectors.merge(own_selectors, from_subclass=True)
-            return all_selectors
-        sels = __get_class_selectors(self.__class__)
-        return sels
+        return _ComponentsManagerMeta._get_class_selectors(self.__class__)
 
     def resolve_selector(self, selector, **kwargs):
         """ Expands a selector template and returns a locator
@@ -526,11 +868,18 @@ class _SelectorsManager(object):
         """
 
         template = self.selectors[selector]
-        try:
-            return template.format(**kwargs)
-        except KeyError:
-            raise exceptions.SelectorError("Variables {vars} don't match template {template}".format(vars=kwargs,
-                                                                                                     template=template))
+        if isinstance(template, tuple):
+            return selectortemplate.resolve_alternatives(selector, template, kwargs)
+        return selectortemplate.resolve(selector, template, kwargs)
+
+# How find_element finds an element: "strict" checks, in the browser, that the locator matches only
+# one element, and "first" gets the first element the locator matches.
+FIND_ELEMENT_MODES = ("strict", "first")
+
+# How page objects wait for elements: "implicit" sets the browser's implicit wait, and "client"
+# leaves it at 0 and polls for elements. See robotpageobjects.waiting.
+WAIT_ENGINES = ("implicit", "client")
+
 
 class _BaseActions(_S2LWrapper):
     """
@@ -539,6 +888,12 @@ class _BaseActions(_S2LWrapper):
 
     _abstracted_logger = abstractedlogger.Logger()
 
+    # Whether to keep the first element found for each locator until the browser navigates, so that finding
+    # it again, eg. in find_element, then get_text, then click_element, doesn't go to the browser. If the
+    # browser says a kept element is stale, it's found again, once. Finds that don't require the element,
+    # like is_element_present, aren't cached. See robotpageobjects.elementcache.
+    cache_elements = False
+
     def __init__(self, *args, **kwargs):
         """
         Initializes the options used by the actions defined in this class.
@@ -547,17 +902,35 @@ class _BaseActions(_S2LWrapper):
         #_SelectorsManager.__init__(self, *args, **kwargs)
         super(_BaseActions, self).__init__(*args, **kwargs)
 
+        # Find elements with parsed locators, including in Selenium2Library's keywords.
+        self._element_finder = LocatorElementFinder()
+
         self._option_handler = OptionHandler(self)
         self._is_robot = Context.in_robot()
+        self._log_compiled_selectors()
         self.selenium_speed = self._option_handler.get("selenium_speed") or 0
         self.set_selenium_speed(self.selenium_speed)
         siw_opt = self._option_handler.get("selenium_implicit_wait")
         self.selenium_implicit_wait = siw_opt if siw_opt is not None else 10
-        self.set_selenium_implicit_wait(self.selenium_implicit_wait)
+
+        self.wait_engine = self._option_handler.get("wait_engine") or "implicit"
+        if self.wait_engine not in WAIT_ENGINES:
+            raise ValueError("wait_engine must be one of %s, not \"%s\""
+                             % (", ".join(WAIT_ENGINES), self.wait_engine))
+        self.wait_poll_interval = float(self._option_handler.get("wait_poll_interval") or 0.1)
+        self.wait_backoff = float(self._option_handler.get("wait_backoff") or 1.5)
+
+        # With the client wait engine, selenium_implicit_wait is only how long to poll for.
+        self.set_selenium_implicit_wait(0 if self.wait_engine == "client" else self.selenium_implicit_wait)
         self.set_selenium_timeout(self.selenium_implicit_wait)
 
         self.baseurl = self._option_handler.get("baseurl")
 
+        self.find_element_mode = self._option_handler.get("find_element_mode") or "strict"
+        if self.find_element_mode not in FIND_ELEMENT_MODES:
+            raise ValueError("find_element_mode must be one of %s, not \"%s\""
+                             % (", ".join(FIND_ELEMENT_MODES), self.find_element_mode))
+
     def log(self, msg, level="INFO", is_console=True):
         """ Logs either to Robot log file or to a file called po_log.txt
         at the current directory.
@@ -613,6 +986,19 @@ class _BaseActions(_S2LWrapper):
         self._abstracted_logger.log(msg, page_name, level, is_console)
         return self
 
+    def _log_compiled_selectors(self):
+        """
+        Logs the selectors rewritten from XPath to CSS, at DEBUG level, for the first
+        instance of each class. See _SelectorsManager.xpath_to_css.
+        """
+        klass = self.__class__
+        if not klass.__dict__.get("_compiled_selectors") or klass.__dict__.get("_compiled_selectors_logged"):
+            return
+        klass._compiled_selectors_logged = True
+        for key, (xpath, css) in sorted(klass._compiled_selectors.iteritems()):
+            self._log("Selector \"%s\" rewritten from %s to %s" % (key, xpath, css), klass.__name__, "DEBUG",
+                      is_console=False)
+
     def wait_until_alert_is_present(self, timeout=None):
         alert_present = False
         self.wait_for(lambda: EC.alert_is_present(), timeout=timeout,
@@ -642,17 +1028,24 @@ class _BaseActions(_S2LWrapper):
     def wait_for(self, condition, timeout=None, message=''):
         """
         Waits for a condition defined by the passed function to become True.
+        Conditions on elements from robotpageobjects.domwait, like domwait.element_visible("results"),
+        and combinations of them, are waited for in the browser, which checks them whenever the page changes.
         :param condition: The condition to wait for
-        :type condition: callable
+        :type condition: callable, or robotpageobjects.domwait.Condition or Compound
         :param timeout: How long to wait for the condition, defaults to the selenium implicit wait
         :type condition: number
         :param message: Message to show if the wait times out
         :type condition: string
         :returns: None
         """
-        wait = WebDriverWait(self.get_current_browser(), timeout or self.selenium_implicit_wait)
-
-        def wait_fnc(driver):
+        if isinstance(condition, (domwait.Condition, domwait.Compound)):
+            if self._wait_for_in_browser(condition, timeout or self.selenium_implicit_wait, message):
+                return self
+            # The browser can't find the condition's elements with a script, so poll for it.
+            check = condition.check
+            condition = lambda: check(self)
+
+        def wait_fnc(driver=None):
             try:
                 ret = condition()
             except AssertionError as e:
@@ -660,9 +1053,84 @@ class _BaseActions(_S2LWrapper):
             else:
                 return ret
 
+        if self.wait_engine == "client":
+            if not self._poll(wait_fnc, timeout or self.selenium_implicit_wait):
+                raise TimeoutException(message)
+            return self
+
+        wait = WebDriverWait(self.get_current_browser(), timeout or self.selenium_implicit_wait)
         wait.until(wait_fnc, message)
         return self
 
+    def _wait_for_in_browser(self, condition, timeout, message=''):
+        """
+        Waits for a condition on elements in the browser. See wait_for and robotpageobjects.domwait.
+        :returns: False if the condition's locator can't be found with a script, or True once it holds
+        """
+        def resolve(locator):
+            if isinstance(locator, list):
+                locator = tuple(locator)
+            return self.resolve_selector(locator) if locator in self.selectors else locator
+
+        resolved = condition.resolve(resolve)
+        try:
+            for locator in resolved.get_locators():
+                to_script_locator(locator)
+        except ValueError:
+            return False
+        held, paths = domwait.wait(self._current_browser(), self._element_finder, resolved,
+                                   timestr_to_secs(timeout), self._timeout_in_secs)
+        if not held:
+            failed = [condition.get(path) for path in paths]
+            raise TimeoutException(message or "Timed out after %s waiting for %s. Not met: %s"
+                                   % (self._format_timeout(timeout), condition, ", ".join(map(str, failed))))
+        return True
+
+    @not_keyword
+    def wait_for_all(self, *conditions, **kwargs):
+        """
+        Waits until all of several conditions on elements hold, checking them all in the browser
+        whenever the page changes. See wait_for.
+        :param conditions: Conditions from robotpageobjects.domwait, eg. domwait.element_visible("results")
+        :param timeout: How long to wait for the conditions, defaults to the selenium implicit wait
+        :param message: Message to show if the wait times out, instead of which conditions weren't met
+        :returns: self
+        """
+        return self.wait_for(domwait.all_of(*conditions), **kwargs)
+
+    @not_keyword
+    def wait_for_any(self, *conditions, **kwargs):
+        """
+        Waits until any of several conditions on elements holds. See wait_for_all.
+        :returns: self
+        """
+        return self.wait_for(domwait.any_of(*conditions), **kwargs)
+
+    def _poll(self, condition, timeout):
+        """
+        Calls `condition` until it returns something true, or `timeout` seconds have passed,
+        with the wait_poll_interval and wait_backoff options. See robotpageobjects.waiting.
+        :returns: What `condition` last returned
+        """
+        return waiting.poll(condition, timeout, self.wait_poll_interval, self.wait_backoff)
+
+    def _wait_until_no_error(self, timeout, wait_func, *args):
+        """
+        Overrides Selenium2Library's _wait_until_no_error(), which Selenium2Library's waiting keywords
+        poll with, to poll with the wait_poll_interval and wait_backoff options, with the client wait engine.
+        """
+        if self.wait_engine != "client":
+            return super(_BaseActions, self)._wait_until_no_error(timeout, wait_func, *args)
+        timeout = timestr_to_secs(timeout) if timeout is not None else self._timeout_in_secs
+        errors = []
+
+        def no_error():
+            errors[:] = [wait_func(*args)]
+            return not errors[0]
+
+        if not self._poll(no_error, timeout):
+            raise AssertionError(errors[0])
+
     @robot_alias("get_hash_on__name__")
     def get_hash(self):
         """
@@ -691,7 +1159,7 @@ class _BaseActions(_S2LWrapper):
         """
         return self._is_visible(selector)
 
-    def _element_find(self, locator, *args, **kwargs):
+    def _element_find(self, locator, first_only, required, tag=None, wait=None):
         """
         Override built-in _element_find() method and intelligently
         determine the locator for a passed-in selector name.
@@ -705,38 +1173,130 @@ class _BaseActions(_S2LWrapper):
         :param locator: The Selenium2Library-style locator, or IFT selector
                         or WebElement (if the element has already been identified).
         :type locator: str or WebElement
+        :param wait: How long to wait for the element, in seconds. Defaults to selenium_implicit_wait.
         :returns: WebElement or list
         """
         if isinstance(locator, WebElement):
             return locator
 
-        our_wait = self.selenium_implicit_wait if kwargs.get("wait") is None else kwargs["wait"]
-
-        # If wait is set, don't pass it along to the super classe's implementation, since it has none.
-        if "wait" in kwargs:
-            del kwargs["wait"]
-
-
-        self.driver.implicitly_wait(our_wait)
-        
+        if wait is None:
+            if self.wait_engine == "client" and not required:
+                # Checks like is_visible only ask whether the element is there now.
+                wait = 0
+            else:
+                wait = self.selenium_implicit_wait
 
+        if isinstance(locator, list):
+            locator = tuple(locator)
         if locator in self.selectors:
             locator = self.resolve_selector(locator)
 
+        # Finds that don't require the element, like is_element_present, ask whether it's there now,
+        # so they always go to the browser.
+        if self.cache_elements and isinstance(locator, basestring) and first_only and required:
+            return self._element_find_cached(locator, wait, required, tag)
+
+        return self._element_find_uncached(locator, wait, first_only, required, tag)
+
+    def _element_find_uncached(self, locator, wait, first_only, required, tag=None):
+        """
+        Finds elements with a locator, or a tuple of alternative locators, in the browser,
+        waiting up to `wait` seconds. See _element_find.
+        """
+        client = self.wait_engine == "client"
+        implicitwait.implicitly_wait(self.driver, 0 if client else wait)
         try:
-            return super(_BaseActions, self)._element_find(locator, *args, **kwargs)
+            if isinstance(locator, tuple):
+                return self._element_find_first(locator, wait, first_only, required, tag)
+            if client and wait:
+                find = lambda: super(_BaseActions, self)._element_find(locator, first_only, False, tag)
+                ret = self._poll(find, wait)
+                if ret:
+                    return ret
+            # Found, or, if nothing was found, raises Selenium2Library's error if required.
+            return super(_BaseActions, self)._element_find(locator, first_only, required, tag)
         except ValueError:
-            if not self._is_locator_format(locator):
+            if not isinstance(locator, tuple) and not self._is_locator_format(locator):
                 # Not found, doesn't look like a locator, not in selectors dict
                 raise exceptions.SelectorError(
                     "\"%s\" is not a valid locator. If this is a selector name, make sure it is spelled correctly." % locator)
             else:
                 raise
         finally:
-            self.driver.implicitly_wait(self.selenium_implicit_wait)
+            implicitwait.implicitly_wait(self.driver, 0 if client else self.selenium_implicit_wait)
+
+    def _element_find_cached(self, locator, wait, required, tag=None):
+        """
+        Finds the first element a locator matches, or gets it from the browser's element cache,
+        if it was found since the browser last navigated. See cache_elements.
+        """
+        browser = self._current_browser()
+        cache = elementcache.get_cache(browser)
+        # Components find elements inside their reference element, so it's part of the key.
+        context = self._element_finder.get_script_context(browser, [locator])
+        key = (locator, tag, None if context is None else context.id)
+        element = cache.get(key)
+        if element is not None:
+            return element
+        element = self._element_find_uncached(locator, wait, True, required, tag)
+        if element is None:
+            return None
+        # The element was there, so finding it again doesn't wait for it.
+        find = lambda: self._element_find_uncached(locator, 0, True, False, tag)
+        return cache.put(key, elementcache.CachedWebElement(element, find, cache, key))
 
     @not_keyword
-    def find_element(self, locator, required=True, wait=None, **kwargs):
+    def get_element_cache_stats(self):
+        """
+        Gets how often finding an element got it from the browser's element cache, how often
+        it had to be found in the browser, and how many times the cache was emptied, because
+        the browser navigated or an element was stale. See cache_elements.
+        :returns: dict with "hits", "misses", "invalidations" and "size" keys
+        """
+        return elementcache.get_cache(self._current_browser()).get_stats()
+
+    def _element_find_first(self, locators, wait, first_only, required, tag=None):
+        """
+        Finds elements with the first of a tuple of alternative locators that matches any,
+        with one script run in the browser each try, waiting up to `wait` seconds for one
+        of them to match, polling like wait_for. See LocatorElementFinder.find_first.
+        """
+        browser = self._current_browser()
+        elements = self._poll(lambda: self._element_finder.find_first(browser, locators, tag)[1], wait)
+        if required and not elements:
+            raise ValueError("None of the element locators %s matched any elements."
+                             % ", ".join("'%s'" % alternative for alternative in locators))
+        if first_only:
+            return elements[0] if elements else None
+        return elements
+
+    def _find_one(self, locator, strict):
+        """
+        Finds the first element a locator or selector name matches with one script run in the browser,
+        which counts the elements matched there, rather than sending them all back. Doesn't wait.
+        See find_element.
+        :returns: WebElement, or None if nothing matched yet, or the locator can't be found with a script
+        """
+        if isinstance(locator, WebElement):
+            return locator
+        if not isinstance(locator, basestring):
+            return None
+        if locator in self.selectors:
+            locator = self.resolve_selector(locator)
+            if not isinstance(locator, basestring):
+                return None
+        try:
+            element, count = self._element_finder.find_one(self._current_browser(), locator)
+        except (ValueError, WebDriverException):
+            # Not a strategy the script knows, or not valid. Finding it the usual way says why.
+            return None
+        if strict and count > 1:
+            raise exceptions.SelectorError(
+                "\"%s\" found %s elements. If this is expected, use \"find_elements\" instead" % (locator, count))
+        return element
+
+    @not_keyword
+    def find_element(self, locator, required=True, wait=None, mode=None, **kwargs):
         """
         Wraps Selenium2Library's protected _element_find() method to find single elements.
         TODO: Incorporate selectors API into this.
@@ -747,13 +1307,30 @@ class _BaseActions(_S2LWrapper):
         :param wait: Maximum Time in seconds to wait until the element exists. By default the implicit wait is 10
         seconds for any element finding method, including Se2lib methods. Passing a wait to find_element overrides
         this.
+        :param mode: "strict" to raise a SelectorError if more than one element matches, or "first" to get the
+        first element that matches. Defaults to the find_element_mode option, which defaults to "strict".
+        :type mode: str
         :returns: WebElement instance
         """
+        mode = self.find_element_mode if mode is None else mode
+        if mode not in FIND_ELEMENT_MODES:
+            raise ValueError("mode must be one of %s, not \"%s\"" % (", ".join(FIND_ELEMENT_MODES), mode))
+
+        if mode == "first" and self.cache_elements:
+            return self._element_find(locator, True, required, wait=wait, **kwargs)
+        if not kwargs:
+            element = self._find_one(locator, mode == "strict")
+            if element is not None:
+                return element
+
+        # Nothing matched yet, so wait for it.
+        if mode == "first":
+            return self._element_find(locator, True, required, wait=wait, **kwargs)
         ret = self._element_find(locator, first_only=False, required=required, wait=wait, **kwargs)
         if len(ret) > 1:
             raise exceptions.SelectorError(
                 "\"%s\" found more than one element. If this is expected, use \"find_elements\" instead" % locator)
-        return ret[0]
+        return ret[0] if ret else None
 
     @not_keyword
     def find_elements(self, locator, required=True, wait=None, **kwargs):
@@ -771,6 +1348,63 @@ class _BaseActions(_S2LWrapper):
         """
         return self._element_find(locator, first_only=False, required=required, wait=wait, **kwargs)
 
+    @not_keyword
+    def find_elements_batch(self, names_or_locators, required=True, wait=None):
+        """
+        Finds the elements of several selectors or locators with one script run in the browser, rather
+        than a round trip to the browser for each, eg. to read every field of a page. Each try finds all
+        of them, and they're tried again, polling like wait_for, until each matches an element, for up
+        to `wait` seconds.
+        :param names_or_locators: Selector names and locators, which can be lists of alternative locators
+        :type names_or_locators: list
+        :param required: Optional parameter indicating whether an exception should be raised if any of them match no elements. Defaults to True.
+        :type required: boolean
+        :param wait: Maximum time in seconds to wait until each of them matches an element. Defaults to the implicit wait.
+        :returns: dict of lists of WebElements, by the selector name or locator given, with lists as tuples
+        """
+        keys = [tuple(key) if isinstance(key, list) else key for key in names_or_locators]
+        locators = []
+        for key in keys:
+            locator = self.resolve_selector(key) if key in self.selectors else key
+            for alternative in locator if isinstance(locator, tuple) else (locator,):
+                try:
+                    to_script_locator(alternative)
+                except ValueError, e:
+                    raise exceptions.SelectorError("\"%s\" can't be found in a batch: %s" % (key, e))
+            locators.append(locator)
+
+        browser = self._current_browser()
+        results = []
+
+        def find():
+            results[:] = self._element_finder.find_batch(browser, locators)
+            return all(results)
+
+        self._poll(find, self.selenium_implicit_wait if wait is None else wait)
+        missing = [key for key, elements in zip(keys, results) if not elements]
+        if required and missing:
+            for key in missing:
+                if isinstance(key, basestring) and key not in self.selectors and not self._is_locator_format(key):
+                    # Not found, doesn't look like a locator, not in selectors dict
+                    raise exceptions.SelectorError(
+                        "\"%s\" is not a valid locator. If this is a selector name, make sure it is spelled correctly." % key)
+            raise ValueError("%s matched no elements."
+                             % ", ".join("\"%s\"" % (key,) for key in missing))
+        return dict(zip(keys, results))
+
+    @not_keyword
+    def profile_selectors(self, repeat=10):
+        """
+        Times finding the elements of each of this page object's selectors in the browser,
+        against the page as it is, to find slow selectors. Each is found `repeat` times by a
+        script that times itself, so WebDriver's round trips aren't counted.
+        See robotpageobjects.selectorprofile.
+        :param repeat: How many times to find each selector's elements
+        :type repeat: int
+        :returns: list of robotpageobjects.selectorprofile.SelectorCost, slowest first
+        """
+        return selectorprofile.profile(self, repeat)
+
     @not_keyword
     def get_subclass_from_po_module(self, module_name, super_class, fallback_to_super=True):
         """Given `module_name`, try to import it and find in it a subclass of
@@ -805,9 +1439,7 @@ class _BaseActions(_S2LWrapper):
         :type locator: str
 
         """
-        finder = self._element_finder
-        prefix = finder._parse_locator(locator)[0]
-        return prefix is not None or locator.startswith("//")
+        return Locator.parse(locator).is_locator_format
 
     def location_should_be(self, expected_url):
         """
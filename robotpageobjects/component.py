@@ -1,9 +1,9 @@
 from .base import _BaseActions, _SelectorsManager, _ComponentsManager, not_keyword
-from Selenium2Library.locators.elementfinder import ElementFinder
+from .locator import LocatorElementFinder
 
 
 
-class _ComponentElementFinder(ElementFinder):
+class _ComponentElementFinder(LocatorElementFinder):
     """Overrides the element finder class that SE2Lib's
     _element_find uses so that we can pass the reference webelement
     instead of the driver. This allows us to limit our DOM search
@@ -16,15 +16,16 @@ class _ComponentElementFinder(ElementFinder):
         super(_ComponentElementFinder, self).__init__()
         self._reference_webelement = webelement
 
-    def find(self, browser, locator, tag=None):
-        prefix = self._parse_locator(locator)[0]
-        if prefix == "dom" or prefix == "sizzle" or prefix == "jquery":
-            return super(_ComponentElementFinder, self).find(browser, locator, tag=tag)
-        else:
-            return super(_ComponentElementFinder, self).find(self._reference_webelement, locator, tag=tag)
+    def _get_search_context(self, browser, locator):
+        # Locators the browser evaluates, like "dom=...", are searched for globally.
+        return self._reference_webelement if locator.scoped else browser
 
 
 class Component(_BaseActions, _SelectorsManager, _ComponentsManager):
+
+    # Components search for their selectors inside their reference element.
+    _selectors_scoped = True
+
     def __init__(self, reference_webelement, *args, **kwargs):
         for base in Component.__bases__:
             base.__init__(self, *args, **kwargs)
@@ -1,8 +1,5 @@
 from robot.libraries.BuiltIn import BuiltIn
 from robot.running.context import EXECUTION_CONTEXTS
-from monkeypatches import do_monkeypatches
-
-do_monkeypatches()
 
 class Context(object):
     """
@@ -48,10 +45,56 @@ class Context(object):
     def get_cache(cls):
         return cls._cache
 
+    # Maps page object class names to the names of the libraries they were imported as.
+    # It's only valid for the namespace and number of imported libraries stored with it.
+    _library_names = None
+
+    @staticmethod
+    def _get_namespace():
+        return EXECUTION_CONTEXTS.current.namespace
+
+    @staticmethod
+    def _get_search_order(namespace):
+        # Robot has no public way to read a namespace's library search order.
+        return getattr(getattr(namespace, "_kw_store", None), "search_order", None)
+
     @classmethod
     def set_current_page(cls, name):
-        BuiltIn().set_library_search_order(name)
+        """
+        Sets Robot's library search order so that keywords defined by more than one
+        library are looked up in library `name` first. Robot keeps a search order per
+        suite namespace, so this does nothing if the current namespace's search order
+        is already just `name`, including when a suite set it with Set Library Search Order.
+        """
+        namespace = cls._get_namespace()
+        if cls._get_search_order(namespace) != (name,):
+            BuiltIn().set_library_search_order(name)
+        cls._current_page = (namespace, name)
+
+    @classmethod
+    def has_current_page(cls):
+        """
+        Whether a library search order has been set in the current namespace.
+        """
+        return cls._current_page is not None and cls._current_page[0] is cls._get_namespace()
 
     @classmethod
     def get_libraries(cls):
-        return [lib.name for lib in EXECUTION_CONTEXTS.current.namespace.libraries]
+        return [lib.name for lib in cls._get_namespace().libraries]
+
+    @classmethod
+    def get_library_name(cls, classname):
+        """
+        Gets the name of the imported library whose class is named `classname`,
+        or None if there isn't one. Library names are resolved once per namespace,
+        and again whenever another library is imported.
+        """
+        namespace = cls._get_namespace()
+        libraries = namespace.libraries
+        if cls._library_names is None or cls._library_names[:2] != (namespace, len(libraries)):
+            resolved = {}
+            for lib in libraries:
+                # A library is named for its module and class, eg. "mypageobjects.MyPage".
+                resolved[lib.name.split(".")[-1]] = lib.name
+            cls._library_names = (namespace, len(libraries), resolved)
+        return cls._library_names[2].get(classname)
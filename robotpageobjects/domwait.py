@@ -0,0 +1,298 @@
+"""
+Responsible for waiting for conditions on a page's elements in the browser, as the page changes,
+rather than polling for them. See `robotpageobjects.base._BaseActions.wait_for`.
+
+`wait_for` polls a Python callable, with WebDriverWait, every half second by default, so a condition
+is seen to hold up to half a second after it does, and each poll is a round trip to the browser. The
+conditions here, eg. `element_visible("results")`, are checked by one script run in the browser with
+execute_async_script, which checks them again whenever a MutationObserver sees the document change,
+and returns as soon as they hold. Changes MutationObservers don't see, like a style sheet loading, are
+caught by checking every 250 ms too, or every 50 ms in browsers without MutationObserver.
+
+Visibility is checked like WebDriver's is_displayed, roughly: an element is visible if it takes up
+space, and isn't hidden by its visibility or opacity styles.
+
+Conditions can be combined with `all_of`, `any_of` and `not_`, and the whole combination is checked
+by the one script. If it times out, the error says which of the conditions didn't hold.
+
+Usage::
+
+    from robotpageobjects import domwait
+
+    self.wait_for(domwait.element_visible("search results"), timeout=5)
+    self.wait_for(domwait.all_of(domwait.not_(domwait.element_visible("spinner")),
+                                 domwait.element_visible("search results")))
+"""
+
+import time
+from collections import namedtuple
+
+from .locator import FIND_FUNCTIONS_SCRIPT, to_script_locator
+
+# Checks a condition until it holds, or the timeout given, in milliseconds, passes. A condition is
+# [kind, alternatives, value], where alternatives are [strategy, criteria, scoped] locators, or
+# ["all of" or "any of" or "not", [conditions]]. Calls back with [true, null, []], or on timeout
+# [false, null, paths], with the paths, as lists of indices, of the sub-conditions that didn't hold,
+# or [false, error, []].
+_WAIT_SCRIPT = FIND_FUNCTIONS_SCRIPT + r"""
+var condition = arguments[0], element = arguments[1], timeout = arguments[2];
+var done = arguments[arguments.length - 1];
+
+function elementsOf(alternatives) {
+    for (var i = 0; i < alternatives.length; i++) {
+        var locator = alternatives[i];
+        var elements = find(locator[0], locator[1], locator[2] && element ? element : document);
+        if (elements.length) return elements;
+    }
+    return [];
+}
+function isVisible(el) {
+    if (!el.offsetWidth && !el.offsetHeight && !(el.getClientRects && el.getClientRects().length)) return false;
+    var style = window.getComputedStyle(el);
+    return style.visibility != "hidden" && style.opacity != "0";
+}
+function holds(condition) {
+    var i;
+    switch (condition[0]) {
+    case "all of":
+        for (i = 0; i < condition[1].length; i++) {
+            if (!holds(condition[1][i])) return false;
+        }
+        return true;
+    case "any of":
+        for (i = 0; i < condition[1].length; i++) {
+            if (holds(condition[1][i])) return true;
+        }
+        return false;
+    case "not": return !holds(condition[1][0]);
+    }
+    var elements = elementsOf(condition[1]);
+    switch (condition[0]) {
+    case "present": return elements.length > 0;
+    case "visible": return elements.length > 0 && isVisible(elements[0]);
+    case "text contains":
+        return elements.length > 0 && (elements[0].innerText || elements[0].textContent || "").indexOf(condition[2]) != -1;
+    case "count equals": return elements.length == condition[2];
+    }
+    throw new Error("Unknown condition " + condition[0]);
+}
+function failing(condition, path) {
+    if (condition[0] != "all of") return holds(condition) ? [] : [path];
+    var ret = [];
+    for (var i = 0; i < condition[1].length; i++) {
+        ret = ret.concat(failing(condition[1][i], path.concat([i])));
+    }
+    return ret;
+}
+
+var finished = false, observer = null, interval = null, timer = null;
+function finish(result, error, paths) {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearInterval(interval);
+    clearTimeout(timer);
+    done([result, error, paths]);
+}
+function onChange() {
+    try {
+        if (holds(condition)) finish(true, null, []);
+    } catch (e) {
+        finish(false, String(e), []);
+    }
+}
+function onTimeout() {
+    try {
+        finish(false, null, failing(condition, []));
+    } catch (e) {
+        finish(false, String(e), []);
+    }
+}
+
+onChange();
+if (!finished) {
+    var Observer = window.MutationObserver || window.WebKitMutationObserver;
+    if (Observer) {
+        observer = new Observer(onChange);
+        observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    }
+    interval = setInterval(onChange, Observer ? 250 : 50);
+    timer = setTimeout(onTimeout, timeout);
+}
+"""
+
+
+class Condition(namedtuple("Condition", "kind locator value")):
+    """
+    A condition on the elements of a selector or locator, to wait for with `wait_for`.
+    Make them with the functions below.
+    """
+
+    def __str__(self):
+        if self.kind == "text contains":
+            return "\"%s\" containing text \"%s\"" % (self.locator, self.value)
+        if self.kind == "count equals":
+            return "\"%s\" matching %s elements" % (self.locator, self.value)
+        return "\"%s\" being %s" % (self.locator, self.kind)
+
+    def check(self, po):
+        """
+        Checks the condition with a page object's finds, for locators the browser can't find elements with.
+
+        :param po: The page object or component
+        :returns: bool
+        """
+        if self.kind == "present":
+            return po._is_element_present(self.locator)
+        if self.kind == "visible":
+            return bool(po._is_visible(self.locator))
+        if self.kind == "text contains":
+            element = po._element_find(self.locator, True, False, wait=0)
+            return element is not None and self.value in element.text
+        return len(po._element_find(self.locator, False, False, wait=0)) == self.value
+
+    def resolve(self, resolve_locator):
+        """
+        :param resolve_locator: Gets the locator, or tuple of alternative locators, for a selector name or locator
+        :returns: The condition, with its locator resolved
+        """
+        return self._replace(locator=resolve_locator(self.locator))
+
+    def get_locators(self):
+        """
+        :returns: list of the locators the condition is on, once resolved
+        """
+        return list(self.locator) if isinstance(self.locator, tuple) else [self.locator]
+
+    def to_script(self):
+        # The condition as _WAIT_SCRIPT takes it, once resolved.
+        return [self.kind, [to_script_locator(locator) for locator in self.get_locators()], self.value]
+
+    def get(self, path):
+        # Gets the sub-condition at a path from _WAIT_SCRIPT.
+        return self
+
+
+class Compound(namedtuple("Compound", "kind conditions")):
+    """
+    All of, any of, or not, other conditions, to wait for with `wait_for`. Make them with
+    `all_of`, `any_of` and `not_`.
+    """
+
+    def __str__(self):
+        if self.kind == "not":
+            return "not %s" % (self.conditions[0],)
+        return "%s (%s)" % (self.kind, ", ".join(str(condition) for condition in self.conditions))
+
+    def check(self, po):
+        """
+        See Condition.check.
+        """
+        if self.kind == "all of":
+            return all(condition.check(po) for condition in self.conditions)
+        if self.kind == "any of":
+            return any(condition.check(po) for condition in self.conditions)
+        return not self.conditions[0].check(po)
+
+    def resolve(self, resolve_locator):
+        """
+        See Condition.resolve.
+        """
+        return self._replace(conditions=tuple(condition.resolve(resolve_locator) for condition in self.conditions))
+
+    def get_locators(self):
+        """
+        See Condition.get_locators.
+        """
+        return [locator for condition in self.conditions for locator in condition.get_locators()]
+
+    def to_script(self):
+        return [self.kind, [condition.to_script() for condition in self.conditions]]
+
+    def get(self, path):
+        return self.conditions[path[0]].get(path[1:]) if path else self
+
+
+def element_present(locator):
+    """
+    :param locator: The selector name or locator
+    :returns: Condition that holds when the locator matches an element
+    """
+    return Condition("present", locator, None)
+
+
+def element_visible(locator):
+    """
+    :param locator: The selector name or locator
+    :returns: Condition that holds when the first element the locator matches is visible
+    """
+    return Condition("visible", locator, None)
+
+
+def text_contains(locator, text):
+    """
+    :param locator: The selector name or locator
+    :param text: The text
+    :returns: Condition that holds when the text of the first element the locator matches contains `text`
+    """
+    return Condition("text contains", locator, text)
+
+
+def count_equals(locator, count):
+    """
+    :param locator: The selector name or locator
+    :param count: The number of elements
+    :type count: int
+    :returns: Condition that holds when the locator matches `count` elements
+    """
+    return Condition("count equals", locator, int(count))
+
+
+def all_of(*conditions):
+    """
+    :returns: Compound condition that holds when all of `conditions` hold
+    """
+    return Compound("all of", conditions)
+
+
+def any_of(*conditions):
+    """
+    :returns: Compound condition that holds when any of `conditions` holds
+    """
+    return Compound("any of", conditions)
+
+
+def not_(condition):
+    """
+    :returns: Compound condition that holds when `condition` doesn't, eg. not_(element_visible("spinner"))
+    """
+    return Compound("not", (condition,))
+
+
+def wait(browser, element_finder, condition, timeout, script_timeout):
+    """
+    Waits in the browser until a condition holds, with its locators resolved.
+
+    :param browser: The webdriver
+    :param element_finder: The page object's or component's element finder, which knows what to search in
+    :type element_finder: robotpageobjects.locator.LocatorElementFinder
+    :param condition: The condition, with locators, or tuples of alternative locators
+    :type condition: Condition or Compound
+    :param timeout: How long to wait, in seconds
+    :param script_timeout: The browser's script timeout, in seconds. Each script run finishes before it.
+    :returns: Whether the condition held before the timeout, and the paths, as lists of indices,
+              of the sub-conditions that didn't hold. See Compound.get.
+    :raises ValueError: If a locator can't be found with a script, or the script fails
+    """
+    script_condition = condition.to_script()
+    element = element_finder.get_script_context(browser, condition.get_locators())
+
+    end = time.time() + float(timeout)
+    while True:
+        remaining = end - time.time()
+        held, error, paths = browser.execute_async_script(_WAIT_SCRIPT, script_condition, element,
+                                                          int(max(min(remaining, script_timeout * 0.9), 0) * 1000))
+        if error is not None:
+            raise ValueError("Couldn't check %s in the browser: %s" % (condition, error))
+        if held or end - time.time() <= 0:
+            return held, paths
@@ -0,0 +1,137 @@
+"""
+Responsible for keeping the elements page objects find, for page objects and components with
+`cache_elements` set. See `robotpageobjects.base._BaseActions._element_find_cached`.
+
+A keyword often finds the same element several times, eg. with find_element, then get_text, then
+click_element, and each find is a round trip to the browser, plus two more to set the implicit wait.
+Each browser has a cache of the first element found for each locator, which is emptied whenever the
+browser navigates, or switches frame or window. Navigating by clicking a link can't be seen without
+asking the browser, so elements handed out by the cache find themselves again, once, without waiting,
+when the browser says they're stale, and the cache is emptied then too. If they aren't there any more,
+they're still stale, which Selenium2Library's checks for elements not being there expect.
+"""
+
+import sys
+
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webelement import WebElement
+
+# WebDriver commands after which the elements found before may be gone, or in another document.
+NAVIGATION_COMMANDS = frozenset([
+    Command.GET, Command.GO_BACK, Command.GO_FORWARD, Command.REFRESH, Command.SWITCH_TO_FRAME,
+    Command.SWITCH_TO_PARENT_FRAME, Command.SWITCH_TO_WINDOW, Command.CLOSE, Command.QUIT,
+])
+
+# What the cache is kept as on each webdriver.
+_ATTRIBUTE = "_robotpageobjects_element_cache"
+
+
+class ElementCache(object):
+    """
+    The elements found in a browser since it last navigated, by locator.
+    """
+
+    def __init__(self):
+        self.elements = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """
+        Gets a kept element, counting a hit or a miss.
+
+        :returns: CachedWebElement, or None
+        """
+        element = self.elements.get(key)
+        if element is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return element
+
+    def put(self, key, element):
+        """
+        Keeps an element.
+
+        :returns: The element
+        """
+        self.elements[key] = element
+        return element
+
+    def invalidate(self):
+        """
+        Empties the cache, eg. because the browser navigated.
+        """
+        if self.elements:
+            self.elements.clear()
+            self.invalidations += 1
+
+    def get_stats(self):
+        """
+        :returns: dict with "hits", "misses", "invalidations" and "size" keys
+        """
+        return {"hits": self.hits, "misses": self.misses, "invalidations": self.invalidations,
+                "size": len(self.elements)}
+
+
+def get_cache(browser):
+    """
+    Gets a browser's element cache, creating it the first time.
+
+    :param browser: The webdriver
+    :returns: ElementCache
+    """
+    try:
+        return vars(browser)[_ATTRIBUTE]
+    except KeyError:
+        cache = ElementCache()
+        setattr(browser, _ATTRIBUTE, cache)
+        return cache
+
+
+def invalidate(browser, driver_command):
+    """
+    Empties a browser's element cache if `driver_command` is one the browser navigates with.
+    Called for every command WebDriver sends. See robotpageobjects.monkeypatches.
+    """
+    if driver_command in NAVIGATION_COMMANDS:
+        cache = vars(browser).get(_ATTRIBUTE)
+        if cache is not None:
+            cache.invalidate()
+
+
+class CachedWebElement(WebElement):
+    """
+    An element from an ElementCache, which finds itself again, once, when the browser says it's stale.
+    """
+
+    def __init__(self, element, find, cache, key):
+        """
+        :param element: The element found
+        :type element: WebElement
+        :param find: A function that finds the element again, in the browser, or returns None
+        :param cache: The cache the element is kept in
+        :type cache: ElementCache
+        :param key: What the element is kept by in the cache
+        """
+        super(CachedWebElement, self).__init__(element.parent, element.id, element._w3c)
+        self._find = find
+        self._cache = cache
+        self._key = key
+
+    def _execute(self, command, params=None):
+        try:
+            return super(CachedWebElement, self)._execute(command, params)
+        except StaleElementReferenceException:
+            exc_info = sys.exc_info()
+            # The page changed, so none of the elements kept are likely to be any good.
+            self._cache.invalidate()
+            element = self._find()
+            if element is None:
+                # It's gone.
+                raise exc_info[0], exc_info[1], exc_info[2]
+            self._id = element.id
+            self._cache.put(self._key, self)
+            return super(CachedWebElement, self)._execute(command, params)
@@ -52,6 +52,22 @@ class KeywordReturnsNoneError(ValueError):
     pass
 
 
+class KeywordExposureError(ValueError):
+    """
+    Raised when a page object's keyword_exposure attribute
+    isn't one of the supported values.
+    """
+    pass
+
+
+class LibraryApiError(ValueError):
+    """
+    Raised when a page object's library_api attribute
+    isn't one of the supported values.
+    """
+    pass
+
+
 class ComponentError(KeyError):
     """
     Raised when there is an issue retrieving instances of a component.
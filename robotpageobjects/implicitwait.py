@@ -0,0 +1,50 @@
+"""
+Responsible for knowing each browser's implicit wait, so it's only set when it changes.
+
+Page objects find elements with the wait given to the method finding them, or selenium_implicit_wait,
+so finding an element used to set the browser's implicit wait before and after, two more round trips
+to the browser, even though the wait was almost always selenium_implicit_wait already. Every command
+setting the implicit wait is seen by a hook on WebDriver's execute (see robotpageobjects.monkeypatches),
+whoever sends it, eg. Selenium2Library's Set Selenium Implicit Wait, and the wait it set is kept on the
+browser. `implicitly_wait` then only sends the command when the browser's wait is different.
+"""
+
+from selenium.webdriver.remote.command import Command
+
+# What the wait is kept as on each webdriver, in milliseconds, as it was sent.
+_ATTRIBUTE = "_robotpageobjects_implicit_wait"
+
+
+def _to_ms(browser, seconds):
+    # Converts a wait in seconds to what WebDriver.implicitly_wait sends.
+    if getattr(browser, "w3c", False):
+        return int(float(seconds) * 1000)
+    return float(seconds) * 1000
+
+
+def record(browser, driver_command, params):
+    """
+    Keeps the implicit wait a command sent to a browser set, if it set it.
+    Called for every command WebDriver sends, once it succeeds. See robotpageobjects.monkeypatches.
+    """
+    if driver_command == Command.NEW_SESSION:
+        vars(browser).pop(_ATTRIBUTE, None)
+    elif driver_command == Command.IMPLICIT_WAIT:
+        setattr(browser, _ATTRIBUTE, params["ms"])
+    elif driver_command == Command.SET_TIMEOUTS and "implicit" in (params or {}):
+        setattr(browser, _ATTRIBUTE, params["implicit"])
+
+
+def implicitly_wait(browser, seconds):
+    """
+    Sets a browser's implicit wait, unless it's already set to `seconds`.
+
+    :param browser: The webdriver
+    :param seconds: The wait
+    :type seconds: float
+    :returns: Whether the wait was sent to the browser
+    """
+    if vars(browser).get(_ATTRIBUTE) == _to_ms(browser, seconds):
+        return False
+    browser.implicitly_wait(seconds)
+    return True
@@ -0,0 +1,158 @@
+"""
+Responsible for the wrapper page object methods are called through.
+
+Selenium2Library's KeywordGroupMetaClass wraps every public method so that its
+run-on-failure keyword (eg. Capture Page Screenshot) runs when the method raises.
+Page objects also need to check that keywords don't return None. Doing both in one
+generated function keeps keyword calls to a single extra frame.
+
+The wrapper has the same signature as the method it wraps, so that Robot (through
+get_keyword_arguments), libdoc and Sphinx see the real arguments. Rather than
+compiling a new function for every method, like the decorator module does, the code
+is compiled once for each distinct argument list and reused.
+
+Page objects using Robot's hybrid library API get a second kind of generated function,
+an entry point, which Robot calls instead of going through `run_keyword`. See
+`wrap_entry_point`.
+"""
+
+import functools
+import inspect
+
+from . import exceptions
+
+
+_template = """
+def make(_func_, _must_return_, _none_error_):
+    def keyword_wrapper(%(params)s):
+        _self_ = %(self)s
+        # If False, we are in the outermost keyword (or in `run_keyword`, for the dynamic API).
+        _already_in_keyword_ = getattr(_self_, "_already_in_keyword", False)
+        _self_._already_in_keyword = True
+        try:
+            _ret_ = _func_(%(args)s)
+        except Exception:
+            if hasattr(_self_, "_run_on_failure") and not _self_._has_run_on_failure:
+                # Only run on failure once, in the innermost keyword that fails.
+                _self_._has_run_on_failure = True
+                _self_._run_on_failure()
+            raise
+        finally:
+            if not _already_in_keyword_:
+                _self_._already_in_keyword = False
+                _self_._has_run_on_failure = False
+        if _ret_ is None and _must_return_:
+            raise _none_error_(
+                "You must return either a page object or an appropriate value from the page object method, "
+                "'%%s'" %% _func_.__name__)
+        return _ret_
+    return keyword_wrapper
+"""
+
+_entry_point_template = """
+def make(_func_, _on_return_, _data_):
+    def keyword_entry_point(%(params)s):
+        return _on_return_(%(self)s, _func_(%(args)s), _data_)
+    return keyword_entry_point
+"""
+
+# Compiled wrapper and entry point factories, keyed by template and argument list.
+_factories = {}
+
+
+def not_wrapped(f):
+    """
+    Decorator that keeps a page object method from being wrapped as a keyword.
+
+    Use it for small, public helpers that are called very often from other methods.
+    The method won't run Selenium2Library's run-on-failure keyword when it raises, and
+    if it's a page object keyword, it won't be checked for returning None.
+
+    :param f: The function to leave unwrapped
+    :type f: callable
+    :returns: callable
+    """
+    f._not_wrapped = True
+    return f
+
+
+def is_not_wrapped(f):
+    return getattr(f, "_not_wrapped", False)
+
+
+def _get_factory(args, varargs, varkw, template=_template):
+    key = (template, tuple(args), varargs, varkw)
+    try:
+        return _factories[key]
+    except KeyError:
+        pass
+
+    params = list(args)
+    if varargs:
+        params.append("*" + varargs)
+    if varkw:
+        params.append("**" + varkw)
+    params = ", ".join(params)
+    src = template % {
+        "params": params,
+        "args": params,
+        "self": args[0] if args else "%s[0]" % varargs,
+    }
+    namespace = {}
+    exec compile(src, "<robotpageobjects keyword wrapper>", "exec") in namespace
+    factory = _factories[key] = namespace["make"]
+    return factory
+
+
+def wrap_keyword(f, must_return=False):
+    """
+    Wraps a page object method so that it runs Selenium2Library's run-on-failure keyword
+    when it raises, and, if `must_return` is True, raises
+    `exceptions.KeywordReturnsNoneError` when it returns None.
+
+    :param f: The method to wrap
+    :type f: function
+    :param must_return: Whether to raise an exception if `f` returns None
+    :type must_return: bool
+    :returns: function
+    """
+    args, varargs, varkw, defaults = inspect.getargspec(f)
+    if not args and not varargs:
+        # There's no "self" to run on failure for.
+        return f
+    if any(isinstance(arg, list) for arg in args):
+        # Tuple parameters can't be passed through by name. Fall back to a plain wrapper.
+        wrapper = _get_factory([], "args", "kwargs")(f, must_return, exceptions.KeywordReturnsNoneError)
+    else:
+        wrapper = _get_factory(args, varargs, varkw)(f, must_return, exceptions.KeywordReturnsNoneError)
+        wrapper.__defaults__ = defaults
+    functools.update_wrapper(wrapper, f)
+    wrapper.__wrapped__ = f
+    return wrapper
+
+
+def wrap_entry_point(f, on_return, data=None):
+    """
+    Makes a function with the same signature as the method `f`, that calls `f` and
+    returns `on_return(self, <what f returned>, data)`.
+
+    With Robot's hybrid library API, Robot calls the entry point directly, so the
+    handling `run_keyword` does for the dynamic API happens in `on_return` instead.
+
+    :param f: The method to make an entry point for
+    :type f: function
+    :param on_return: Called with the instance, `f`'s return value and `data`
+    :type on_return: callable
+    :returns: function
+    """
+    args, varargs, varkw, defaults = inspect.getargspec(f)
+    if not args and not varargs:
+        raise TypeError("Can't make an entry point for '%s', which takes no arguments." % f.__name__)
+    if any(isinstance(arg, list) for arg in args):
+        entry_point = _get_factory([], "args", "kwargs", _entry_point_template)(f, on_return, data)
+    else:
+        entry_point = _get_factory(args, varargs, varkw, _entry_point_template)(f, on_return, data)
+        entry_point.__defaults__ = defaults
+    functools.update_wrapper(entry_point, f)
+    entry_point.__wrapped__ = f
+    return entry_point
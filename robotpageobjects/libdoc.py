@@ -0,0 +1,182 @@
+"""
+Generates libdoc documentation for every page object in a package, in one process.
+
+Running Robot's libdoc once per page object means importing Robot, Selenium2Library and the page objects
+in every run, instantiating each page object (options, Selenium2Library and the logger included), and
+introspecting every keyword through the dynamic API one call at a time. Instead, this builds libdoc's
+model straight from the page object classes, sharing the keyword tables and argument lists between
+classes, and writes it with libdoc's own writers.
+
+Usage::
+
+    python -m robotpageobjects.libdoc [--format HTML|XML|JSON] package output_dir
+
+writes one file per page object, named for the library, eg. `output_dir/mypageobjects.homepage.HomePage.xml`.
+Component subclasses are documented too, although they can't be imported as libraries. The JSON format
+is the model libdoc embeds in its HTML output.
+"""
+from __future__ import print_function
+import importlib
+import inspect
+import json
+import os
+import pkgutil
+import sys
+from optparse import OptionParser
+
+from robot.libdocpkg.htmlwriter import DocFormatter, JsonConverter
+from robot.libdocpkg.model import LibraryDoc, KeywordDoc
+from robot.running.arguments import DynamicArgumentParser
+from robot.utils import normalize, printable_name, split_tags_from_doc, unic
+
+from .base import _KeywordTable
+from .component import Component
+from .page import Page
+
+FORMATS = ("HTML", "XML", "JSON")
+
+
+def _get_attr(klass, attr, upper=False):
+    # Reads library settings like Robot does. See robot.running.testlibraries.
+    value = unic(getattr(klass, attr, ""))
+    if upper:
+        value = normalize(value, ignore="_").upper()
+    return value
+
+
+def _get_pageobject_name(klass):
+    # Page objects name themselves after their class, unless they have a name attribute.
+    name = getattr(klass, "name", None)
+    if not isinstance(name, basestring):
+        name = Page._titleize(klass.__name__)
+    return Page._underscore(name)
+
+
+def _get_args(argspec):
+    # Formats a keyword's arguments the way libdoc lists them, eg. ["locator", "wait=10", "*args"].
+    required = argspec.positional[:argspec.minargs]
+    defaults = zip(argspec.positional[argspec.minargs:], argspec.defaults)
+    args = required + ["%s=%s" % item for item in defaults]
+    if argspec.varargs:
+        args.append("*%s" % argspec.varargs)
+    if argspec.kwargs:
+        args.append("**%s" % argspec.kwargs)
+    return args
+
+
+def build_library_doc(klass, name=None):
+    """
+    Builds libdoc's model of a page object or component class, the same as
+    libdoc would for the page object library, without instantiating the class.
+
+    :param klass: The page object or component class
+    :type klass: type
+    :param name: The library name. Defaults to the class's module and name.
+    :type name: str
+    :returns: robot.libdocpkg.model.LibraryDoc
+    """
+    # Page's documentation helpers are classmethods, but components aren't page objects, so
+    # they're called with the class passed explicitly.
+    name = name or "%s.%s" % (klass.__module__, klass.__name__)
+    scope = _get_attr(klass, "ROBOT_LIBRARY_SCOPE", upper=True)
+    libdoc = LibraryDoc(name=name,
+                        doc=Page._get_intro_documentation.__func__(klass),
+                        version=_get_attr(klass, "ROBOT_LIBRARY_VERSION") or _get_attr(klass, "__version__"),
+                        scope=scope if scope in ("GLOBAL", "TESTSUITE") else "TESTCASE",
+                        doc_format=_get_attr(klass, "ROBOT_LIBRARY_DOC_FORMAT", upper=True))
+
+    # Like libdoc, leave out Selenium2Library's keywords and the aliases with the page name in them.
+    pageobject_name = _get_pageobject_name(klass)
+    keywords = []
+    for entry in _KeywordTable.for_class(klass):
+        if entry.in_s2l or not _KeywordTable.is_exposed(entry):
+            continue
+        doc = (Page._get_alias_documentation.__func__(klass, entry.name, pageobject_name) +
+               Page._get_keyword_documentation.__func__(klass, entry.name))
+        doc, tags = split_tags_from_doc(doc)
+        argspec = DynamicArgumentParser().parse(Page._get_keyword_arguments.__func__(klass, entry.name), entry.name)
+        keywords.append(KeywordDoc(name=printable_name(entry.name, code_style=True),
+                                   args=_get_args(argspec),
+                                   doc=doc, tags=tags))
+    libdoc.keywords = keywords
+    return libdoc
+
+
+def find_page_object_classes(package):
+    """
+    Imports every module in a package, and finds the page object and component classes defined in them.
+
+    :param package: The package's name
+    :type package: str
+    :returns: A list of classes
+    """
+    module = importlib.import_module(package)
+    modules = [module]
+    if hasattr(module, "__path__"):
+        for _, module_name, _ in pkgutil.walk_packages(module.__path__, module.__name__ + "."):
+            modules.append(importlib.import_module(module_name))
+
+    ret = []
+    for module in modules:
+        for member_name, member in sorted(vars(module).items()):
+            if (inspect.isclass(member) and member.__module__ == module.__name__
+                    and issubclass(member, (Page, Component))):
+                ret.append(member)
+    return ret
+
+
+def write_library_doc(libdoc, path, format="HTML"):
+    """
+    Writes libdoc's model of a library to `path`, in the HTML or XML format libdoc writes,
+    or as JSON.
+    """
+    if format == "JSON":
+        data = JsonConverter(DocFormatter(libdoc.keywords, libdoc.doc, libdoc.doc_format)).convert(libdoc)
+        with open(path, "w") as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+    else:
+        libdoc.save(path, format)
+
+
+def generate(package, output_dir, format="HTML"):
+    """
+    Writes libdoc documentation for every page object and component class in a package.
+
+    :param package: The package's name
+    :type package: str
+    :param output_dir: The directory to write to
+    :type output_dir: str
+    :param format: One of FORMATS
+    :type format: str
+    :returns: The paths written to
+    """
+    format = format.upper()
+    if format not in FORMATS:
+        raise ValueError("Format must be one of %s, got '%s'." % (", ".join(FORMATS), format))
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+    paths = []
+    for klass in find_page_object_classes(package):
+        libdoc = build_library_doc(klass)
+        path = os.path.join(output_dir, "%s.%s" % (libdoc.name, format.lower()))
+        write_library_doc(libdoc, path, format)
+        paths.append(path)
+    return paths
+
+
+def main(args):
+    parser = OptionParser(usage="python -m robotpageobjects.libdoc [--format HTML|XML|JSON] package output_dir")
+    parser.add_option("-f", "--format", default="HTML", help="HTML (default), XML or JSON")
+    options, args = parser.parse_args(args)
+    if len(args) != 2:
+        parser.error("Give a package and an output directory.")
+    try:
+        paths = generate(args[0], args[1], options.format)
+    except ValueError, e:
+        parser.error(str(e))
+    for path in paths:
+        print(path)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
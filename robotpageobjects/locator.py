@@ -0,0 +1,292 @@
+"""
+Responsible for parsing Selenium2Library locators, like "css=div.result" or "//div", once.
+
+Finding an element by selector name used to parse the locator's prefix in Selenium2Library's
+`ElementFinder.find`, again in `_ComponentElementFinder.find` to decide whether to search only
+inside the component's element, and again in `_BaseActions._is_locator_format` when nothing was
+found. Parsed locators are kept, by locator, so each distinct locator is parsed once, and the
+element finders page objects and components use find elements with the parsed locator.
+
+A selector can also be a list of alternative locators, eg. for pages in an A/B test. Trying each
+in turn would wait out the implicit wait for each one that doesn't match, so the element finders
+try them all with one script run in the browser. See `LocatorElementFinder.find_first`.
+A script also finds single elements, counting the others the locator matches in the browser,
+rather than sending them all back. See `LocatorElementFinder.find_one`. And a script finds the elements
+of several locators at once. See `LocatorElementFinder.find_batch`.
+"""
+
+from collections import namedtuple
+
+from robot.utils import normalize
+from Selenium2Library.locators.elementfinder import ElementFinder
+
+# How many parsed locators to keep. Locators built at run time, eg. from selector
+# templates, can be different every time.
+CACHE_SIZE = 4096
+
+# Prefixes of locators that are evaluated by the browser, so can't be scoped to an element.
+GLOBAL_PREFIXES = ("dom", "sizzle", "jquery")
+
+# Defines find(strategy, criteria, context), which finds elements in the browser like Selenium2Library's
+# strategies do. See to_script_locator.
+FIND_FUNCTIONS_SCRIPT = r"""
+function toArray(list) {
+    var ret = [];
+    for (var i = 0; list && i < list.length; i++) ret.push(list[i]);
+    return ret;
+}
+function quote(value) {
+    return '"' + value.replace(/\\/g, '\\\\').replace(/"/g, '\\"') + '"';
+}
+function linkText(link) {
+    return (link.innerText || link.textContent || "").replace(/^\s+|\s+$/g, "");
+}
+function find(strategy, criteria, context) {
+    switch (strategy) {
+    case "css": return toArray(context.querySelectorAll(criteria));
+    case "id": return toArray(context.querySelectorAll("[id=" + quote(criteria) + "]"));
+    case "name": return toArray(context.querySelectorAll("[name=" + quote(criteria) + "]"));
+    case "identifier":
+        return toArray(context.querySelectorAll("[id=" + quote(criteria) + "], [name=" + quote(criteria) + "]"));
+    case "tag": return toArray(context.getElementsByTagName(criteria));
+    case "link":
+    case "partiallink":
+        return toArray(context.getElementsByTagName("a")).filter(function (link) {
+            var text = linkText(link);
+            return strategy == "link" ? text == criteria : text.indexOf(criteria) != -1;
+        });
+    case "xpath":
+        var result = document.evaluate(criteria, context, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var ret = [];
+        for (var i = 0; i < result.snapshotLength; i++) ret.push(result.snapshotItem(i));
+        return ret;
+    case "dom":
+        var found = eval(criteria);
+        if (found == null) return [];
+        return found.length !== undefined && !found.tagName ? toArray(found) : [found];
+    case "jquery":
+    case "sizzle":
+        return window.jQuery ? window.jQuery(criteria).get() : [];
+    }
+}
+"""
+
+# Finds elements with the first of a list of [strategy, criteria, scoped] locators that matches any,
+# in the element given, or the document. Returns the locator's index and the elements, or [-1, []].
+_FIND_FIRST_SCRIPT = FIND_FUNCTIONS_SCRIPT + r"""
+var locators = arguments[0], element = arguments[1];
+for (var i = 0; i < locators.length; i++) {
+    var elements = find(locators[i][0], locators[i][1], locators[i][2] && element ? element : document);
+    if (elements.length) return [i, elements];
+}
+return [-1, []];
+"""
+
+# Finds the elements of a [strategy, criteria, scoped] locator, in the element given, or the document.
+# Returns the first and how many there are, so only one element is sent back. See find_one.
+_FIND_ONE_SCRIPT = FIND_FUNCTIONS_SCRIPT + r"""
+var locator = arguments[0], element = arguments[1];
+var elements = find(locator[0], locator[1], locator[2] && element ? element : document);
+return [elements.length ? elements[0] : null, elements.length];
+"""
+
+# Finds the elements of each of a list of entries, each a list of alternative [strategy, criteria, scoped]
+# locators, with the first alternative that matches any. Returns a list of lists of elements. See find_batch.
+_FIND_BATCH_SCRIPT = FIND_FUNCTIONS_SCRIPT + r"""
+var entries = arguments[0], element = arguments[1];
+var results = [];
+for (var i = 0; i < entries.length; i++) {
+    var elements = [];
+    for (var j = 0; j < entries[i].length && !elements.length; j++) {
+        var locator = entries[i][j];
+        elements = find(locator[0], locator[1], locator[2] && element ? element : document);
+    }
+    results.push(elements);
+}
+return results;
+"""
+
+# The strategies FIND_FUNCTIONS_SCRIPT supports, by normalized prefix. Only Selenium2Library's
+# ElementFinder strategies, so a locator the script finds is one Selenium2Library could find too.
+_SCRIPT_STRATEGIES = {
+    "css": "css", "id": "id", "name": "name", "identifier": "identifier", "tag": "tag", "link": "link",
+    "partiallink": "partiallink", "xpath": "xpath", "dom": "dom", "jquery": "jquery", "sizzle": "sizzle",
+}
+
+
+class Locator(namedtuple("Locator", "locator prefix criteria scoped is_locator_format")):
+    """
+    A parsed Selenium2Library locator:
+
+    - locator: the locator as given
+    - prefix: the strategy prefix, eg. "css", or None for the default strategy
+    - criteria: what's searched for with the strategy
+    - scoped: whether a search can be limited to inside an element, eg. a component's
+    - is_locator_format: whether the locator looks like a locator, not a selector name
+    """
+
+    _parsed = {}
+
+    @classmethod
+    def parse(cls, locator):
+        """
+        Parses a locator the way Selenium2Library's ElementFinder does, the first time it's given.
+
+        :param locator: The locator
+        :type locator: str
+        :returns: Locator
+        """
+        try:
+            return cls._parsed[locator]
+        except KeyError:
+            pass
+        prefix = None
+        criteria = locator
+        if not locator.startswith("//"):
+            locator_parts = locator.partition("=")
+            if len(locator_parts[1]) > 0:
+                prefix = locator_parts[0]
+                criteria = locator_parts[2].strip()
+        if len(cls._parsed) >= CACHE_SIZE:
+            cls._parsed.clear()
+        ret = cls._parsed[locator] = cls(locator, prefix, criteria, prefix not in GLOBAL_PREFIXES,
+                                         prefix is not None or locator.startswith("//"))
+        return ret
+
+
+def to_script_locator(locator):
+    """
+    Converts a locator into the [strategy, criteria, scoped] list FIND_FUNCTIONS_SCRIPT
+    finds elements with. The default strategy looks for the id and name attributes.
+
+    :param locator: The locator
+    :type locator: str
+    :returns: list
+    """
+    parsed = Locator.parse(locator)
+    if parsed.prefix is None:
+        strategy = "xpath" if locator.startswith("//") else "identifier"
+    else:
+        strategy = _SCRIPT_STRATEGIES.get(normalize(parsed.prefix))
+        if strategy is None:
+            raise ValueError("Element locator with prefix '%s' can't be found with a script" % parsed.prefix)
+    return [strategy, parsed.criteria, parsed.scoped]
+
+
+class LocatorElementFinder(ElementFinder):
+    """
+    Selenium2Library's ElementFinder, finding elements with parsed locators. Page objects
+    use it for Selenium2Library's keywords too.
+    """
+
+    # The locator of each list of alternatives that last matched, by list. See find_first.
+    _matched = {}
+
+    def find(self, browser, locator, tag=None):
+        assert browser is not None
+        assert locator is not None and len(locator) > 0
+        return self.find_parsed(browser, Locator.parse(locator), tag)
+
+    def find_parsed(self, browser, locator, tag=None):
+        """
+        Finds elements with a parsed locator.
+
+        :param browser: The webdriver, or element, to search in
+        :param locator: The parsed locator
+        :type locator: Locator
+        :param tag: Limits the search to elements of this type, eg. "link" or "text field"
+        :type tag: str
+        :returns: list of WebElements
+        """
+        prefix = "default" if locator.prefix is None else locator.prefix
+        strategy = self._strategies.get(prefix)
+        if strategy is None:
+            raise ValueError("Element locator with prefix '" + prefix + "' is not supported")
+        (tag, constraints) = self._get_tag_and_constraints(tag)
+        return strategy(self._get_search_context(browser, locator), locator.criteria, tag, constraints)
+
+    def find_first(self, browser, locators, tag=None):
+        """
+        Finds elements with the first of a list of alternative locators that matches any,
+        running one script in the browser. The alternative that matched last time is tried first.
+        The default strategy looks for the id and name attributes, whatever the tag.
+
+        :param browser: The webdriver
+        :param locators: The locators
+        :type locators: tuple
+        :param tag: Limits the search to elements of this type, eg. "link" or "text field"
+        :type tag: str
+        :returns: The locator that matched, and the list of WebElements it matched, or (None, [])
+        """
+        matched = self._matched.get(locators)
+        order = list(locators)
+        if matched is not None:
+            order.remove(matched)
+            order.insert(0, matched)
+
+        script_locators = [to_script_locator(locator) for locator in order]
+
+        (tag, constraints) = self._get_tag_and_constraints(tag)
+        element = self.get_script_context(browser, order)
+        start = 0
+        while start < len(order):
+            index, elements = browser.execute_script(_FIND_FIRST_SCRIPT, script_locators[start:], element)
+            if index == -1:
+                break
+            index += start
+            elements = self._filter_elements(elements, tag, constraints)
+            if elements:
+                if len(self._matched) >= CACHE_SIZE:
+                    self._matched.clear()
+                self._matched[locators] = order[index]
+                return order[index], elements
+            # None of the elements were the right type, so look at the next alternatives.
+            start = index + 1
+        return None, []
+
+    def find_one(self, browser, locator):
+        """
+        Finds the first element a locator matches, and counts the elements it matches,
+        running one script in the browser, so only the first element is sent back.
+        The script doesn't wait for elements to appear.
+
+        :param browser: The webdriver
+        :param locator: The locator
+        :type locator: str
+        :returns: The first WebElement, or None, and the number of elements matched
+        """
+        element = self.get_script_context(browser, [locator])
+        first, count = browser.execute_script(_FIND_ONE_SCRIPT, to_script_locator(locator), element)
+        return first, count
+
+    def find_batch(self, browser, locators):
+        """
+        Finds the elements of each of a list of locators, running one script in the browser.
+        A tuple of alternative locators finds the elements of the first that matches any.
+        The script doesn't wait for elements to appear.
+
+        :param browser: The webdriver
+        :param locators: The locators, and tuples of alternative locators
+        :type locators: list
+        :returns: A list of WebElements for each locator
+        """
+        entries = [locator if isinstance(locator, tuple) else (locator,) for locator in locators]
+        script_locators = [[to_script_locator(alternative) for alternative in entry] for entry in entries]
+        element = self.get_script_context(browser, [alternative for entry in entries for alternative in entry])
+        return browser.execute_script(_FIND_BATCH_SCRIPT, script_locators, element)
+
+    def get_script_context(self, browser, locators):
+        """
+        Gets the element to pass to FIND_FUNCTIONS_SCRIPT to search for `locators` in, if any.
+        The script searches the document for locators that aren't scoped.
+
+        :returns: WebElement, or None to search the document
+        """
+        contexts = [self._get_search_context(browser, Locator.parse(locator)) for locator in locators]
+        return next((context for context in contexts if context is not browser), None)
+
+    def _get_search_context(self, browser, locator):
+        """
+        Gets what to search for `locator` in.
+        """
+        return browser
@@ -0,0 +1,235 @@
+"""
+Responsible for keyword manifests: JSON files describing a page object library's keywords.
+
+When Robot imports a dynamic library, it asks for the arguments and documentation of every
+keyword the library exposes. For page objects that means introspecting every page method, and
+every Selenium2Library keyword, in every Robot process. If the `keyword_manifest_dir` option is
+set, the first process to import a page object library writes what it found to a manifest in
+that directory, and later processes read it back instead.
+
+A manifest is keyed by the size and modification time of every module the page class and its
+bases are defined in, which keywords are excluded with `not_keyword` or aliased with `robot_alias`,
+wherever that's done, and the installed Selenium2Library version, so editing a page object (or
+upgrading) makes its manifest stale. Manifests are only written for page classes defined at the
+top level of a module, since that's the only way to tell classes apart across processes.
+
+Since they also record where each keyword is defined, IDEs can use manifests for completion
+without importing the page objects.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+import tempfile
+
+from Selenium2Library.version import VERSION as S2L_VERSION
+
+from .base import _Keywords, _KeywordTable
+
+# Bump this when what's stored in a manifest changes.
+FORMAT_VERSION = 2
+
+# What's stored about each keyword, in the order it's stored in.
+FIELDS = ("alias", "in_s2l", "args", "doc", "source", "lineno")
+_ARGS = FIELDS.index("args")
+_DOC = FIELDS.index("doc")
+
+# Maps module source files to their size and modification time.
+_source_stamps = {}
+
+
+def _get_source_stamp(module_name):
+    module = sys.modules.get(module_name)
+    path = getattr(module, "__file__", None)
+    if path is None:
+        return None
+    if path.endswith((".pyc", ".pyo")):
+        path = path[:-1]
+    try:
+        return _source_stamps[path]
+    except KeyError:
+        pass
+    try:
+        st = os.stat(path)
+        ret = "%s %r" % (st.st_size, st.st_mtime)
+    except OSError:
+        ret = None
+    _source_stamps[path] = ret
+    return ret
+
+
+def get_manifest_key(klass):
+    """
+    Gets the key a page class's manifest is stored under, or None if the class
+    can't have a manifest.
+
+    :param klass: The page object class
+    :type klass: type
+    :returns: str or None
+    """
+    # Classes defined inside functions, or created dynamically, can share a name with other
+    # classes in the same module.
+    if getattr(sys.modules.get(klass.__module__), klass.__name__, None) is not klass:
+        return None
+
+    key = hashlib.sha1("%s\n%s\n" % (FORMAT_VERSION, S2L_VERSION))
+    for module_name in sorted(set(base.__module__ for base in inspect.getmro(klass)
+                                  if base not in _KeywordTable.s2l_classes and base is not object)):
+        stamp = _get_source_stamp(module_name)
+        if stamp is None:
+            return None
+        key.update("%s %s\n" % (module_name, stamp))
+
+    # not_keyword and robot_alias register names globally, so they can change which keywords
+    # the class exposes, and how, from modules that aren't in its MRO.
+    aliases = _Keywords._aliases
+    key.update("\n".join("%s %s %s" % (entry.name, _KeywordTable.is_exposed(entry), aliases.get(entry.name))
+                         for entry in _KeywordTable.for_class(klass)))
+    return key.hexdigest()
+
+
+def _get_source_location(func):
+    func = getattr(func, "__wrapped__", func)
+    try:
+        return inspect.getsourcefile(func), func.__code__.co_firstlineno
+    except (TypeError, AttributeError):
+        return None, None
+
+
+class KeywordManifest(object):
+    """
+    The keywords of a page object class, as written to or read from a manifest file.
+    Each keyword's FIELDS are stored as a list, by keyword name.
+    """
+
+    # Loaded manifests, by class and directory.
+    _manifests = {}
+
+    def __init__(self, key, names, keywords):
+        self.key = key
+        self.names = names
+        self.keywords = keywords
+        self._by_name = dict(zip(names, keywords))
+
+    def get_arguments(self, kwname):
+        """
+        :returns: The argument list get_keyword_arguments returns for `kwname`, or None if it's not in the manifest
+        """
+        keyword = self._by_name.get(kwname)
+        return list(keyword[_ARGS]) if keyword is not None else None
+
+    def get_documentation(self, kwname):
+        """
+        :returns: The keyword's documentation, without its alias, or None if it's not in the manifest
+        """
+        keyword = self._by_name.get(kwname)
+        return keyword[_DOC] if keyword is not None else None
+
+    def get(self, kwname):
+        """
+        :returns: dict of the FIELDS stored for `kwname`, or None if it's not in the manifest
+        """
+        keyword = self._by_name.get(kwname)
+        return dict(zip(FIELDS, keyword)) if keyword is not None else None
+
+    @classmethod
+    def get_path(cls, klass, directory):
+        return os.path.join(directory, "%s.%s.json" % (klass.__module__, klass.__name__))
+
+    @classmethod
+    def for_page(cls, page, directory):
+        """
+        Gets the manifest for a page object's class from `directory`, building
+        and writing it if there isn't an up to date one.
+
+        :param page: The page object
+        :type page: robotpageobjects.page.Page
+        :param directory: The directory manifests are kept in
+        :type directory: str
+        :returns: KeywordManifest, or None if the page's class can't have a manifest
+        """
+        klass = page.__class__
+        try:
+            return cls._manifests[(klass, directory)]
+        except KeyError:
+            pass
+
+        key = get_manifest_key(klass)
+        if key is None:
+            manifest = None
+        else:
+            path = cls.get_path(klass, directory)
+            manifest = cls.read(path, key)
+            if manifest is None:
+                manifest = cls.build(page, key)
+                manifest.write(path)
+        cls._manifests[(klass, directory)] = manifest
+        return manifest
+
+    @classmethod
+    def build(cls, page, key):
+        """
+        Builds the manifest for a page object's class by introspecting it.
+
+        :param page: The page object
+        :type page: robotpageobjects.page.Page
+        :param key: The manifest key for the page's class
+        :type key: str
+        :returns: KeywordManifest
+        """
+        names = []
+        keywords = []
+        for entry in _KeywordTable.for_class(page.__class__):
+            if not _KeywordTable.is_exposed(entry):
+                continue
+            source, lineno = _get_source_location(getattr(page.__class__, entry.name))
+            names.append(entry.name)
+            keywords.append([
+                _Keywords._aliases.get(entry.name),
+                entry.in_s2l,
+                page._get_keyword_arguments(entry.name),
+                page._get_keyword_documentation(entry.name),
+                source,
+                lineno,
+            ])
+        return cls(key, names, keywords)
+
+    @classmethod
+    def read(cls, path, key):
+        """
+        Reads a manifest.
+
+        :returns: KeywordManifest, or None if there isn't a readable manifest with key `key` at `path`
+        """
+        try:
+            with open(path, "rb") as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("key") != key:
+            return None
+        return cls(key, data["names"], data["keywords"])
+
+    def write(self, path):
+        """
+        Writes the manifest to `path`. Many Robot processes may be starting at the same time,
+        so it's written to a temporary file first and moved into place. Manifests are only
+        a cache, so failing to write one isn't an error.
+        """
+        directory = os.path.dirname(path)
+        try:
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        except (IOError, OSError):
+            return
+        try:
+            with os.fdopen(fd, "wb") as f:
+                json.dump({"key": self.key, "selenium2library": S2L_VERSION, "fields": FIELDS,
+                           "names": self.names, "keywords": self.keywords},
+                          f, sort_keys=True, separators=(",", ":"))
+            os.rename(tmp_path, path)
+        except (IOError, OSError):
+            os.remove(tmp_path)
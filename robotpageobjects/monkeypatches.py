@@ -1,5 +1,4 @@
 import re
-import pdb
 import sys
 from Selenium2Library import Selenium2Library
 from Selenium2Library.locators.tableelementfinder import TableElementFinder
@@ -7,8 +6,17 @@ from Selenium2Library.keywords._tableelement import _TableElementKeywords
 from selenium import webdriver
 from selenium.common.exceptions import WebDriverException
 
+_patched = False
+
 def do_monkeypatches():
-    """"""
+    """
+    Applies the monkeypatches below. Called when the first page object or component
+    is created, rather than when robotpageobjects is imported, and only patches once.
+    """
+    global _patched
+    if _patched:
+        return
+    _patched = True
 
     def _make_phantomjs(self , remote , desired_capabilities , profile_dir):
         browser = None
@@ -122,6 +130,20 @@ def do_monkeypatches():
     _TableElementKeywords.get_table_cell = get_table_cell
     ### END QAR-48165 monkey patch
 
+    # Empty the element cache when the browser navigates, and keep the implicit wait the browser
+    # was last set to. See robotpageobjects.elementcache and robotpageobjects.implicitwait.
+    from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+    from . import elementcache, implicitwait
+
+    old_execute = RemoteWebDriver.execute
+    def execute(self, driver_command, params=None):
+        elementcache.invalidate(self, driver_command)
+        response = old_execute(self, driver_command, params)
+        implicitwait.record(self, driver_command, params)
+        return response
+    RemoteWebDriver.execute = execute
+
+    import pdb
     old_set_trace = pdb.set_trace
     def _set_trace():
         for attr in ('stdin', 'stdout', 'stderr'):
@@ -21,52 +21,54 @@
 from __future__ import print_function
 import inspect
 import re
-import urllib2
+import sys
 
-import decorator
+from robot.utils import printable_name
 from Selenium2Library import Selenium2Library
 from selenium import webdriver
 from selenium.common.exceptions import WebDriverException
-import uritemplate
 
-from .base import _ComponentsManagerMeta, not_keyword, robot_alias, _BaseActions, _Keywords, Override, _SelectorsManager, _ComponentsManager
+from .base import _ComponentsManagerMeta, not_keyword, robot_alias, _BaseActions, _Keywords, _KeywordTable, Override, _SelectorsManager, _ComponentsManager
 from . import exceptions
 from .context import Context
+from .keywordwrapper import wrap_entry_point
+from .manifest import KeywordManifest
 from .sig import get_method_sig
 
 
-# determine if libdoc is running to avoid generating docs for automatically generated aliases
-ld = 'libdoc'
-in_ld = any([ld in str(x) for x in inspect.stack()])
+# determine if libdoc is running to avoid generating docs for automatically generated aliases.
+# Libdoc imports its robot.libdocpkg package before it imports the library it documents.
+in_ld = "robot.libdocpkg" in sys.modules
+
+# The keyword names a page object can expose each method as: both the method's name with the
+# page object's name in it and its plain name, only the one with the page object's name,
+# or only the plain one. See Page.keyword_exposure.
+KEYWORD_EXPOSURES = ("both", "aliased", "bare")
+
+# The Robot library APIs a page object can implement. See Page.library_api.
+LIBRARY_APIS = ("dynamic", "hybrid")
 
 class _PageMeta(_ComponentsManagerMeta):
-    """Meta class that allows decorating of all page object methods
-    with must_return decorator. This ensures that all page object
-    methods return something, whether it's a page object or other
+    """Meta class that makes all page object keywords check that they
+    return something, whether it's a page object or other
     appropriate value. We must do this in a meta class since decorating
     methods and returning a wrapping function then rebinding that to the
     page object is tricky. Instead the binding of the decorated function in the
     meta class happens before the class is instantiated.
-    """
 
-    @staticmethod
-    def _must_return(f, *args, **kwargs):
-        ret = f(*args, **kwargs)
-        if ret is None:
-            raise exceptions.KeywordReturnsNoneError(
-                "You must return either a page object or an appropriate value from the page object method, "
-                "'%s'" % f.__name__)
-        else:
-            return ret
+    The check is done by the same wrapper that runs Selenium2Library's
+    run-on-failure keyword. See `robotpageobjects.base._KeywordGroupMeta`.
+    """
 
     @classmethod
-    def must_return(cls, f):
-        # Use decorator module to preserve docstings and signatures for Sphinx
-        return decorator.decorator(cls._must_return, f)
+    def _is_must_return(cls, func):
+        return _Keywords.is_obj_keyword(func)
 
     @classmethod
-    def _fix_docstrings(cls, bases):
-        """ Called from _PageMeta's __new__ method.
+    def _fix_docstrings(cls, klass):
+        """ Called when Sphinx generates documentation for a page object (see
+        _PageMeta's __new__ method). get_keyword_documentation, which libdoc uses,
+        fixes up keywords one at a time with _fix_docstring.
         For Sphinx auto-API docs, fixes up docstring for keywords that
         take locators by
         redefining method signature, replacing "locator" parameter with
@@ -77,45 +79,84 @@ class _PageMeta(_ComponentsManagerMeta):
         Also replaces references to "locator" in rest of docstring with
         "selector or locator".
 
-        :param bases: A tuple of base classes a particular class
-        inherits from.
+        Test runs never read these docstrings, so this isn't done when a
+        page object class is created.
+
+        :param klass: The page object class to fix up, including
+        the keywords it inherits.
         """
-        for base in bases:
 
-            # Don't fix up a class more than once.
-            if not hasattr(base, "_fixed_docstring"):
+        # Don't fix up a class more than once.
+        if "_fixed_docstring" in klass.__dict__:
+            return
 
-                for member_name, member in inspect.getmembers(base):
-                    if _Keywords.is_obj_keyword(member):
-                        try:
-                            # There's a second argument
-                            second_arg = inspect.getargspec(member)[0][1]
-                        except IndexError:
-                            continue
+        for member_name, member in inspect.getmembers(klass):
+            if _Keywords.is_obj_keyword(member):
+                cls._fix_docstring(member)
 
-                        orig_doc = inspect.getdoc(member)
-                        if orig_doc is not None and second_arg == "locator":
-                            orig_signature = get_method_sig(member)
-                            fixed_signature = orig_signature.replace("(self, locator", "(self, selector_or_locator")
-                            if orig_doc is not None:
-                                # Prepend fixed signature to docstring
-                                # and fix references to "locator".
-                                fixed_doc = fixed_signature + "\n\n" + orig_doc
-                                fixed_doc = fixed_doc.replace("`locator`", "`selector` or `locator`")
-                                fixed_doc = fixed_doc.replace(" locator ", " selector or locator ")
-                                member.__func__.__doc__ = fixed_doc
+        klass._fixed_docstring = True
 
-                base._fixed_docstring = True
+    @classmethod
+    def _fix_docstring(cls, member):
+        """ Fixes up the docstring of one keyword method. See _fix_docstrings.
 
-    def __new__(cls, name, bases, classdict):
-        # Don't do inspect.getmembers since it will try to evaluate functions
-        # that are decorated as properties.
-        for member_name, obj in classdict.iteritems():
-            if _Keywords.is_obj_keyword(obj):
-                classdict[member_name] = cls.must_return(classdict[member_name])
+        :param member: The keyword method.
+        """
+        func = member.__func__
 
-        cls._fix_docstrings(bases)
-        return _ComponentsManagerMeta.__new__(cls, name, bases, classdict)
+        # Functions are shared between classes, so don't fix one up (or check
+        # whether it needs fixing up) more than once.
+        if getattr(func, "_fixed_docstring", False):
+            return
+        func._fixed_docstring = True
+        try:
+            # There's a second argument
+            second_arg = inspect.getargspec(member)[0][1]
+        except IndexError:
+            return
+
+        orig_doc = inspect.getdoc(member)
+        if orig_doc is not None and second_arg == "locator":
+            orig_signature = get_method_sig(member)
+            fixed_signature = orig_signature.replace("(self, locator", "(self, selector_or_locator")
+            # Prepend fixed signature to docstring
+            # and fix references to "locator".
+            fixed_doc = fixed_signature + "\n\n" + orig_doc
+            fixed_doc = fixed_doc.replace("`locator`", "`selector` or `locator`")
+            fixed_doc = fixed_doc.replace(" locator ", " selector or locator ")
+            func.__doc__ = fixed_doc
+
+    def __new__(cls, name, bases, classdict):
+        klass = _ComponentsManagerMeta.__new__(cls, name, bases, classdict)
+
+        if klass.keyword_exposure not in KEYWORD_EXPOSURES:
+            raise exceptions.KeywordExposureError(
+                "%s.keyword_exposure must be one of %s, not \"%s\"."
+                % (name, ", ".join('"%s"' % exposure for exposure in KEYWORD_EXPOSURES), klass.keyword_exposure))
+        if klass.library_api not in LIBRARY_APIS:
+            raise exceptions.LibraryApiError(
+                "%s.library_api must be one of %s, not \"%s\"."
+                % (name, ", ".join('"%s"' % api for api in LIBRARY_APIS), klass.library_api))
+
+        # Robot uses the hybrid API for libraries that have get_keyword_names but no run_keyword.
+        # Libdoc always documents page objects through the dynamic API, so that they're
+        # documented the same way whichever API they use.
+        klass._is_hybrid = klass.library_api == "hybrid" and not in_ld
+        if klass._is_hybrid:
+            klass.run_keyword = None
+        elif "run_keyword" not in classdict and klass.run_keyword is None:
+            # A dynamic page object inheriting from a hybrid one.
+            klass.run_keyword = Page.__dict__["run_keyword"]
+
+        # Work out once which methods the class can expose as keywords,
+        # instead of every time Robot asks a page object for its keyword names.
+        klass._keyword_table = _KeywordTable(klass)
+
+        # Sphinx's autodoc reads docstrings straight off the class, so fix them up
+        # as soon as the class is created when Sphinx is the one importing it.
+        if "sphinx.ext.autodoc" in sys.modules:
+            cls._fix_docstrings(klass)
+        return klass
 
 
 class Page(_BaseActions, _SelectorsManager, _ComponentsManager):
@@ -129,6 +170,18 @@ class Page(_BaseActions, _SelectorsManager, _ComponentsManager):
     __metaclass__ = _PageMeta
     ROBOT_LIBRARY_SCOPE = 'TEST SUITE'
 
+    # Which Robot keyword names the page object's methods are exposed as. By default, a method
+    # is exposed both with the page object's name in it (eg. "Search My Page") and without
+    # ("Search"). Set to "aliased" or "bare" to expose just one of them, so that Robot has fewer
+    # keywords to search. Selenium2Library's keywords are always exposed with their plain names.
+    keyword_exposure = "both"
+
+    # Which of Robot's library APIs the page object implements. With the default, "dynamic",
+    # Robot runs every keyword through run_keyword, which looks up the method for the keyword
+    # name on every call. With "hybrid", each keyword name gets a method of its own, generated
+    # the first time Robot asks for the page object's keyword names, which Robot calls directly.
+    library_api = "dynamic"
+
     def __init__(self):
         """
         Initializes the pageobject_name variable, which is used by the _Keywords class
@@ -139,6 +192,7 @@ class Page(_BaseActions, _SelectorsManager, _ComponentsManager):
 
         self.browser = self._option_handler.get("browser") or "phantomjs"
         self.service_args = self._parse_service_args(self._option_handler.get("service_args", ""))
+        self.keyword_manifest_dir = self._option_handler.get("keyword_manifest_dir")
 
         self._sauce_options = [
             "sauce_username",
@@ -180,10 +234,18 @@ class Page(_BaseActions, _SelectorsManager, _ComponentsManager):
         """
         return  re.sub('([a-z0-9])([A-Z])', r'\1 \2', re.sub(r"(.)([A-Z][a-z]+)", r'\1 \2', str))
 
+    # Cache of page object names to their underscored versions, since
+    # run_keyword needs the underscored name on every call.
+    _underscored_names = {}
+
     @staticmethod
     @not_keyword
     def _underscore(str):
-        return re.sub(r"\s+", "_", str)
+        try:
+            return Page._underscored_names[str]
+        except KeyError:
+            ret = Page._underscored_names[str] = re.sub(r"\s+", "_", str)
+            return ret
 
     @not_keyword
     def get_keyword_names(self):
@@ -198,46 +260,60 @@ class Page(_BaseActions, _SelectorsManager, _ComponentsManager):
 
         # Return all method names on the class to expose keywords to Robot Framework
         keywords = []
-        #members = inspect.getmembers(self, inspect.ismethod)
-
-
-        # Look through our methods and identify which ones are Selenium2Library's
-        # (by checking it and its base classes).
-        for name in dir(self):
-            is_keyword = _Keywords.is_obj_keyword_by_name(name, self)
-            if is_keyword:
-                obj = getattr(self, name)
-                in_s2l_base = False
-                try:
-                    func = obj.__func__  # Get the unbound function for the method
-                except AttributeError:
-                    # ignore static methods included in libraries
-                    continue
-                # Check if that function is defined in Selenium2Library
-                if func not in self.__class__.__dict__.values():
-                    if name in Selenium2Library.__dict__.keys():
-                        in_s2l_base = True
-                    else:
-                        # Check if the function is defined in any of Selenium2Library's direct base classes.
-                        # Note that this will not check those classes' ancestors.
-                        # TODO: Check all S2L's ancestors. DCLT-
-                        for base in Selenium2Library.__bases__:
-                            if name in base.__dict__.keys():
-                                in_s2l_base = True
-                # Don't add methods belonging to S2L to the exposed keywords.
-                if in_s2l_base and (in_ld or _Keywords.has_registered_s2l_keywords):
-                    continue
-                elif inspect.ismethod(obj) and not name.startswith("_") and not _Keywords.is_method_excluded(name):
-                    # Add all methods that don't start with an underscore and were not marked with the
-                    # @not_keyword decorator.
-                    if not in_ld:
-                        keywords += _Keywords.get_robot_aliases(name, self._underscore(self.name))
-                    else:
-                        keywords.append(name)
+        pageobject_name = self._underscore(self.name)
+
+        # Selenium2Library's keywords are exposed by the first page object only,
+        # and never when generating documentation.
+        skip_s2l = in_ld or _Keywords.has_registered_s2l_keywords
+
+        exposure = self.keyword_exposure
+
+        for entry in _KeywordTable.for_class(self.__class__):
+            if entry.in_s2l and skip_s2l:
+                continue
+            elif _KeywordTable.is_exposed(entry):
+                # Add all methods that don't start with an underscore and were not marked with the
+                # @not_keyword decorator.
+                if in_ld or exposure == "bare" or (entry.in_s2l and exposure != "both"):
+                    # Which page happens to expose Selenium2Library's keywords is arbitrary,
+                    # so only expose them with that page's name if asked for both names.
+                    names = [entry.name]
+                elif exposure == "aliased":
+                    names = _Keywords.get_robot_aliases(entry.name, pageobject_name)[:1]
+                else:
+                    names = _Keywords.get_robot_aliases(entry.name, pageobject_name)
+                if self._is_hybrid:
+                    names = [self._get_entry_point_name(entry, name) for name in names]
+                keywords += names
         _Keywords.has_registered_s2l_keywords = True
 
         return keywords
 
+    @classmethod
+    def _get_entry_point_name(cls, entry, kwname):
+        """
+        Gets the name of the method Robot calls for keyword `kwname` with the hybrid API,
+        generating it the first time. Entry points are named after the keyword, with
+        Robot's name for the keyword in their robot_name attribute.
+        :param entry: The keyword table entry for the method the keyword runs
+        :type entry: robotpageobjects.base._KeywordEntry
+        :param kwname: The keyword name, as the dynamic API would report it
+        :type kwname: str
+        :returns: str
+        """
+        func = entry.owner.__dict__[entry.name]
+        if not inspect.isfunction(func):
+            # Class methods can't return the current page, so Robot calls them as they are.
+            return entry.name
+
+        attr = "_robot_" + kwname
+        entry_point = cls.__dict__.get(attr)
+        if entry_point is None or entry_point.__wrapped__ is not func:
+            entry_point = wrap_entry_point(func, Page._handle_keyword_return.__func__, entry.defined_in_s2l)
+            entry_point.robot_name = printable_name(kwname, code_style=True)
+            setattr(cls, attr, entry_point)
+        return attr
+
     def _attempt_screenshot(self):
             try:
                 self.capture_page_screenshot()
@@ -256,13 +332,31 @@ class Page(_BaseActions, _SelectorsManager, _ComponentsManager):
         :returns: callable
         """
         # Translate back from Robot Framework alias to actual method
-        meth = getattr(self, _Keywords.get_funcname_from_robot_alias(alias, self._underscore(self.name)))
+        keyword_table = _KeywordTable.for_class(self.__class__)
+        funcname = keyword_table.get_funcname_from_robot_alias(alias, self._underscore(self.name))
+        meth = getattr(self, funcname)
         try:
             ret = meth(*args, **kwargs)
         except:
             # Pass up the stack, so we see complete stack trace in Robot trace logs
             raise
 
+        # Only Selenium2Library methods returning None need their table entry.
+        defined_in_s2l = False
+        if ret is None:
+            entry = keyword_table.by_name.get(funcname)
+            defined_in_s2l = entry is not None and entry.defined_in_s2l
+        return self._handle_keyword_return(ret, defined_in_s2l)
+
+    def _handle_keyword_return(self, ret, defined_in_s2l):
+        """
+        Does what Robot needs done with a keyword's return value, whichever
+        library API the page object implements.
+        :param ret: What the keyword's method returned
+        :param defined_in_s2l: Whether the method is Selenium2Library's own implementation
+        :type defined_in_s2l: bool
+        :returns: The keyword's return value
+        """
         if isinstance(ret, Page):
             # DCLT-829
             # In Context, we keep track of the currently executing page.
@@ -274,14 +368,11 @@ class Page(_BaseActions, _SelectorsManager, _ComponentsManager):
             # Look at the class name of that instance and use it to identify
             # which page object to set Context's pointer to.
 
-            # Get the names of all currently imported libraries
-            libnames = Context.get_libraries()
-            classname = ret.__class__.__name__
-
-            for name in libnames:
-                # If we find a match for the class name, set the pointer in Context.
-                if name.split(".")[-1:][0] == classname:
-                    Context.set_current_page(name)
+            # Find the imported library for the returned page's class. If there
+            # is one, set the pointer in Context.
+            libname = Context.get_library_name(ret.__class__.__name__)
+            if libname is not None:
+                Context.set_current_page(libname)
 
         # The case of raising an exception if a page object method returns None is handled
         # by Page's meta class, because we need to raise this exception for Robot and
@@ -291,15 +382,8 @@ class Page(_BaseActions, _SelectorsManager, _ComponentsManager):
         # just return self. That way, we exempt Selenium2Library from the "must_return"
         # requirement, but still know what page we're on. (For Selenium2Library keywords
         # that go to another page, we'll just assume we're using the same PO.)
-        if ret is None:
-            func = meth.__func__
-            if meth in Selenium2Library.__dict__.values():
-                ret = self
-            else:
-                for base in Selenium2Library.__bases__:
-                    if meth.__func__ in base.__dict__.values():
-                        ret = self
-                        break
+        if ret is None and defined_in_s2l:
+            ret = self
         return ret
 
     @not_keyword
@@ -311,19 +395,41 @@ class Page(_BaseActions, _SelectorsManager, _ComponentsManager):
         :return: a documentation string for kwname
         """
         if kwname == '__intro__':
-            docstring = self.__doc__ if self.__doc__ else ''
-            s2l_link = """\n
+            return self._get_intro_documentation()
+        manifest = self._get_keyword_manifest()
+        docstring = manifest.get_documentation(kwname) if manifest is not None else None
+        if docstring is None:
+            docstring = self._get_keyword_documentation(kwname)
+        return self._get_alias_documentation(kwname, self._underscore(self.name)) + docstring
+
+    # The rest of the documentation and argument helpers only need the class, so that
+    # robotpageobjects.libdoc can document page objects without instantiating them.
+
+    @classmethod
+    def _get_intro_documentation(cls):
+        docstring = cls.__doc__ if cls.__doc__ else ''
+        s2l_link = """\n
             All keywords listed in the Selenium2Library documentation are also available in this Page Object.
             See http://rtomac.github.io/robotframework-selenium2library/doc/Selenium2Library.html
             """
-            return docstring + s2l_link
-        kw = getattr(self, kwname, None)
-        alias = ''
+        return docstring + s2l_link
+
+    @classmethod
+    def _get_alias_documentation(cls, kwname, pageobject_name):
         if kwname in _Keywords._aliases:
-            alias = '*Alias: %s*\n\n' % _Keywords.get_robot_aliases(kwname, self._underscore(self.name))[0].replace('_', ' ').title()
+            return '*Alias: %s*\n\n' % _Keywords.get_robot_aliases(kwname, pageobject_name)[0].replace('_', ' ').title()
+        return ''
+
+    @classmethod
+    def _get_keyword_documentation(cls, kwname):
+        kw = getattr(cls, kwname, None)
+        if kw is None:
+            # Robot asks for the documentation of keyword names with the page name appended too.
+            return ''
+        if _Keywords.is_obj_keyword(kw):
+            _PageMeta._fix_docstring(kw)
         docstring = kw.__doc__ if kw.__doc__ else ''
-        docstring = re.sub(r'(wrapper)', r'*\1*', docstring, flags=re.I)
-        return alias + docstring
+        return re.sub(r'(wrapper)', r'*\1*', docstring, flags=re.I)
 
     @not_keyword
     def get_keyword_arguments(self, kwname):
@@ -333,8 +439,25 @@ class Page(_BaseActions, _SelectorsManager, _ComponentsManager):
         :param kwname: a keyword name
         :return: a list of strings describing the argspec
         """
-        kw = getattr(self, kwname, None)
+        manifest = self._get_keyword_manifest()
+        args = manifest.get_arguments(kwname) if manifest is not None else None
+        if args is None:
+            args = self._get_keyword_arguments(kwname)
+        return args
+
+    # Cache of keyword functions to their argument lists. Most keywords are inherited,
+    # so they're shared by every page object class.
+    _keyword_arguments = {}
+
+    @classmethod
+    def _get_keyword_arguments(cls, kwname):
+        kw = getattr(cls, kwname, None)
         if kw:
+            func = getattr(kw, "__func__", kw)
+            try:
+                return list(Page._keyword_arguments[func])
+            except KeyError:
+                pass
             args, varargs, keywords, defaults = inspect.getargspec(kw)
             defaults = dict(zip(args[-len(defaults):], defaults)) if defaults else {}
             arglist = []
@@ -348,10 +471,20 @@ class Page(_BaseActions, _SelectorsManager, _ComponentsManager):
                 arglist.append('*args')
             if keywords:
                 arglist.append('**keywords')
-            return arglist
+            Page._keyword_arguments[func] = arglist
+            return list(arglist)
         else:
             return ['*args']
 
+    def _get_keyword_manifest(self):
+        """
+        Gets the keyword manifest for this page's class, or None if there's no manifest.
+        See robotpageobjects.manifest.
+        """
+        if not self.keyword_manifest_dir:
+            return None
+        return KeywordManifest.for_page(self, self.keyword_manifest_dir)
+
     def _parse_service_args(self, service_args):
         return [arg.strip() for arg in service_args.split(" ") if arg.strip() != ""]
 
@@ -387,6 +520,8 @@ class Page(_BaseActions, _SelectorsManager, _ComponentsManager):
         :param vars: The variables to match against the template
         :type vars: tuple or list
         :returns: bool"""
+        # uritemplate and urllib2 are only needed to open pages, so don't import them with robotpageobjects.
+        import uritemplate
         keys = vars.keys()
         keys.sort()
         template_vars = list(uritemplate.variables(template))
@@ -481,6 +616,7 @@ class Page(_BaseActions, _SelectorsManager, _ComponentsManager):
                     % (uri_vars, self.uri, pageobj_name)
                 )
             self.uri_vars = uri_vars
+            import uritemplate
             return uritemplate.expand(self.baseurl + self.uri, uri_vars)
         else:
             if uri_type == 'template':
@@ -562,6 +698,7 @@ class Page(_BaseActions, _SelectorsManager, _ComponentsManager):
         """
         resolved_url = self._resolve_url(*args)
         if self._attempt_sauce:
+            import urllib2
             remote_url = "http://%s:%s@ondemand.saucelabs.com:80/wd/hub" % (self.sauce_username, self.sauce_apikey)
             caps = getattr(webdriver.DesiredCapabilities, self.browser.upper())
             caps["platform"] = self.sauce_platform
@@ -0,0 +1,236 @@
+"""
+Checks the selectors of every page object and component in a package, without opening a browser.
+
+A malformed XPath or CSS selector otherwise only shows up once a browser is open, often after waiting
+out selenium_implicit_wait. This imports a package's page object and component classes, gathers each
+class's selectors, with their references to other selectors expanded, and the locators of the components
+its pages use, and checks:
+
+- that each locator's prefix is one Selenium2Library supports,
+- that XPath and CSS locators parse, using lxml and cssselect, and
+- given a saved HTML snapshot of a page, which locators match no element, or more than one.
+
+Selector templates are checked with "1" for each variable, and not matched against snapshots.
+
+Usage::
+
+    python -m robotpageobjects.selectorcheck [--html snapshot.html] package
+
+prints one line per problem, and exits with status 1 if any locator is invalid. It needs lxml and
+cssselect, which aren't needed to run page objects: `pip install lxml cssselect`.
+"""
+from __future__ import print_function
+import sys
+from collections import namedtuple
+from optparse import OptionParser
+
+from robot.utils import normalize
+from Selenium2Library.locators.elementfinder import ElementFinder
+
+from . import exceptions, selectortemplate
+from .base import Override, _ComponentsManagerMeta
+from .libdoc import find_page_object_classes
+from .locator import Locator
+
+# Problem levels. Only errors make the command fail.
+ERROR = "ERROR"
+WARN = "WARN"
+
+# Strategies whose locators the browser evaluates, so can't be matched against a snapshot.
+# Prefixes are normalized like Selenium2Library does, ignoring case and spaces.
+_UNCHECKED_PREFIXES = ("dom", "sizzle", "jquery", "sclocator")
+
+
+class Problem(namedtuple("Problem", "level klass name locator message")):
+    """
+    A problem with a class's selector, or with the locator of a component it uses.
+    """
+
+    def __str__(self):
+        return "%s %s.%s: %s (%s): %s" % (self.level, self.klass.__module__, self.klass.__name__,
+                                          self.name, self.locator, self.message)
+
+
+def _import_parsers():
+    try:
+        import cssselect
+        from lxml import etree, html
+    except ImportError, e:
+        raise ImportError("Checking selectors needs lxml and cssselect (pip install lxml cssselect): %s" % e)
+    return etree, html, cssselect
+
+
+def get_locators(klass):
+    """
+    Gets the selectors a class defines itself, and the locators of the components it uses,
+    as (name, locator) pairs, with references to other selectors expanded. Each of a
+    selector's alternative locators is a pair of its own.
+
+    :param klass: The page object or component class
+    :type klass: type
+    :returns: list of (name, locator) tuples
+    """
+    resolved = _ComponentsManagerMeta._get_resolved_selectors(klass)
+    ret = []
+    for key in klass.__dict__.get("selectors", {}):
+        key = key.obj if isinstance(key, Override) else key
+        if isinstance(resolved[key], tuple):
+            for i, alternative in enumerate(resolved[key]):
+                ret.append(('selector "%s" alternative %s' % (key, i + 1), alternative))
+        else:
+            ret.append(('selector "%s"' % key, resolved[key]))
+    for component_class, locator in klass.__dict__.get("components", {}).iteritems():
+        # Components are merged into subclasses' components, so leave out the ones inherited as they are.
+        if any(getattr(base, "components", {}).get(component_class) == locator for base in klass.__bases__):
+            continue
+        # Components can be found with the page's selectors, too.
+        ret.append(('component "%s"' % component_class.__name__, resolved.get(locator, locator)))
+    return sorted(ret)
+
+
+def _to_xpath(locator):
+    # Gets an XPath equivalent to a parsed locator, or None.
+    etree, html, cssselect = _import_parsers()
+    prefix = "default" if locator.prefix is None else normalize(locator.prefix)
+    criteria = locator.criteria
+    if prefix == "xpath" or (prefix == "default" and criteria.startswith("//")):
+        return criteria
+    if prefix == "css":
+        return cssselect.HTMLTranslator().css_to_xpath(criteria)
+    literal = "concat('', %s)" % ", \"'\", ".join("'%s'" % part for part in criteria.split("'"))
+    if prefix == "id":
+        return "//*[@id=%s]" % literal
+    if prefix == "name":
+        return "//*[@name=%s]" % literal
+    if prefix in ("identifier", "default"):
+        return "//*[@id=%s or @name=%s]" % (literal, literal)
+    if prefix == "tag":
+        return "//%s" % criteria
+    if prefix == "link":
+        return "//a[normalize-space(.)=%s]" % literal
+    if prefix == "partiallink":
+        return "//a[contains(., %s)]" % literal
+    return None
+
+
+def check_syntax(locator):
+    """
+    Checks a locator's prefix, and, for XPath and CSS locators, its syntax.
+
+    :param locator: The locator
+    :type locator: str
+    :returns: A message saying what's wrong, or None
+    """
+    etree, html, cssselect = _import_parsers()
+    parsed = Locator.parse(locator)
+    if parsed.prefix is not None and parsed.prefix not in ElementFinder()._strategies:
+        return "Selenium2Library doesn't support the prefix \"%s\"" % parsed.prefix
+    if parsed.prefix is not None and normalize(parsed.prefix) in _UNCHECKED_PREFIXES:
+        return None
+    try:
+        xpath = _to_xpath(parsed)
+    except cssselect.SelectorSyntaxError, e:
+        return "invalid CSS selector: %s" % e
+    except cssselect.ExpressionError:
+        # Valid CSS that cssselect can't translate, like pseudo-elements.
+        return None
+    if xpath is None:
+        return None
+    try:
+        etree.XPath(xpath)(etree.fromstring("<html/>"))
+    except etree.XPathError, e:
+        return "invalid XPath: %s" % e
+    return None
+
+
+def count_matches(document, locator):
+    """
+    Counts the elements a valid locator matches in an HTML document.
+
+    :param document: The parsed document, from lxml.html
+    :param locator: The locator
+    :type locator: str
+    :returns: The number of matching elements, or None if the locator can't be matched without a browser
+    """
+    etree, html, cssselect = _import_parsers()
+    parsed = Locator.parse(locator)
+    if parsed.prefix is not None and normalize(parsed.prefix) in _UNCHECKED_PREFIXES:
+        return None
+    try:
+        xpath = _to_xpath(parsed)
+    except cssselect.ExpressionError:
+        return None
+    if xpath is None:
+        return None
+    result = document.xpath(xpath)
+    return len(result) if isinstance(result, list) else None
+
+
+def check_class(klass, document=None):
+    """
+    Checks the selectors a class defines, and the locators of the components it uses.
+
+    :param klass: The page object or component class
+    :type klass: type
+    :param document: A page snapshot parsed by lxml.html, to match locators against
+    :returns: list of Problem
+    """
+    problems = []
+    for name, locator in get_locators(klass):
+        if not isinstance(locator, basestring):
+            continue
+        filled = selectortemplate.fill(locator)
+        if filled is None:
+            problems.append(Problem(WARN, klass, name, locator, "can't fill in the template to check it"))
+            continue
+        message = check_syntax(filled)
+        if message is not None:
+            problems.append(Problem(ERROR, klass, name, locator, message))
+            continue
+        if document is None or filled != locator:
+            continue
+        count = count_matches(document, locator)
+        if count == 0:
+            problems.append(Problem(WARN, klass, name, locator, "matches no elements"))
+        elif count > 1 and not name.startswith("component"):
+            # Pages usually have more than one of a component.
+            problems.append(Problem(WARN, klass, name, locator, "matches %s elements" % count))
+    return problems
+
+
+def check_package(package, html_path=None):
+    """
+    Checks the selectors of every page object and component class in a package.
+
+    :param package: The package's name
+    :type package: str
+    :param html_path: A saved HTML page to match locators against
+    :type html_path: str
+    :returns: list of Problem
+    """
+    etree, html, cssselect = _import_parsers()
+    document = html.parse(html_path).getroot() if html_path else None
+    problems = []
+    for klass in find_page_object_classes(package):
+        problems.extend(check_class(klass, document))
+    return problems
+
+
+def main(args):
+    parser = OptionParser(usage="python -m robotpageobjects.selectorcheck [--html snapshot.html] package")
+    parser.add_option("--html", help="A saved HTML page to match selectors against")
+    options, args = parser.parse_args(args)
+    if len(args) != 1:
+        parser.error("Give a package.")
+    try:
+        problems = check_package(args[0], options.html)
+    except (ImportError, exceptions.SelectorError, exceptions.DuplicateKeyError), e:
+        # Selectors that refer to each other in a cycle, or to undefined selectors, fail at import.
+        parser.error(str(e))
+    for problem in problems:
+        print(problem)
+    return 1 if any(problem.level == ERROR for problem in problems) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
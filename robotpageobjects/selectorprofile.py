@@ -0,0 +1,129 @@
+"""
+Times finding the elements of each of a page object's selectors, in the browser, against the live page.
+
+Each selector's locator is found `repeat` times by one script run in the browser, timed with
+performance.now(), so the timings leave out WebDriver's round trips. The script finds elements like
+the alternatives of a selector with a list of locators are found. See `robotpageobjects.locator`.
+Templates are timed with "1" for each variable, and each of a selector's alternatives is timed on
+its own.
+
+Usage::
+
+    python -m robotpageobjects.selectorprofile [--repeat 10] [--url URL] mypageobjects.module.MyPage
+
+opens the page in the browser set by the usual options, eg. PO_BROWSER and PO_BASEURL, prints the
+selectors slowest first, and closes the browser. In Python, call the page object's `profile_selectors`.
+"""
+from __future__ import print_function
+import importlib
+import sys
+from collections import namedtuple
+from optparse import OptionParser
+
+from . import selectortemplate
+from .locator import FIND_FUNCTIONS_SCRIPT, to_script_locator
+
+# Finds the elements of each of a list of [strategy, criteria, scoped] locators once, to count them,
+# and then times finding them `repeat` times. Returns [milliseconds per find, count, error] for each.
+_PROFILE_SCRIPT = FIND_FUNCTIONS_SCRIPT + r"""
+var locators = arguments[0], element = arguments[1], repeat = arguments[2];
+var now = window.performance && performance.now ?
+    function () { return performance.now(); } : function () { return new Date().getTime(); };
+var results = [];
+for (var i = 0; i < locators.length; i++) {
+    var strategy = locators[i][0], criteria = locators[i][1];
+    var context = locators[i][2] && element ? element : document;
+    try {
+        var count = find(strategy, criteria, context).length;
+        var start = now();
+        for (var j = 0; j < repeat; j++) {
+            find(strategy, criteria, context);
+        }
+        results.push([(now() - start) / repeat, count, null]);
+    } catch (e) {
+        results.push([null, null, String(e)]);
+    }
+}
+return results;
+"""
+
+
+class SelectorCost(namedtuple("SelectorCost", "name locator ms matches error")):
+    """
+    How long finding a selector's elements took in the browser, in milliseconds per find,
+    and how many elements it matched, or why it couldn't be timed.
+    """
+
+    def __str__(self):
+        if self.error is not None:
+            return "%10s %8s  %s (%s): %s" % ("-", "-", self.name, self.locator, self.error)
+        return "%10.3f %8s  %s (%s)" % (self.ms, self.matches, self.name, self.locator)
+
+
+def _get_locators(selectors):
+    # Gets (name, locator) pairs for a selectors table, with a pair for each alternative.
+    ret = []
+    for name, value in sorted(selectors.iteritems()):
+        if isinstance(value, tuple):
+            ret.extend(("%s [%s]" % (name, i + 1), alternative) for i, alternative in enumerate(value))
+        elif isinstance(value, basestring):
+            ret.append((name, value))
+    return ret
+
+
+def profile(po, repeat=10):
+    """
+    Times finding the elements of each of a page object's or component's selectors, in the browser.
+    See `robotpageobjects.base._BaseActions.profile_selectors`.
+
+    :param po: The page object or component, with the page it's for open in the browser
+    :param repeat: How many times to find each selector's elements
+    :type repeat: int
+    :returns: list of SelectorCost, slowest first, then the ones that couldn't be timed
+    """
+    costs = []
+    timed = []
+    script_locators = []
+    for name, locator in _get_locators(po.selectors):
+        filled = selectortemplate.fill(locator)
+        if filled is None:
+            costs.append(SelectorCost(name, locator, None, None, "can't fill in the template"))
+            continue
+        try:
+            script_locators.append(to_script_locator(filled))
+        except ValueError, e:
+            costs.append(SelectorCost(name, locator, None, None, str(e)))
+            continue
+        timed.append((name, filled))
+
+    if timed:
+        browser = po._current_browser()
+        element = po._element_finder.get_script_context(browser, [locator for name, locator in timed])
+        results = browser.execute_script(_PROFILE_SCRIPT, script_locators, element, repeat)
+        costs.extend(SelectorCost(name, locator, ms, matches, error)
+                     for (name, locator), (ms, matches, error) in zip(timed, results))
+    return sorted(costs, key=lambda cost: (cost.error is not None, -(cost.ms or 0), cost.name))
+
+
+def main(args):
+    parser = OptionParser(usage="python -m robotpageobjects.selectorprofile [--repeat 10] [--url URL] "
+                                "module.PageClass")
+    parser.add_option("-r", "--repeat", type="int", default=10, help="How many times to find each selector")
+    parser.add_option("-u", "--url", help="The URL to open, instead of the page object's")
+    options, args = parser.parse_args(args)
+    if len(args) != 1 or "." not in args[0]:
+        parser.error("Give a page object class, eg. mypageobjects.module.MyPage.")
+    module_name, class_name = args[0].rsplit(".", 1)
+    page = getattr(importlib.import_module(module_name), class_name)()
+    page.open(*([options.url] if options.url else []))
+    try:
+        costs = page.profile_selectors(options.repeat)
+    finally:
+        page.close_browser()
+    print("%10s %8s  %s" % ("ms/find", "matches", "selector (locator)"))
+    for cost in costs:
+        print(cost)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
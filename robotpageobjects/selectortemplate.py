@@ -0,0 +1,171 @@
+"""
+Responsible for expanding selector templates, like "xpath=//li[{n}]/a", into locators.
+See `robotpageobjects.base._SelectorsManager.resolve_selector`.
+
+Each template is parsed once into the names of the variables it takes, so that resolving
+it with missing or extra variables fails with a clear error, instead of a KeyError from
+str.format, or not at all.
+
+The locators templates resolve to aren't cached: str.format is quicker than building
+a cache key from the variables and looking it up.
+"""
+
+import re
+import string
+
+from . import exceptions
+
+# How many parsed templates to keep. Templates come from selectors, so there are usually
+# far fewer, but selectors can be added to page objects as they run.
+CACHE_SIZE = 1024
+
+
+_formatter = string.Formatter()
+
+
+def _get_variable_names(template):
+    """
+    Gets the names of the variables a str.format template takes, including any
+    in nested format specs, like "{n:>{width}}".
+    """
+    names = set()
+    for literal, field_name, format_spec, conversion in _formatter.parse(template):
+        if field_name is not None:
+            # Only the name is a keyword argument, not any attribute or index after it.
+            names.add(re.split(r"[.\[]", field_name, 1)[0])
+        if format_spec and "{" in format_spec:
+            names.update(_get_variable_names(format_spec))
+    return frozenset(names)
+
+
+class SelectorTemplate(object):
+    """
+    A selector template, parsed into the names of the variables it takes.
+    """
+
+    _templates = {}
+
+    def __init__(self, template):
+        self.template = template
+        self.variable_names = _get_variable_names(template)
+
+    @classmethod
+    def get(cls, template):
+        """
+        Gets the parsed template for a template string, parsing it the first time.
+
+        :param template: The template
+        :type template: str
+        :returns: SelectorTemplate
+        """
+        try:
+            return cls._templates[template]
+        except KeyError:
+            pass
+        if len(cls._templates) >= CACHE_SIZE:
+            cls._templates.clear()
+        ret = cls._templates[template] = cls(template)
+        return ret
+
+    def check_variables(self, selector, variables):
+        """
+        Raises `exceptions.SelectorError` unless `variables` has exactly the variables
+        the template takes.
+
+        :param selector: The name of the selector, for the error message
+        :type selector: str
+        :param variables: The variables
+        :type variables: dict
+        """
+        missing = self.variable_names.difference(variables)
+        extra = set(variables).difference(self.variable_names)
+        if missing or extra:
+            problems = []
+            if missing:
+                problems.append("missing %s" % ", ".join(sorted(missing)))
+            if extra:
+                problems.append("unexpected %s" % ", ".join(sorted(extra)))
+            raise exceptions.SelectorError("Variables %s don't match template \"%s\" of selector \"%s\": %s."
+                                           % (variables, self.template, selector, "; ".join(problems)))
+
+
+# Parsed templates, by template.
+_templates = SelectorTemplate._templates
+
+
+def fill(template, value="1"):
+    """
+    Expands a template with the same value for every variable, to get an example locator,
+    eg. to check or time it.
+
+    :param template: The template
+    :type template: str
+    :param value: The value of every variable
+    :type value: str
+    :returns: The locator, or None if the template can't be expanded that way, eg. if it
+        uses attributes of variables
+    """
+    try:
+        variables = SelectorTemplate.get(template).variable_names
+        return template.format(**dict((name, value) for name in variables)) if variables else template
+    except (AttributeError, IndexError, KeyError, ValueError):
+        return None
+
+
+def resolve(selector, template, variables):
+    """
+    Expands a selector template with `variables`.
+
+    :param selector: The name of the selector, for error messages
+    :type selector: str
+    :param template: The selector's template
+    :type template: str
+    :param variables: The values of the template's variables
+    :type variables: dict
+    :returns: The locator
+    """
+    try:
+        parsed = _templates[template]
+    except KeyError:
+        try:
+            parsed = SelectorTemplate.get(template)
+        except ValueError, e:
+            raise exceptions.SelectorError("Selector \"%s\" isn't a valid template: %s" % (selector, e))
+
+    # Checking the variables first would take longer than formatting. If formatting
+    # finds every variable the template takes, and there are as many variables as
+    # the template takes, they're the right ones.
+    try:
+        locator = template.format(**variables)
+    except (KeyError, IndexError):
+        parsed.check_variables(selector, variables)
+        # The variables match, so it's an error in formatting one of them.
+        raise
+    if len(variables) != len(parsed.variable_names):
+        parsed.check_variables(selector, variables)
+    return locator
+
+
+def resolve_alternatives(selector, templates, variables):
+    """
+    Expands each of a selector's alternative templates with the variables it takes.
+    Every variable must be taken by at least one of them.
+
+    :param selector: The name of the selector, for error messages
+    :type selector: str
+    :param templates: The selector's alternative templates
+    :type templates: tuple
+    :param variables: The values of the templates' variables
+    :type variables: dict
+    :returns: A tuple of locators
+    """
+    try:
+        parsed = [SelectorTemplate.get(template) for template in templates]
+    except ValueError, e:
+        raise exceptions.SelectorError("Selector \"%s\" isn't a valid template: %s" % (selector, e))
+    # Variables no alternative takes are passed to all of them, to be reported as unexpected.
+    unexpected = set(variables).difference(*[template.variable_names for template in parsed])
+    return tuple(resolve(selector, template.template,
+                         dict((name, value) for name, value in variables.iteritems()
+                              if name in template.variable_names or name in unexpected))
+                 for template in parsed)
@@ -0,0 +1,51 @@
+"""
+Responsible for waiting client-side, for page objects and components with the `wait_engine` option
+set to "client". See `robotpageobjects.base._BaseActions`.
+
+With the browser's implicit wait set, every find that matches nothing blocks in the browser for the
+whole implicit wait, 10 seconds by default, including the finds that only ask whether an element is
+there, like is_visible, and the ones inside Selenium2Library's waits, like Wait Until Element Is Not
+Visible, on every poll. The client wait engine leaves the browser's implicit wait at 0, so the browser
+answers straight away, and polls for elements here instead, sleeping `wait_poll_interval` seconds
+between polls at first, and `wait_backoff` times longer after each poll, up to MAX_POLL_INTERVAL.
+"""
+
+import time
+
+# The longest to sleep between polls, however much the interval has backed off.
+MAX_POLL_INTERVAL = 1.0
+
+
+def intervals(interval, backoff):
+    """
+    Generates how long to sleep between polls: `interval` seconds, then `backoff` times the last
+    interval each time, up to MAX_POLL_INTERVAL, or `interval` if that's longer.
+    """
+    while True:
+        yield interval
+        interval = min(interval * backoff, max(interval, MAX_POLL_INTERVAL))
+
+
+def poll(condition, timeout, interval=0.1, backoff=1.5):
+    """
+    Calls `condition` until it returns something true, or `timeout` seconds have passed.
+    It's always called at least once, and once more at the end of the timeout.
+
+    :param condition: The condition to wait for
+    :type condition: callable
+    :param timeout: How long to wait, in seconds
+    :type timeout: float
+    :param interval: How long to sleep after the first call, in seconds
+    :type interval: float
+    :param backoff: How much longer to sleep after each call than the last
+    :type backoff: float
+    :returns: What `condition` last returned
+    """
+    end = time.time() + float(timeout)
+    sleeps = intervals(float(interval), float(backoff))
+    while True:
+        ret = condition()
+        remaining = end - time.time()
+        if ret or remaining <= 0:
+            return ret
+        time.sleep(min(next(sleeps), remaining))
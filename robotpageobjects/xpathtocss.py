@@ -0,0 +1,236 @@
+"""
+Rewrites XPath selectors that have a CSS equivalent into CSS selectors, for page objects and
+components with `xpath_to_css` set. See `robotpageobjects.base._SelectorsManager`.
+
+Browsers, and PhantomJS especially, find elements by CSS selector (querySelectorAll) much faster
+than by XPath. Many XPath selectors are only paths of element names with simple attribute tests,
+which translate exactly, eg. "xpath=//div[@id='results']/p[2]" is "css=div#results > p:nth-of-type(2)".
+Only this subset is translated:
+
+- paths starting with "//" or ".//", with "/" and "//" between steps, and unions with "|",
+- steps with an element name or "*", and no other axes,
+- a position, a number, a template variable like "{n}", or "last()", as a step's first predicate,
+- predicates testing attributes with "@name", "@name='value'", "contains(@name, 'value')",
+  "starts-with(@name, 'value')", "contains(concat(' ', normalize-space(@class), ' '), ' value ')",
+  "not(...)" of one of those, and "and" between them.
+
+Anything else, eg. text() or following-sibling::, is left as XPath.
+
+Components search for their selectors inside their reference element, but an XPath starting with
+"//" searches the whole document, and a CSS selector matches elements whose ancestors are outside
+the reference element. So for components only a single step starting with ".//" is translated.
+"""
+
+import re
+
+from robot.utils import normalize
+
+from .locator import Locator
+
+_TOKEN_RE = re.compile(r"""
+    \s*(?:
+        (?P<literal>'[^'{}]*'|"[^"{}]*")
+       |(?P<number>\d+)
+       |(?P<field>\{[A-Za-z_]\w*\})
+       |(?P<name>[A-Za-z_][\w-]*)
+       |(?P<punct>\.//|//|/|\[|\]|\(|\)|@|=|,|\||\*)
+    )\s*""", re.VERBOSE)
+
+_IDENTIFIER_RE = re.compile(r"^-?[A-Za-z_][\w-]*$")
+
+
+class _Untranslatable(Exception):
+    pass
+
+
+def _tokenize(xpath):
+    tokens = []
+    pos = 0
+    while pos < len(xpath):
+        match = _TOKEN_RE.match(xpath, pos)
+        if match is None or match.end() == pos:
+            raise _Untranslatable()
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        pos = match.end()
+    return tokens
+
+
+class _Parser(object):
+    """
+    Parses the translatable subset of XPath described in the module docstring, into CSS.
+    """
+
+    def __init__(self, xpath, scoped):
+        self.tokens = _tokenize(xpath)
+        self.pos = 0
+        self.scoped = scoped
+
+    def peek(self, offset=0):
+        try:
+            return self.tokens[self.pos + offset]
+        except IndexError:
+            return None, None
+
+    def next(self, kind=None, value=None):
+        token = self.peek()
+        if token[0] is None or (kind and token[0] != kind) or (value and token[1] != value):
+            raise _Untranslatable()
+        self.pos += 1
+        return token[1]
+
+    def accept(self, value):
+        if self.peek()[1] == value:
+            self.pos += 1
+            return True
+        return False
+
+    def parse(self):
+        paths = [self.path()]
+        while self.accept("|"):
+            paths.append(self.path())
+        if self.peek()[0] is not None:
+            raise _Untranslatable()
+        return ", ".join(paths)
+
+    def path(self):
+        start = self.next("punct")
+        if start not in (".//", "//") or (self.scoped and start != ".//"):
+            raise _Untranslatable()
+        css = self.step()
+        while self.peek()[1] in ("/", "//"):
+            if self.scoped:
+                raise _Untranslatable()
+            css += " > " if self.next() == "/" else " "
+            css += self.step()
+        return css
+
+    def step(self):
+        element = "*" if self.accept("*") else self.next("name")
+        if self.peek()[1] == "(":
+            # A node type test, like text().
+            raise _Untranslatable()
+        css = "" if element == "*" else element
+        first = True
+        while self.accept("["):
+            if first and self.peek()[0] in ("number", "field") and self.peek(1)[1] == "]":
+                css += ":nth-child(%s)" % self.next() if element == "*" else ":nth-of-type(%s)" % self.next()
+            elif first and self.peek()[1] == "last" and self.peek(1)[1] == "(":
+                self.next()
+                self.next(value="(")
+                self.next(value=")")
+                css += ":last-child" if element == "*" else ":last-of-type"
+            else:
+                css += self.condition()
+                while self.accept("and"):
+                    css += self.condition()
+            self.next(value="]")
+            first = False
+        return css or "*"
+
+    def attribute(self):
+        self.next(value="@")
+        return self.next("name")
+
+    def literal(self):
+        return self.next("literal")[1:-1]
+
+    def condition(self):
+        token = self.peek()
+        if token[1] == "@":
+            name = self.attribute()
+            if not self.accept("="):
+                return "[%s]" % name
+            value = self.literal()
+            if name == "id" and _IDENTIFIER_RE.match(value):
+                return "#%s" % value
+            return '[%s="%s"]' % (name, _escape(value))
+        if token[0] != "name" or self.peek(1)[1] != "(":
+            raise _Untranslatable()
+        function = self.next()
+        self.next(value="(")
+        if function == "not":
+            if self.peek()[1] == "not":
+                # CSS3's :not() only takes a simple selector, so it can't be nested.
+                raise _Untranslatable()
+            css = self.condition()
+            self.next(value=")")
+            return ":not(%s)" % css
+        if function == "contains" and self.peek()[1] == "concat":
+            return self.class_condition()
+        if function not in ("contains", "starts-with"):
+            raise _Untranslatable()
+        name = self.attribute()
+        self.next(value=",")
+        value = self.literal()
+        self.next(value=")")
+        if not value:
+            # Every string contains and starts with "", but CSS's *= and ^= never match "".
+            raise _Untranslatable()
+        return '[%s%s="%s"]' % (name, "*" if function == "contains" else "^", _escape(value))
+
+    def class_condition(self):
+        # contains(concat(' ', normalize-space(@class), ' '), ' value ')
+        self.next(value="concat")
+        self.next(value="(")
+        if self.literal() != " ":
+            raise _Untranslatable()
+        self.next(value=",")
+        self.next(value="normalize-space")
+        self.next(value="(")
+        if self.attribute() != "class":
+            raise _Untranslatable()
+        self.next(value=")")
+        self.next(value=",")
+        if self.literal() != " ":
+            raise _Untranslatable()
+        self.next(value=")")
+        self.next(value=",")
+        value = self.literal()
+        self.next(value=")")
+        if not (value.startswith(" ") and value.endswith(" ") and _IDENTIFIER_RE.match(value[1:-1])):
+            raise _Untranslatable()
+        return ".%s" % value[1:-1]
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def to_css(xpath, scoped=False):
+    """
+    Translates an XPath expression into an equivalent CSS selector.
+
+    :param xpath: The XPath expression
+    :type xpath: str
+    :param scoped: Whether the expression is searched for inside an element, as components' selectors are
+    :type scoped: bool
+    :returns: The CSS selector, or None if the expression can't be translated
+    """
+    try:
+        return _Parser(xpath, scoped).parse()
+    except _Untranslatable:
+        return None
+
+
+def compile_locator(locator, scoped=False):
+    """
+    Rewrites an XPath locator, like "xpath=//div" or "//div", into an equivalent CSS locator.
+
+    :param locator: The locator
+    :type locator: str
+    :param scoped: Whether the locator is searched for inside an element, as components' selectors are
+    :type scoped: bool
+    :returns: The CSS locator, or None if the locator isn't XPath or can't be translated
+    """
+    if not isinstance(locator, basestring):
+        return None
+    parsed = Locator.parse(locator)
+    if parsed.prefix is None:
+        is_xpath = locator.startswith("//")
+    else:
+        is_xpath = normalize(parsed.prefix) == "xpath"
+    if not is_xpath:
+        return None
+    css = to_css(parsed.criteria, scoped)
+    return None if css is None else "css=%s" % css
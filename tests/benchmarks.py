@@ -0,0 +1,895 @@
+"""
+Micro-benchmarks for the page object internals that run on every suite setup or keyword call.
+
+These aren't tests, so nose doesn't collect them. Run them from the tests directory::
+
+    python benchmarks.py                  # Run all benchmarks
+    python benchmarks.py keyword_names    # Run only the benchmarks whose names are given
+
+Each benchmark prints the best time per call over a few repeats.
+
+To see where import time goes, importtime.py prints a per-module breakdown like
+Python 3's `-X importtime`::
+
+    python importtime.py robotpageobjects
+"""
+from __future__ import print_function
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+
+from robotpageobjects import Page, robot_alias
+
+benchmarks = []
+
+
+def benchmark(f):
+    """
+    Registers a benchmark function. Benchmark functions take no arguments and return
+    a list of (label, callable, number of calls) tuples to time.
+    """
+    benchmarks.append(f)
+    return f
+
+
+def report(label, stmt, number, repeat=3):
+    best = min(timeit.repeat(stmt, number=number, repeat=repeat))
+    per_call = best / number
+    if per_call < 0.001:
+        print("  %-50s %10.3f us per call (%s calls)" % (label, per_call * 1000000, number))
+    else:
+        print("  %-50s %10.3f ms per call (%s calls)" % (label, per_call * 1000, number))
+
+
+def make_method(name):
+    # Return something other than a page object, so that run_keyword
+    # doesn't try to switch libraries outside of Robot.
+    def method(self):
+        return True
+    method.__name__ = name
+    return method
+
+
+def make_page_hierarchy(levels=5, methods_per_level=100, aliased_every=4, prefix="bench"):
+    """
+    Builds a synthetic chain of page object classes, with `levels` * `methods_per_level`
+    keywords in the most derived class. Every `aliased_every`-th method gets a robot_alias.
+    :returns: The most derived page object class
+    """
+    klass = Page
+    for level in range(levels):
+        classdict = {"uri": "/"}
+        for i in range(methods_per_level):
+            name = "%s_level_%s_method_%s" % (prefix, level, i)
+            method = make_method(name)
+            if i % aliased_every == 0:
+                method = robot_alias("%s__name__alias" % name)(method)
+            classdict[name] = method
+        klass = type(klass)("%sLevel%sPage" % (prefix.title(), level), (klass,), classdict)
+    return klass
+
+
+@benchmark
+def keyword_names():
+    """get_keyword_names on a 500-method page hierarchy"""
+    klass = make_page_hierarchy(prefix="keyword_names")
+    page = klass()
+    return [
+        ("class creation (5 levels x 100 methods)", lambda: make_page_hierarchy(prefix="keyword_names"), 5),
+        ("get_keyword_names", page.get_keyword_names, 50),
+    ]
+
+
+@benchmark
+def dispatch():
+    """run_keyword dispatch on a page with 1,000 @robot_alias methods"""
+    klass = make_page_hierarchy(levels=10, aliased_every=1, prefix="dispatch")
+    page = klass()
+    pageobject_name = page._underscore(page.name)
+    aliased = "dispatch_level_0_method_0_%s_alias" % pageobject_name
+    unaliased = "dispatch_level_9_method_99"
+    return [
+        ("run_keyword, aliased keyword", lambda: page.run_keyword(aliased, [], {}), 10000),
+        ("run_keyword, bare keyword name", lambda: page.run_keyword(unaliased, [], {}), 10000),
+    ]
+
+
+@benchmark
+def library_api():
+    """Calling a keyword the way Robot does, with the dynamic and the hybrid library API"""
+    from robotpageobjects.page import _Keywords
+    pages = {}
+    for api in ("dynamic", "hybrid"):
+        klass = make_page_hierarchy(prefix="library_api_%s" % api)
+        pages[api] = type(klass)("LibraryApi%sPage" % api.title(), (klass,), {"library_api": api})()
+    dynamic = pages["dynamic"]
+    hybrid = pages["hybrid"]
+    # Generates the hybrid page's entry points.
+    _Keywords.has_registered_s2l_keywords = True
+    hybrid.get_keyword_names()
+    aliased = "library_api_hybrid_level_0_method_0_%s_alias" % hybrid._underscore(hybrid.name)
+    return [
+        ("dynamic: run_keyword, bare keyword name",
+         lambda: dynamic.run_keyword("library_api_dynamic_level_0_method_1", [], {}), 100000),
+        ("hybrid: entry point, bare keyword name", getattr(hybrid, "_robot_library_api_hybrid_level_0_method_1"), 100000),
+        ("hybrid: entry point, aliased keyword", getattr(hybrid, "_robot_" + aliased), 100000),
+        ("page object method, called directly", hybrid.library_api_hybrid_level_0_method_1, 100000),
+    ]
+
+
+@benchmark
+def keyword_call():
+    """Calling page object methods through the keyword wrapper"""
+    klass = make_page_hierarchy(levels=1, prefix="keyword_call")
+    page = klass()
+    return [
+        ("class creation (1 level x 100 methods)", lambda: make_page_hierarchy(levels=1, prefix="keyword_call"), 20),
+        ("page object keyword", page.keyword_call_level_0_method_1, 100000),
+        ("@not_wrapped method (get_current_browser)", page.get_current_browser, 100000),
+    ]
+
+
+@benchmark
+def components():
+    """Creating 200 instances of a component, and a page, with three levels of selectors"""
+    from robotpageobjects import Component
+
+    component_class, page_class = Component, Page
+    for level in range(3):
+        selectors = dict(("level %s selector %s" % (level, i), "css=.level-%s-%s" % (level, i)) for i in range(20))
+        component_class = type(component_class)("BenchComponentLevel%s" % level, (component_class,),
+                                                {"selectors": selectors})
+        page_class = type(page_class)("BenchSelectorsLevel%sPage" % level, (page_class,),
+                                      {"selectors": selectors, "uri": "/"})
+
+    def make_components():
+        for i in range(200):
+            component_class(None)
+
+    return [
+        ("200 components", make_components, 5),
+        ("page object", page_class, 100),
+    ]
+
+
+@benchmark
+def selector_references():
+    """Looking up selectors built from chains of %(name)s references"""
+    selectors = {"root": "xpath=//div[@id='root']"}
+    for chain in range(10):
+        previous = "root"
+        for depth in range(20):
+            name = "chain %s depth %s" % (chain, depth)
+            selectors[name] = "%%(%s)s/div[%s]" % (previous, depth)
+            previous = name
+    # A selector combining the ends of every chain.
+    selectors["all chains"] = " | ".join("%%(chain %s depth 19)s" % chain for chain in range(10))
+    page_class = type(Page)("SelectorReferencesPage", (Page,), {"selectors": selectors, "uri": "/"})
+    page = page_class()
+    return [
+        ("class creation (201 selectors)",
+         lambda: type(Page)("SelectorReferencesPage", (Page,), {"selectors": selectors, "uri": "/"}), 20),
+        ("selector at depth 20", lambda: page.selectors["chain 0 depth 19"], 10000),
+        ("selector combining 10 chains of 20", lambda: page.selectors["all chains"], 10000),
+        ("selector without references", lambda: page.selectors["root"], 10000),
+    ]
+
+
+@benchmark
+def selector_templates():
+    """resolve_selector on a list page, resolving the nth result link for 20 results"""
+    page_class = type(Page)("SelectorTemplatesPage", (Page,), {
+        "uri": "/",
+        "selectors": {"nth result link": "xpath=(//div[@class='rslt']/p[@class='title']/a)[{n}]",
+                      "cell": "xpath=//table[@id='{table}']//tr[{row}]/td[{col}]"},
+    })
+    page = page_class()
+
+    def resolve_links():
+        for i in range(1, 21):
+            page.resolve_selector("nth result link", n=i)
+
+    return [
+        ("20 result links", resolve_links, 5000),
+        ("table cell (3 variables)", lambda: page.resolve_selector("cell", table="results", row=4, col=2), 100000),
+    ]
+
+
+@benchmark
+def element_find():
+    """Finding elements by selector name on a page and in a component, with a fake browser"""
+    from robotpageobjects import Component
+    from Selenium2Library.locators.elementfinder import ElementFinder
+
+    class FakeWebDriver(object):
+        def implicitly_wait(self, seconds):
+            pass
+
+        def find_elements_by_css_selector(self, criteria):
+            return [self]
+
+        find_elements_by_xpath = find_elements_by_css_selector
+
+        def execute_script(self, script, locator, element):
+            # find_element finds the first element, and counts them, with one script.
+            return [self, 1]
+
+    browser = FakeWebDriver()
+    selectors = {"result": "css=div.result", "title": "xpath=//p[@class='title']"}
+    page = type(Page)("ElementFindPage", (Page,), {"selectors": selectors, "uri": "/"})()
+    component = type(Component)("ElementFindComponent", (Component,), {"selectors": selectors})(browser)
+    page._current_browser = component._current_browser = lambda: browser
+
+    # Count how many times Selenium2Library parses a locator for each find.
+    calls = []
+    parse_locator = ElementFinder._parse_locator
+    ElementFinder._parse_locator = lambda self, locator: calls.append(locator) or parse_locator(self, locator)
+    try:
+        for label, po in (("page", page), ("component", component)):
+            del calls[:]
+            po.find_elements("result")
+            print("  %-50s %10s locator parses per find" % (label, len(calls)))
+    finally:
+        ElementFinder._parse_locator = parse_locator
+
+    return [
+        ("find_element by selector name on a page", lambda: page.find_element("result"), 10000),
+        ("find_element by selector name in a component", lambda: component.find_element("title"), 10000),
+        ("find_elements by selector name on a page", lambda: page.find_elements("result"), 10000),
+        ("find_elements by selector name in a component", lambda: component.find_elements("title"), 10000),
+    ]
+
+
+@benchmark
+def selector_alternatives():
+    """Finding the third of three alternative locators, one at a time vs. in one script, with 1 ms per command"""
+    import time
+    from robotpageobjects.locator import _FIND_ONE_SCRIPT
+
+    class FakeWebDriver(object):
+        commands = 0
+
+        def command(self):
+            self.commands += 1
+            time.sleep(0.001)
+
+        def implicitly_wait(self, seconds):
+            self.command()
+
+        def find_elements_by_id(self, criteria):
+            self.command()
+            return [self] if criteria == "search-v3" else []
+
+        def execute_script(self, script, locators, element):
+            self.command()
+            if script == _FIND_ONE_SCRIPT:
+                # find_element with one locator: [first element or None, count]
+                return [self, 1] if locators[1] == "search-v3" else [None, 0]
+            return [2, [self]]
+
+    browser = FakeWebDriver()
+    alternatives = ["id=search-v1", "id=search-v2", "id=search-v3"]
+    page = type(Page)("SelectorAlternativesPage", (Page,), {"selectors": {"search": alternatives}, "uri": "/"})()
+    page._current_browser = lambda: browser
+
+    def one_at_a_time():
+        for locator in alternatives:
+            try:
+                return page.find_element(locator, wait=0)
+            except ValueError:
+                pass
+
+    for label, find in (("one at a time", one_at_a_time), ("in one script", lambda: page.find_element("search"))):
+        browser.commands = 0
+        find()
+        print("  %-50s %10s commands per find" % (label, browser.commands))
+
+    return [
+        ("one at a time, with try/except", one_at_a_time, 50),
+        ("selector with alternatives", lambda: page.find_element("search"), 50),
+    ]
+
+
+@benchmark
+def element_cache():
+    """A keyword finding the same element three times, like get_text then click_element, with 1 ms per command"""
+    import time
+    from mock import Mock
+    from selenium.webdriver.remote.webelement import WebElement
+
+    class FakeWebDriver(object):
+        commands = 0
+
+        def command(self):
+            self.commands += 1
+            time.sleep(0.001)
+
+        def implicitly_wait(self, seconds):
+            self.command()
+
+        def find_elements_by_css_selector(self, criteria):
+            self.command()
+            return [WebElement(Mock(), "result")]
+
+    browser = FakeWebDriver()
+    pages = {}
+    for cache_elements in (False, True):
+        attrs = {"selectors": {"result": "css=div.result"}, "uri": "/", "cache_elements": cache_elements}
+        pages[cache_elements] = type(Page)("ElementCachePage", (Page,), attrs)()
+        pages[cache_elements]._current_browser = lambda: browser
+
+    def keyword(page):
+        # How Selenium2Library's keywords find the element they act on.
+        for i in range(3):
+            page._element_find("result", True, True)
+
+    for label, cache_elements in (("not cached", False), ("cached", True)):
+        browser.commands = 0
+        keyword(pages[cache_elements])
+        print("  %-50s %10s commands per keyword" % (label, browser.commands))
+
+    return [
+        ("not cached", lambda: keyword(pages[False]), 50),
+        ("cached", lambda: keyword(pages[True]), 50),
+    ]
+
+
+@benchmark
+def implicit_wait():
+    """Click Element on a selector name, sending the implicit wait always vs. only when it changes, 1 ms per command"""
+    import time
+    from mock import Mock
+    from selenium.webdriver.remote.command import Command
+    from selenium.webdriver.remote.errorhandler import ErrorHandler
+    from selenium.webdriver.remote.webdriver import WebDriver
+    from robotpageobjects import implicitwait
+
+    commands = []
+
+    def execute(command, params):
+        commands.append(command)
+        time.sleep(0.001)
+        return {"status": 0, "value": [{"ELEMENT": "result"}] if command == Command.FIND_ELEMENTS else None}
+
+    page = type(Page)("ImplicitWaitPage", (Page,), {"selectors": {"result": "css=div.result"}, "uri": "/"})()
+    browser = WebDriver.__new__(WebDriver)
+    browser.w3c = False
+    browser.session_id = "session"
+    browser.error_handler = ErrorHandler()
+    browser.command_executor = Mock()
+    browser.command_executor.execute.side_effect = execute
+    browser.implicitly_wait(page.selenium_implicit_wait)
+    page._current_browser = lambda: browser
+
+    def always_send(browser, seconds):
+        browser.implicitly_wait(seconds)
+        return True
+
+    def click_always_sending():
+        only_when_changed, implicitwait.implicitly_wait = implicitwait.implicitly_wait, always_send
+        try:
+            page.click_element("result")
+        finally:
+            implicitwait.implicitly_wait = only_when_changed
+
+    for label, click in (("always sent", click_always_sending), ("sent when changed", lambda: page.click_element("result"))):
+        del commands[:]
+        click()
+        print("  %-50s %10s commands per keyword" % (label, len(commands)))
+
+    return [
+        ("implicit wait always sent", click_always_sending, 50),
+        ("implicit wait sent when changed", lambda: page.click_element("result"), 50),
+    ]
+
+
+@benchmark
+def find_element_modes():
+    """find_element on a selector matching 300 elements, 1 ms per command plus 0.01 ms per element sent back"""
+    import time
+
+    class FakeWebDriver(object):
+        elements_sent = 0
+
+        def send(self, elements):
+            self.elements_sent += len(elements)
+            time.sleep(0.001 + 0.00001 * len(elements))
+            return elements
+
+        def implicitly_wait(self, seconds):
+            # Real browsers are only sent the implicit wait when it changes.
+            pass
+
+        def find_elements_by_css_selector(self, criteria):
+            return self.send([self] * 300)
+
+        def execute_script(self, script, locator, element):
+            return [self.send([self])[0], 300]
+
+    browser = FakeWebDriver()
+    page = type(Page)("FindElementModesPage", (Page,), {"selectors": {"result": "css=li.result"}, "uri": "/"})()
+    page._current_browser = lambda: browser
+
+    def find_all_then_check():
+        # How find_element found elements before it had modes.
+        return page._element_find("result", first_only=False, required=True)[0]
+
+    for label, find in (("all elements sent back", find_all_then_check),
+                        ("first mode", lambda: page.find_element("result", mode="first"))):
+        browser.elements_sent = 0
+        find()
+        print("  %-50s %10s elements sent per find" % (label, browser.elements_sent))
+
+    return [
+        ("all elements sent back", find_all_then_check, 50),
+        ("first mode, counted in the browser", lambda: page.find_element("result", mode="first"), 50),
+    ]
+
+
+@benchmark
+def find_elements_batch():
+    """Finding the demo PubMed pages' elements one selector at a time vs. in one batch, 1 ms per command"""
+    import time
+    from mock import Mock
+    from selenium.webdriver.remote.command import Command
+    from selenium.webdriver.remote.errorhandler import ErrorHandler
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "demo"))
+    import pubmed
+
+    commands = []
+
+    def execute(command, params):
+        commands.append(command)
+        time.sleep(0.001)
+        if command == Command.EXECUTE_SCRIPT:
+            return {"status": 0, "value": [[{"ELEMENT": "el"}]] * len(params["args"][0])}
+        return {"status": 0, "value": [{"ELEMENT": "el"}] if command == Command.FIND_ELEMENTS else None}
+
+    browser = WebDriver.__new__(WebDriver)
+    browser.w3c = False
+    browser.session_id = "session"
+    browser.error_handler = ErrorHandler()
+    browser.command_executor = Mock()
+    browser.command_executor.execute.side_effect = execute
+
+    # Each demo page's selectors, with the first 10 results' links on the results page.
+    pages = [
+        (pubmed.PubmedHomePage(), sorted(pubmed.PubmedHomePage.selectors)),
+        (pubmed.PubmedDocsumPage(), ["xpath=(//div[@class='rslt'])[%s]/p/a" % n for n in range(1, 11)]),
+        (pubmed.PubmedArticlePage(), ["css=body"]),
+    ]
+    for page, locators in pages:
+        page._current_browser = lambda: browser
+    browser.implicitly_wait(pages[0][0].selenium_implicit_wait)
+
+    def one_at_a_time(page, locators):
+        return dict((locator, page.find_elements(locator)) for locator in locators)
+
+    def batch(page, locators):
+        return page.find_elements_batch(locators)
+
+    for page, locators in pages:
+        for label, find in (("one at a time", one_at_a_time), ("batch", batch)):
+            del commands[:]
+            find(page, locators)
+            print("  %-50s %10s commands" % ("%s, %s selectors, %s" % (type(page).__name__, len(locators), label),
+                                            len(commands)))
+
+    page, locators = pages[1]
+    return [
+        ("PubmedDocsumPage, one at a time", lambda: one_at_a_time(page, locators), 20),
+        ("PubmedDocsumPage, batch", lambda: batch(page, locators), 20),
+    ]
+
+
+@benchmark
+def wait_engine():
+    """Negative checks on an absent element, implicit vs. client wait engine, with a 0.5 second implicit wait"""
+    import time
+
+    class FakeWebDriver(object):
+        # Waits out the implicit wait when nothing matches, like a browser.
+        wait = 0
+
+        def implicitly_wait(self, seconds):
+            self.wait = float(seconds)
+
+        def find_elements_by_id(self, criteria):
+            time.sleep(self.wait)
+            return []
+
+    browser = FakeWebDriver()
+    pages = {}
+    for engine in ("implicit", "client"):
+        options = {"selenium_implicit_wait": 0.5, "wait_engine": engine}
+        pages[engine] = type(Page)("WaitEnginePage", (Page,), {"uri": "/", "options": options})()
+        pages[engine]._current_browser = lambda: browser
+
+    for engine in ("implicit", "client"):
+        page = pages[engine]
+        yield ("is_visible, %s" % engine, lambda page=page: page.is_visible("id=spinner"), 3)
+        yield ("page_should_not_contain_element, %s" % engine,
+               lambda page=page: page.page_should_not_contain_element("id=spinner"), 3)
+
+
+@benchmark
+def dom_wait():
+    """Waiting for an element that appears 120 ms into the wait, polling wait_for vs. waiting in the browser"""
+    import time
+    from robotpageobjects import domwait
+
+    class FakeWebDriver(object):
+        # The element appears `delay` seconds after `start`, and each command takes 1 ms.
+        start = 0
+        delay = 0.12
+
+        def appeared(self):
+            return time.time() >= self.start + self.delay
+
+        def implicitly_wait(self, seconds):
+            pass
+
+        def find_elements_by_css_selector(self, criteria):
+            time.sleep(0.001)
+            return [self] if self.appeared() else []
+
+        def execute_async_script(self, script, conditions, element, timeout):
+            # The page's MutationObserver sees the element appear.
+            time.sleep(max(min(self.start + self.delay - time.time(), timeout / 1000.0), 0) + 0.001)
+            return [self.appeared(), None, []]
+
+    browser = FakeWebDriver()
+    page = type(Page)("DomWaitPage", (Page,), {"selectors": {"results": "css=#results li"}, "uri": "/"})()
+    page._current_browser = lambda: browser
+
+    def polling():
+        browser.start = time.time()
+        page.wait_for(lambda: page._is_element_present("results"), timeout=5)
+
+    def in_browser():
+        browser.start = time.time()
+        page.wait_for(domwait.element_present("results"), timeout=5)
+
+    return [
+        ("wait_for polling a callable", polling, 3),
+        ("wait_for domwait.element_present", in_browser, 3),
+    ]
+
+
+@benchmark
+def compound_wait():
+    """Spinner hidden at 100 ms and 20 results shown at 300 ms: chained waits vs. one compound wait, 1 ms per command"""
+    import time
+    from robotpageobjects import domwait
+
+    class FakeElement(object):
+        def __init__(self, shown_from, hidden_from=None):
+            self.shown_from, self.hidden_from = shown_from, hidden_from
+
+        def is_displayed(self):
+            now = time.time() - browser.start
+            return now >= self.shown_from and (self.hidden_from is None or now < self.hidden_from)
+
+    class FakeWebDriver(object):
+        start = 0
+
+        def implicitly_wait(self, seconds):
+            pass
+
+        def find_elements_by_id(self, criteria):
+            time.sleep(0.001)
+            return [FakeElement(0, 0.1)]
+
+        def find_elements_by_css_selector(self, criteria):
+            time.sleep(0.001)
+            return [FakeElement(0.3)] * 20 if time.time() - self.start >= 0.3 else []
+
+        def execute_async_script(self, script, condition, element, timeout):
+            # The page's MutationObserver sees the last change.
+            time.sleep(max(self.start + 0.3 - time.time(), 0) + 0.001)
+            return [True, None, []]
+
+    browser = FakeWebDriver()
+    selectors = {"spinner": "id=spinner", "results": "css=#results li"}
+    page = type(Page)("CompoundWaitPage", (Page,), {"selectors": selectors, "uri": "/"})()
+    page._current_browser = lambda: browser
+
+    def chained():
+        browser.start = time.time()
+        page.wait_until_element_is_not_visible("spinner", timeout=5)
+        page.wait_for(lambda: page._is_visible("results"), timeout=5)
+        page.wait_for(lambda: len(page.find_elements("results", required=False, wait=0)) == 20, timeout=5)
+
+    def compound():
+        browser.start = time.time()
+        page.wait_for_all(domwait.not_(domwait.element_visible("spinner")), domwait.element_visible("results"),
+                          domwait.count_equals("results", 20), timeout=5)
+
+    return [
+        ("chained waits", chained, 3),
+        ("one compound wait", compound, 3),
+    ]
+
+
+@benchmark
+def xpath_to_css():
+    """Finding elements in a 20,000-element page by XPath selectors and their CSS rewrites (needs PO_BROWSER's browser)"""
+    selectors = {
+        "results": "xpath=//div[@id='results']",
+        "result titles": "xpath=//div[@id='results']/div[@class='rslt']/p[@class='title']/a",
+        "nth result": "xpath=//div[@id='results']/div[{n}]",
+        "highlighted": "xpath=//div[contains(concat(' ', normalize-space(@class), ' '), ' hl ')]//a[starts-with(@href, '/item')]",
+    }
+
+    def make_class(xpath_to_css):
+        return type(Page)("XPathToCSSPage", (Page,), {"selectors": selectors, "uri": "/", "xpath_to_css": xpath_to_css})
+
+    yield ("class creation, XPath", lambda: make_class(False), 100)
+    yield ("class creation, rewritten to CSS", lambda: make_class(True), 100)
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "results.html")
+    with open(path, "w") as f:
+        f.write("<html><body><div id='results'>")
+        for i in range(5000):
+            f.write("<div class='rslt%s'><p class='title'><a href='/item/%s'>Item %s</a></p><p>Text</p></div>"
+                    % (" hl" if i % 50 == 0 else "", i, i))
+        f.write("</div></body></html>")
+
+    xpath_page, css_page = make_class(False)(), make_class(True)()
+    try:
+        xpath_page.open_browser("file://" + path, os.environ.get("PO_BROWSER", "phantomjs"))
+    except Exception, e:
+        print("  Not finding elements, because the browser didn't open: %s" % e)
+        shutil.rmtree(directory)
+        return
+    css_page._cache = xpath_page._cache
+    try:
+        for name in sorted(selectors):
+            kwargs = {"n": 2500} if "{n}" in selectors[name] else {}
+            for label, page in (("XPath", xpath_page), ("CSS", css_page)):
+                locator = page.resolve_selector(name, **kwargs)
+                find = lambda page=page, locator=locator: page.find_elements(locator, wait=0)
+                yield ("%s, %s" % (name, label), find, 20)
+    finally:
+        xpath_page.close_browser()
+        shutil.rmtree(directory)
+
+
+def write_robot_suite(directory, libraries=60, keywords_per_test=20, tests=10, library_api="dynamic"):
+    """
+    Writes a page object module with `libraries` page classes, and a Robot suite that imports
+    all of them and runs keywords that return other page objects. No browser is opened.
+    :returns: The path to the suite
+    """
+    po = ["from robotpageobjects import Page", ""]
+    for i in range(libraries):
+        po += [
+            "class BenchPage%s(Page):" % i,
+            "    library_api = \"%s\"" % library_api,
+            "    def to_next_page_from_%s(self):" % i,
+            "        return BenchPage%s()" % ((i + 1) % libraries),
+            "",
+        ]
+    module = "benchpageobjects_%s" % library_api
+    with open(os.path.join(directory, module + ".py"), "w") as f:
+        f.write("\n".join(po))
+
+    suite = ["*** Settings ***"]
+    suite += ["Library  %s.BenchPage%s" % (module, i) for i in range(libraries)]
+    suite += ["", "*** Test Cases ***"]
+    for t in range(tests):
+        suite.append("Test %s" % t)
+        suite += ["    To Next Page From %s" % (k % libraries) for k in range(keywords_per_test)]
+    path = os.path.join(directory, "bench_%s.robot" % library_api)
+    with open(path, "w") as f:
+        f.write("\n".join(suite) + "\n")
+    return path
+
+
+@benchmark
+def robot_suite():
+    """Robot suite importing 60 page libraries, running 200 keywords that return pages, with each library API"""
+    directory = tempfile.mkdtemp()
+    root_dir = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([directory, root_dir, os.environ.get("PYTHONPATH", "")]))
+    devnull = open(os.devnull, "w")
+
+    def run(suite):
+        cmd = [sys.executable, "-m", "robot.run", "--output", "NONE", "--report", "NONE", "--log", "NONE", suite]
+        subprocess.check_call(cmd, cwd=directory, env=env, stdout=devnull, stderr=devnull)
+
+    try:
+        for library_api in ("dynamic", "hybrid"):
+            suite = write_robot_suite(directory, library_api=library_api)
+            yield ("pybot run, %s API" % library_api, lambda: run(suite), 1)
+    finally:
+        devnull.close()
+        shutil.rmtree(directory)
+
+
+def write_page_package(directory, modules=20, pages_per_module=25, methods_per_page=20, name="benchpages"):
+    """
+    Writes a synthetic page object package, with `modules` modules of `pages_per_module` pages each.
+    The package imports all of its modules, the way a large page object package's __init__ might.
+    """
+    package = os.path.join(directory, name)
+    os.mkdir(package)
+    init = []
+    for m in range(modules):
+        po = ["from robotpageobjects import Page, robot_alias", ""]
+        for p in range(pages_per_module):
+            po += ["class Module%sPage%s(Page):" % (m, p),
+                   "    uri = \"/%s/%s\"" % (m, p),
+                   "    selectors = {\"thing\": \"css=#thing-%s\"}" % p,
+                   ""]
+            for k in range(methods_per_page):
+                if k % 4 == 0:
+                    po.append("    @robot_alias(\"method_%s_on__name__\")" % k)
+                po += ["    def method_%s(self, locator=\"thing\"):" % k,
+                       "        \"\"\"Does thing %s with locator.\"\"\"" % k,
+                       "        return self",
+                       ""]
+        with open(os.path.join(package, "module%s.py" % m), "w") as f:
+            f.write("\n".join(po))
+        init.append("from .module%s import *" % m)
+    with open(os.path.join(package, "__init__.py"), "w") as f:
+        f.write("\n".join(init) + "\n")
+    return name
+
+
+@benchmark
+def import_time():
+    """Importing robotpageobjects and a 500-page package in a fresh interpreter"""
+    directory = tempfile.mkdtemp()
+    package = write_page_package(directory)
+    root_dir = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([directory, root_dir, os.environ.get("PYTHONPATH", "")]))
+
+    def importer(module):
+        cmd = [sys.executable, "-c", "import %s" % module]
+        return lambda: subprocess.check_call(cmd, cwd=directory, env=env)
+
+    try:
+        yield ("interpreter startup (import sys)", importer("sys"), 5)
+        yield ("import robotpageobjects", importer("robotpageobjects"), 5)
+        yield ("import %s (20 modules x 25 pages)" % package, importer(package), 3)
+    finally:
+        shutil.rmtree(directory)
+
+
+# Imports a page library the way Robot does in a new process, and prints how long it took, in ms.
+LIBRARY_IMPORT_SCRIPT = """
+import sys, time
+from libimportpages.module0 import Module0Page0
+page = Module0Page0()
+page.keyword_manifest_dir = sys.argv[1] or None
+start = time.time()
+for name in page.get_keyword_names():
+    page.get_keyword_arguments(name)
+    page.get_keyword_documentation(name)
+print((time.time() - start) * 1000)
+"""
+
+
+@benchmark
+def library_import():
+    """What Robot asks a 20-method page library for when importing it, with and without a keyword manifest"""
+    directory = tempfile.mkdtemp()
+    write_page_package(directory, modules=1, name="libimportpages")
+    root_dir = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([directory, root_dir, os.environ.get("PYTHONPATH", "")]))
+    manifest_dir = os.path.join(directory, "manifests")
+
+    def import_library(manifest_dir):
+        # Each import is in a new process, so nothing is cached yet, like in a new Robot process.
+        cmd = [sys.executable, "-c", LIBRARY_IMPORT_SCRIPT, manifest_dir]
+        return float(subprocess.check_output(cmd, cwd=directory, env=env))
+
+    try:
+        import_library(manifest_dir)
+        for label, arg in (("introspecting page and Selenium2Library keywords", ""),
+                           ("reading keyword manifest", manifest_dir)):
+            times = sorted(import_library(arg) for _ in range(9))
+            print("  %-50s %10.3f ms median in a new process (9 processes)" % (label, times[len(times) // 2]))
+    finally:
+        shutil.rmtree(directory)
+    return []
+
+
+@benchmark
+def libdoc():
+    """XML specs for a 500-page package: Robot's libdoc per library vs. robotpageobjects.libdoc"""
+    directory = tempfile.mkdtemp()
+    package = write_page_package(directory)
+    root_dir = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([directory, root_dir, os.environ.get("PYTHONPATH", "")]))
+    output_dir = os.path.join(directory, "specs")
+    devnull = open(os.devnull, "w")
+
+    def run(*args):
+        return lambda: subprocess.check_call((sys.executable, "-m") + args, cwd=directory, env=env, stdout=devnull)
+
+    try:
+        yield ("robot.libdoc, one page library", run("robot.libdoc", "-f", "XML", "%s.Module0Page0" % package,
+                                                     os.path.join(directory, "one.xml")), 3)
+        yield ("robotpageobjects.libdoc, whole package", run("robotpageobjects.libdoc", "-f", "XML", package,
+                                                             output_dir), 1)
+    finally:
+        devnull.close()
+        shutil.rmtree(directory)
+
+
+@benchmark
+def keyword_exposure():
+    """Robot importing 100 page libraries and resolving keyword names, under each keyword_exposure policy"""
+    from robot.running.namespace import KeywordStore
+    from robot.running.testlibraries import TestLibrary
+    from robotpageobjects.page import KEYWORD_EXPOSURES, _Keywords
+
+    libraries = 100
+    directory = tempfile.mkdtemp()
+    sys.path.insert(0, directory)
+    try:
+        for exposure in KEYWORD_EXPOSURES:
+            module = "exposure_%s_pages" % exposure
+            po = ["from robotpageobjects import Page", ""]
+            for i in range(libraries):
+                po += ["class ExposurePage%s(Page):" % i,
+                       "    keyword_exposure = \"%s\"" % exposure,
+                       "    def search_page_%s(self, term):" % i,
+                       "        return self",
+                       ""]
+            with open(os.path.join(directory, module + ".py"), "w") as f:
+                f.write("\n".join(po))
+
+            names = ["%s.ExposurePage%s" % (module, i) for i in range(libraries)]
+            store = KeywordStore([], None)
+
+            def import_libraries():
+                # The first page object exposes Selenium2Library's keywords.
+                _Keywords.has_registered_s2l_keywords = False
+                store.libraries.clear()
+                for name in names:
+                    store.libraries[name] = TestLibrary(name)
+
+            # Page objects set the search order, so Robot can choose between keywords with the same name.
+            store.search_order = (names[-1],)
+            if exposure == "aliased":
+                keywords = ["Search Page %s Exposure Page%s" % (i, i) for i in range(libraries)]
+            else:
+                keywords = ["Search Page %s" % i for i in range(libraries)]
+            if exposure != "aliased":
+                # Inherited by every page object.
+                keywords.append("Get Hash")
+            keywords.append("Click Element")
+
+            def resolve():
+                for keyword in keywords:
+                    store.get_handler(keyword)
+
+            import_libraries()
+            handlers = sum(len(lib.handlers._normal) for lib in store.libraries.values())
+            yield ("%s: importing libraries (%s keywords)" % (exposure, handlers), import_libraries, 1)
+            yield ("%s: resolving %s keyword names" % (exposure, len(keywords)), resolve, 20)
+    finally:
+        sys.path.remove(directory)
+        shutil.rmtree(directory)
+
+
+def main(names):
+    for f in benchmarks:
+        if names and f.__name__ not in names:
+            continue
+        print("%s: %s" % (f.__name__, f.__doc__))
+        for label, stmt, number in f():
+            report(label, stmt, number)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
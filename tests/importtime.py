@@ -0,0 +1,76 @@
+"""
+Prints how long each module takes to import, in the same format as Python 3's `-X importtime`,
+which Python 2 doesn't have. Run it from the tests directory::
+
+    python importtime.py robotpageobjects
+    python importtime.py robotpageobjects 2>&1 | sort -t'|' -k2 -n -r | head    # Slowest first
+
+This module doesn't import robotpageobjects itself, so that the page object modules' import
+times are measured in full.
+"""
+from __future__ import print_function
+import __builtin__
+import sys
+import timeit
+
+
+def print_import_times(module):
+    """
+    Imports `module`, printing how long each module it pulls in takes to import, in the same
+    format as Python 3's `-X importtime`. Times are in microseconds. "self" excludes the time
+    spent importing other modules.
+    """
+    original_import = __builtin__.__import__
+    known = set(sys.modules)
+    # An [time spent in nested imports, time spent in this hook, modules imported] list
+    # for each import statement in progress.
+    stack = []
+    lines = []
+
+    def collect(frame):
+        # Modules are added to sys.modules before they're executed, so any module that appeared
+        # since the last check was imported by the innermost import in progress. (Comparing
+        # lengths isn't enough, since modules can be removed from sys.modules too.)
+        new = [m for m in sys.modules if m not in known]
+        known.update(new)
+        frame[2].extend(m for m in new if sys.modules[m] is not None)
+
+    def timed_import(name, *args, **kwargs):
+        start = timeit.default_timer()
+        if stack:
+            collect(stack[-1])
+            stack[-1][1] += timeit.default_timer() - start
+        stack.append([0, 0, []])
+        start = timeit.default_timer()
+        try:
+            return original_import(name, *args, **kwargs)
+        finally:
+            end = timeit.default_timer()
+            frame = stack.pop()
+            nested, overhead, modules = frame
+            collect(frame)
+            if modules:
+                cumulative = end - start - overhead
+                # Relative imports give just the last part of the module's name.
+                named = [m for m in modules if m == name or m.endswith("." + name)]
+                label = named[0] if named else min(modules, key=len)
+                lines.append((len(stack), cumulative - nested, cumulative, label))
+                if stack:
+                    stack[-1][0] += cumulative
+            if stack:
+                stack[-1][1] += overhead + timeit.default_timer() - end
+
+    __builtin__.__import__ = timed_import
+    try:
+        timed_import(module)
+    finally:
+        __builtin__.__import__ = original_import
+
+    print("import time: self [us] | cumulative | imported package", file=sys.stderr)
+    for depth, own, cumulative, label in lines:
+        print("import time: %9d | %10d | %s%s" % (own * 1000000, cumulative * 1000000, "  " * depth, label),
+              file=sys.stderr)
+
+
+if __name__ == "__main__":
+    print_import_times(sys.argv[1])
@@ -1,17 +1,31 @@
 import inspect
 import os
+import shutil
 import sys
+import tempfile
+import warnings
 from nose.tools import raises
-from mock import patch
+from mock import patch, Mock
 from robot.libraries.BuiltIn import BuiltIn
 from unittest import skipUnless
 import selenium
 from selenium import webdriver
 
 from basetestcase import BaseTestCase
-from robotpageobjects import exceptions
-from robotpageobjects.page import Page, _Keywords, Override, not_keyword
+from robotpageobjects import exceptions, not_wrapped
+from robotpageobjects.base import SelectorsDict
+from robotpageobjects.page import Page, _Keywords, _KeywordTable, Override, not_keyword, robot_alias
 from robotpageobjects.optionhandler import OptionHandler
+from robotpageobjects.context import Context
+from robotpageobjects.manifest import KeywordManifest, get_manifest_key
+from robotpageobjects import libdoc, selectorprofile, selectortemplate, xpathtocss
+try:
+    import cssselect
+    import lxml
+    from robotpageobjects import selectorcheck
+except ImportError:
+    selectorcheck = None
+from robotpageobjects.locator import Locator, to_script_locator
 
 test_dir = os.path.dirname(os.path.realpath(__file__))
 scenario_dir = os.path.join(test_dir, "scenarios")
@@ -39,6 +53,12 @@ class InheritFromSe2LibTestCase(BaseTestCase):
         except AttributeError:
             self.fail("SE2Lib methods are not exposed as direct page object attributes")
 
+    def test_se2lib_patched_once_page_object_created(self):
+        from Selenium2Library import Selenium2Library
+        from robotpageobjects import monkeypatches
+        self.assertTrue(monkeypatches._patched)
+        self.assertEquals(Selenium2Library._make_phantomjs.__module__, monkeypatches.__name__)
+
 class MockPage(object):
         pass
 
@@ -392,6 +412,195 @@ class SelectorsTestCase(BaseTestCase):
         self.assertEqual(selectors.get("bar"), "bar", "Selectors should contain 'bar' from BaseBar.")
         self.assertEqual(selectors.get("baz"), "baz", "Selector 'baz' should be overridden in FooBarPage.")
 
+    def test_selectors_merged_once_per_class(self):
+        class BasePage(Page):
+            selectors = {"foo": "foo"}
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+
+            class SubPage(BasePage):
+                selectors = {"foo": "bar"}
+
+            pages = [SubPage(), SubPage()]
+        self.assertEquals(len([w for w in caught if issubclass(w.category, exceptions.KeyOverrideWarning)]), 1)
+        self.assertEquals(SubPage.__dict__["_class_selectors"], {"foo": "bar"})
+
+        # Instances can't change each other's selectors, or the class's.
+        pages[0].selectors["baz"] = "baz"
+        self.assertNotIn("baz", pages[1].selectors)
+        self.assertNotIn("baz", SubPage().selectors)
+
+    def test_selector_references_expanded(self):
+        class BasePage(Page):
+            selectors = {"form": "id=search",
+                         "input": "%(form)s//input",
+                         "button": "%(input)s/../button"}
+
+        class SubPage(BasePage):
+            selectors = {Override("form"): "id=other-search"}
+
+        self.assertEquals(BasePage().selectors["button"], "id=search//input/../button")
+        # Selectors are expanded for each class, so overrides apply to the selectors that refer to them.
+        self.assertEquals(SubPage().selectors["button"], "id=other-search//input/../button")
+
+    def test_selector_added_to_instance_expanded(self):
+        class MyPage(Page):
+            selectors = {"form": "id=search"}
+
+        page = MyPage()
+        page.selectors["input"] = "%(form)s//input"
+        self.assertEquals(page.selectors["input"], "id=search//input")
+
+    @raises(exceptions.SelectorError)
+    def test_selector_reference_cycle(self):
+        class MyPage(Page):
+            selectors = {"a": "%(b)s/a",
+                         "b": "%(c)s/b",
+                         "c": "%(a)s/c"}
+
+    @raises(exceptions.SelectorError)
+    def test_selector_reference_undefined(self):
+        class MyPage(Page):
+            selectors = {"a": "%(b)s/a"}
+
+    def test_selector_long_reference_chain(self):
+        selectors = dict(("sel %s" % i, "%%(sel %s)s/div" % (i - 1)) for i in range(1, 2000))
+        selectors["sel 0"] = "xpath=/"
+        self.assertEquals(SelectorsDict(selectors).resolve()["sel 1999"], "xpath=/" + "/div" * 1999)
+
+
+    def test_xpath_to_css(self):
+        class MyPage(Page):
+            xpath_to_css = True
+            selectors = {"results": "xpath=//div[@id='results']",
+                         "nth result": "%(results)s/div[{n}]",
+                         "result title": "%(results)s//p[text()='Title']"}
+
+        page = MyPage()
+        self.assertEquals(page.selectors["results"], "css=div#results")
+        self.assertEquals(page.resolve_selector("nth result", n=2), "css=div#results > div:nth-of-type(2)")
+        self.assertEquals(page.selectors["result title"], "xpath=//div[@id='results']//p[text()='Title']")
+        # Selectors added later refer to rewritten selectors as they were written.
+        page.selectors["first link"] = "%(results)s//a[1]"
+        self.assertEquals(page.selectors["first link"], "xpath=//div[@id='results']//a[1]")
+
+    def test_xpath_to_css_logged_once(self):
+        class MyPage(Page):
+            xpath_to_css = True
+            selectors = {"results": "//div[@id='results']"}
+
+        with patch.object(MyPage, "_log") as log:
+            MyPage()
+            MyPage()
+        log.assert_called_once_with("Selector \"results\" rewritten from //div[@id='results'] to css=div#results",
+                                    "MyPage", "DEBUG", is_console=False)
+
+    def test_xpath_to_css_component(self):
+        from robotpageobjects import Component
+
+        class MyComponent(Component):
+            xpath_to_css = True
+            selectors = {"title": "xpath=.//p[@class='title']",
+                         "page title": "xpath=//h1"}
+
+        component = MyComponent(None)
+        self.assertEquals(component.selectors["title"], "css=p[class=\"title\"]")
+        # XPaths starting with // search the whole page, so aren't rewritten for components.
+        self.assertEquals(component.selectors["page title"], "xpath=//h1")
+
+    def test_xpath_to_css_translations(self):
+        translations = {
+            "//div[@id='results']/p[2]": "div#results > p:nth-of-type(2)",
+            "//li[{n}]/a": "li:nth-of-type({n}) > a",
+            "//div[contains(concat(' ', normalize-space(@class), ' '), ' rslt ')]//a[starts-with(@href, 'http')]":
+                'div.rslt a[href^="http"]',
+            '//tr[last()]/*[1]': "tr:last-of-type > :nth-child(1)",
+            '//td[not(@hidden) and contains(@class, "x")]': 'td:not([hidden])[class*="x"]',
+            "//a | //b[@title='say \"hi\"']": 'a, b[title="say \\"hi\\""]',
+            "(//div[@class='rslt']/a)[{n}]": None,
+            "//a[text()='x']": None,
+            "//a[not(not(@href))]": None,
+            "//div/following-sibling::p": None,
+            "//div[@class='x'][2]": None,
+            "//input[contains(@name, '')]": None,
+            "/html/body": None,
+        }
+        for xpath, css in translations.iteritems():
+            self.assertEquals(xpathtocss.to_css(xpath), css, xpath)
+
+    def test_selector_alternatives(self):
+        class MyPage(Page):
+            selectors = {"form": "id=search",
+                         "button": ["%(form)s//button", "css=#search-v2 button"],
+                         "nth result": ["xpath=//li[{n}]", "css=li:nth-child({n})", "id=first-result"]}
+
+        page = MyPage()
+        self.assertEquals(page.selectors["button"], ("id=search//button", "css=#search-v2 button"))
+        self.assertEquals(page.resolve_selector("nth result", n=2),
+                          ("xpath=//li[2]", "css=li:nth-child(2)", "id=first-result"))
+
+    @raises(exceptions.SelectorError)
+    def test_selector_alternatives_unexpected_variable(self):
+        class MyPage(Page):
+            selectors = {"nth result": ["xpath=//li[{n}]", "css=li:nth-child({n})"]}
+
+        MyPage().resolve_selector("nth result", n=2, m=3)
+
+    @raises(exceptions.SelectorError)
+    def test_selector_refers_to_alternatives(self):
+        class MyPage(Page):
+            selectors = {"form": ["id=search", "id=search-v2"],
+                         "button": "%(form)s//button"}
+
+    def test_find_with_selector_alternatives(self):
+        class MyPage(Page):
+            selectors = {"button": ["id=search-button", "css=#search-v2 button"]}
+
+        browser = Mock()
+        browser.execute_script.return_value = [1, ["el"]]
+        page = MyPage()
+        page._current_browser = lambda: browser
+        self.assertEquals(page.find_element("button"), "el")
+        self.assertEquals(browser.execute_script.call_count, 1)
+        self.assertEquals(browser.execute_script.call_args[0][1],
+                          [["id", "search-button", True], ["css", "#search-v2 button", True]])
+
+        # The alternative that matched is tried first from then on.
+        browser.execute_script.return_value = [0, ["el"]]
+        self.assertEquals(page.find_element("button"), "el")
+        self.assertEquals(browser.execute_script.call_args[0][1],
+                          [["css", "#search-v2 button", True], ["id", "search-button", True]])
+
+    def test_find_with_selector_alternatives_not_found(self):
+        browser = Mock()
+        browser.execute_script.return_value = [-1, []]
+        page = Page()
+        page._current_browser = lambda: browser
+        self.assertEquals(page.find_elements(["id=foo", "name=foo"], required=False, wait=0), [])
+        self.assertRaises(ValueError, page._element_find, ("id=foo", "name=foo"), True, True, wait=0)
+
+    def test_profile_selectors(self):
+        class MyPage(Page):
+            selectors = {"results": "css=div.results",
+                         "nth result": "xpath=//li[{n}]",
+                         "button": ["id=go", "name=go"],
+                         "applet": "scLocator=//Foo"}
+
+        browser = Mock()
+        browser.execute_script.return_value = [[0.5, 1, None], [2.0, 0, None], [None, None, "SyntaxError"],
+                                               [0.1, 1, None]]
+        page = MyPage()
+        page._current_browser = lambda: browser
+        costs = page.profile_selectors(5)
+        script, locators, element, repeat = browser.execute_script.call_args[0]
+        self.assertEquals(locators, [["id", "go", True], ["name", "go", True], ["xpath", "//li[1]", True],
+                                     ["css", "div.results", True]])
+        self.assertEquals((element, repeat), (None, 5))
+        self.assertEquals([(cost.name, cost.ms) for cost in costs],
+                          [("button [2]", 2.0), ("button [1]", 0.5), ("results", 0.1),
+                           ("applet", None), ("nth result", None)])
+        self.assertEquals(costs[4].error, "SyntaxError")
 
 class KeywordTestCase(BaseTestCase):
 
@@ -431,12 +640,31 @@ class KeywordTestCase(BaseTestCase):
         self.assertIsNone(self.p._return_none())
 
     def test_se2lib_keywords_fixed_to_mention_selectors(self):
+        self.p.get_keyword_documentation("click_element")
         m = getattr(self.p, "click_element")
         docstring = inspect.getdoc(m)
         first_line_of_docstring = docstring.split("\n")[0]
         self.assertEquals(first_line_of_docstring, "click_element(self, selector_or_locator)")
         self.assertTrue("Click element identified by `selector` or `locator`" in docstring)
 
+    def test_docstrings_not_fixed_on_class_creation(self):
+        class DocPage(Page):
+            def find_thing(self, locator):
+                """Finds the thing at locator in the page."""
+                return self
+
+        class SubDocPage(DocPage):
+            pass
+
+        self.assertEquals(DocPage.find_thing.__doc__, "Finds the thing at locator in the page.")
+        doc = SubDocPage().get_keyword_documentation("find_thing")
+        self.assertTrue(doc.startswith("find_thing(self, selector_or_locator)"))
+        self.assertTrue("Finds the thing at selector or locator in the page." in doc)
+
+        # Fixing up another class that inherits the keyword doesn't fix it up twice.
+        doc = DocPage().get_keyword_documentation("find_thing")
+        self.assertEquals(doc.count("selector_or_locator"), 1)
+
     def test_is_obj_keyword(self):
         is_obj_keyword = _Keywords.is_obj_keyword
         self.assertTrue(is_obj_keyword(Page.click_element))
@@ -472,6 +700,236 @@ class KeywordTestCase(BaseTestCase):
         self.assertFalse(exc_raised, "An exception was raised when trying to access a page object property that "
                                      "raises an exception itself")
 
+    def test_get_keyword_names_does_not_evaluate_properties(self):
+        calls = []
+
+        class MyPage(Page):
+
+            @property
+            def some_property(self):
+                calls.append(1)
+                return 1
+
+        MyPage().get_keyword_names()
+        self.assertEquals(calls, [], "get_keyword_names should not evaluate page object properties")
+
+    def get_exposed_names(self, exposure, s2l=False):
+        class MyPage(Page):
+            keyword_exposure = exposure
+
+            def foo(self):
+                return self
+
+            @robot_alias("bar__name__baz")
+            def bar_baz(self):
+                return self
+
+        with patch.object(_Keywords, "has_registered_s2l_keywords", not s2l):
+            return MyPage().get_keyword_names()
+
+    def test_keyword_exposure_both(self):
+        names = self.get_exposed_names("both")
+        for name in ("foo", "foo_My_Page", "bar_baz", "bar_My_Page_baz"):
+            self.assertIn(name, names)
+
+    def test_keyword_exposure_aliased(self):
+        names = self.get_exposed_names("aliased")
+        self.assertIn("foo_My_Page", names)
+        self.assertIn("bar_My_Page_baz", names)
+        self.assertNotIn("foo", names)
+        self.assertNotIn("bar_baz", names)
+
+    def test_keyword_exposure_bare(self):
+        names = self.get_exposed_names("bare")
+        self.assertIn("foo", names)
+        self.assertIn("bar_baz", names)
+        self.assertNotIn("foo_My_Page", names)
+        self.assertNotIn("bar_My_Page_baz", names)
+
+    def test_keyword_exposure_s2l_keywords_bare(self):
+        names = self.get_exposed_names("aliased", s2l=True)
+        self.assertIn("click_element", names)
+        self.assertNotIn("click_element_My_Page", names)
+        self.assertIn("click_element_My_Page", self.get_exposed_names("both", s2l=True))
+
+    @raises(exceptions.KeywordExposureError)
+    def test_keyword_exposure_invalid(self):
+        class MyPage(Page):
+            keyword_exposure = "aliases"
+
+    def make_hybrid_page(self):
+        class MyPage(Page):
+            library_api = "hybrid"
+
+            def foo(self, bar, baz=1):
+                return bar
+
+            @robot_alias("go__name__to_other")
+            def go_to_other(self):
+                return OtherPage()
+
+        class OtherPage(Page):
+            pass
+
+        return MyPage
+
+    def test_hybrid_library_api(self):
+        from robot.running.testlibraries import _get_lib_class, _HybridLibrary
+        MyPage = self.make_hybrid_page()
+        self.assertIsNone(MyPage.run_keyword)
+        self.assertEquals(_get_lib_class(MyPage), _HybridLibrary)
+
+        p = MyPage()
+        with patch.object(_Keywords, "has_registered_s2l_keywords", True):
+            names = p.get_keyword_names()
+        self.assertIn("_robot_foo_My_Page", names)
+        self.assertIn("_robot_go_My_Page_to_other", names)
+        entry_point = getattr(p, "_robot_foo_My_Page")
+        self.assertEquals(entry_point.robot_name, "Foo My Page")
+        self.assertEquals(inspect.getargspec(entry_point), inspect.getargspec(p.foo))
+        self.assertEquals(entry_point("bar"), "bar")
+        self.assertEquals(getattr(p, "_robot_go_to_other").robot_name, "Go To Other")
+
+    def test_hybrid_entry_point_sets_current_page(self):
+        MyPage = self.make_hybrid_page()
+        p = MyPage()
+        with patch.object(_Keywords, "has_registered_s2l_keywords", True):
+            p.get_keyword_names()
+        with patch.object(Context, "get_library_name", return_value="mypageobjects.OtherPage") as get_library_name:
+            with patch.object(Context, "set_current_page") as set_current_page:
+                p._robot_go_to_other()
+        get_library_name.assert_called_once_with("OtherPage")
+        set_current_page.assert_called_once_with("mypageobjects.OtherPage")
+
+    def test_hybrid_s2l_keyword_returns_page(self):
+        self.assertEquals(self.p._handle_keyword_return(None, True), self.p)
+        self.assertIsNone(self.p._handle_keyword_return(None, False))
+
+    def test_dynamic_subclass_of_hybrid_page(self):
+        class MyDynamicPage(self.make_hybrid_page()):
+            library_api = "dynamic"
+
+        self.assertTrue(callable(MyDynamicPage.run_keyword))
+
+    @raises(exceptions.LibraryApiError)
+    def test_library_api_invalid(self):
+        class MyPage(Page):
+            library_api = "static"
+
+    def test_keyword_table_built_on_class_creation(self):
+        class MyPage(Page):
+            def foo(self):
+                return self
+
+            @not_keyword
+            def bar(self):
+                return self
+
+            @property
+            def baz(self):
+                return 1
+
+        table = MyPage.__dict__["_keyword_table"]
+        self.assertEquals(table.by_name["foo"].owner, MyPage)
+        self.assertFalse(table.by_name["foo"].in_s2l)
+        self.assertNotIn("bar", table.by_name)
+        self.assertNotIn("baz", table.by_name)
+        self.assertNotIn("_return_none", table.by_name)
+
+    def test_keyword_table_s2l_flags(self):
+        table = _KeywordTable.for_class(self.p.__class__)
+        click_element = table.by_name["click_element"]
+        self.assertTrue(click_element.in_s2l)
+        self.assertTrue(click_element.defined_in_s2l)
+        go_to = table.by_name["go_to"]
+        self.assertEquals(go_to.owner, Page)
+        self.assertTrue(go_to.in_s2l, "Inherited overrides of Selenium2Library keywords count as Selenium2Library's")
+        self.assertFalse(go_to.defined_in_s2l)
+
+    def test_run_keyword_resolves_aliases(self):
+        class MyPage(Page):
+            name = "My Page"
+
+            @robot_alias("do__name__thing")
+            def do_thing(self):
+                return "aliased"
+
+            def other_thing(self):
+                return "unaliased"
+
+        p = MyPage()
+        self.assertEquals(p.run_keyword("do_My_Page_thing", [], {}), "aliased")
+        self.assertEquals(p.run_keyword("do_thing", [], {}), "aliased")
+        self.assertEquals(p.run_keyword("other_thing_My_Page", [], {}), "unaliased")
+        self.assertEquals(p.run_keyword("other_thing", [], {}), "unaliased")
+
+    def test_alias_index_rebuilt_when_alias_registered(self):
+        class MyPage(Page):
+            name = "My Page"
+
+            def late_thing(self):
+                return "late"
+
+        p = MyPage()
+        table = _KeywordTable.for_class(MyPage)
+        self.assertNotIn("_My_Page_late_thing", table.get_alias_index("My_Page"))
+
+        # Aliases are registered globally by method name, so aliasing a method
+        # with the same name on another class affects this one too.
+        class OtherPage(Page):
+            @robot_alias("__name__late_thing")
+            def late_thing(self):
+                return "late"
+
+        self.assertEquals(table.get_alias_index("My_Page")["_My_Page_late_thing"], "late_thing")
+        self.assertEquals(p.run_keyword("_My_Page_late_thing", [], {}), "late")
+
+
+class KeywordWrapperTestCase(BaseTestCase):
+
+    def setUp(self):
+        super(KeywordWrapperTestCase, self).setUp()
+
+        class P(Page):
+            def keyword_with_args(self, a, b=2, *args, **kwargs):
+                return a, b, args, kwargs
+
+            def failing_keyword(self):
+                raise ValueError("failed")
+
+            def keyword_calling_failing_keyword(self):
+                return self.failing_keyword()
+
+            @not_wrapped
+            def unwrapped_helper(self):
+                pass
+
+        self.P = P
+        self.p = P()
+        self.p._run_on_failure = Mock()
+
+    def test_single_wrapper_layer(self):
+        wrapper = self.P.__dict__["keyword_with_args"]
+        self.assertTrue(inspect.isfunction(wrapper.__wrapped__))
+        self.assertFalse(hasattr(wrapper.__wrapped__, "__wrapped__"))
+
+    def test_signature_preserved(self):
+        self.assertEquals(inspect.getargspec(self.P.keyword_with_args),
+                          (["self", "a", "b"], "args", "kwargs", (2,)))
+        self.assertEquals(self.p.get_keyword_arguments("keyword_with_args"), ["a", "b=2", "*args", "**keywords"])
+        self.assertEquals(self.p.keyword_with_args(1), (1, 2, (), {}))
+        self.assertEquals(self.p.keyword_with_args(1, 3, 4, c=5), (1, 3, (4,), {"c": 5}))
+
+    def test_run_on_failure_runs_once_for_nested_keywords(self):
+        self.assertRaises(ValueError, self.p.keyword_calling_failing_keyword)
+        self.assertEquals(self.p._run_on_failure.call_count, 1)
+        self.assertFalse(self.p._has_run_on_failure)
+        self.assertFalse(self.p._already_in_keyword)
+
+    def test_not_wrapped(self):
+        self.assertIsNone(self.p.unwrapped_helper())
+        self.assertFalse(hasattr(self.P.__dict__["unwrapped_helper"], "__wrapped__"))
+
 
 class LoggingLevelsTestCase(BaseTestCase):
     # Tests protected method Page._get_normalized_logging_levels, which given a
@@ -564,8 +1022,9 @@ class SelectorTemplateTestCase(BaseTestCase):
     def test_basic(self):
         self.assertEquals("xpath=//foo[3]/p", self.p.resolve_selector("foo", n=3, el="p"))
 
+    @raises(exceptions.SelectorError)
     def test_too_many_args(self):
-        self.assertEquals("xpath=//foo[3]/p", self.p.resolve_selector("foo", n=3, el="p", boo="bat"))
+        self.p.resolve_selector("foo", n=3, el="p", boo="bat")
 
     @raises(exceptions.SelectorError)
     def test_not_enough_args(self):
@@ -575,6 +1034,590 @@ class SelectorTemplateTestCase(BaseTestCase):
     def test_wrong_args(self):
         self.p.resolve_selector("foo", n=3, ep="p")
 
+    def test_template_variable_names(self):
+        template = selectortemplate.SelectorTemplate.get("xpath=//{tag.name}[{n:>{width}}][@id='{ids[0]}']")
+        self.assertEquals(template.variable_names, frozenset(["tag", "n", "width", "ids"]))
+
+
+class LocatorTestCase(BaseTestCase):
+    def test_parse(self):
+        self.assertEquals(Locator.parse("css = div.result"),
+                          ("css = div.result", "css ", "div.result", True, True))
+        self.assertEquals(Locator.parse("//div[@a='b=c']"), ("//div[@a='b=c']", None, "//div[@a='b=c']", True, True))
+        self.assertEquals(Locator.parse("search"), ("search", None, "search", True, False))
+        self.assertFalse(Locator.parse("dom=document.forms[0]").scoped)
+
+    def test_parsed_once(self):
+        self.assertIs(Locator.parse("id=parsed-once"), Locator.parse("id=parsed-once"))
+
+    def test_script_strategies_are_selenium2librarys(self):
+        self.assertEquals(to_script_locator("partial link=Next"), ["partiallink", "Next", True])
+        # Selenium2Library has no class strategy, so neither do the scripts.
+        self.assertRaises(ValueError, to_script_locator, "class=result")
+
+    def test_page_finds_with_parsed_locator(self):
+        class MyPage(Page):
+            selectors = {"result": "css=div.result"}
+
+        browser = Mock()
+        browser.find_elements_by_css_selector.return_value = ["el"]
+        page = MyPage()
+        page._current_browser = lambda: browser
+        with patch("Selenium2Library.locators.elementfinder.ElementFinder._parse_locator") as parse_locator:
+            self.assertEquals(page.find_elements("result"), ["el"])
+        browser.find_elements_by_css_selector.assert_called_once_with("div.result")
+        self.assertFalse(parse_locator.called)
+
+    def test_component_find_scoped(self):
+        from robotpageobjects import Component
+
+        browser, reference_webelement = Mock(), Mock()
+        reference_webelement.find_elements_by_id.return_value = ["el"]
+        component = Component(reference_webelement)
+        component._current_browser = lambda: browser
+        self.assertEquals(component._element_finder.find(browser, "id=foo"), ["el"])
+        component._element_finder.find(browser, "dom=document.forms[0]")
+        self.assertTrue(browser.execute_script.called)
+
+
+class ElementCacheTestCase(BaseTestCase):
+    def setUp(self):
+        super(ElementCacheTestCase, self).setUp()
+        from selenium.webdriver.remote.webelement import WebElement
+
+        class MyPage(Page):
+            cache_elements = True
+            selectors = {"result": "css=div.result"}
+
+        self.browser = Mock()
+        self.parent = Mock()
+        self.browser.find_elements_by_css_selector.return_value = [WebElement(self.parent, "id1")]
+        self.page = MyPage()
+        self.page._current_browser = lambda: self.browser
+
+    def find_first(self, locator):
+        # How Selenium2Library's keywords, like click_element, find elements.
+        return self.page._element_find(locator, True, True)
+
+    def test_find_twice_finds_once(self):
+        element = self.find_first("result")
+        self.assertEquals(element.id, "id1")
+        self.assertIs(self.find_first("result"), element)
+        self.assertEquals(self.browser.find_elements_by_css_selector.call_count, 1)
+        self.assertEquals(self.page.get_element_cache_stats(),
+                          {"hits": 1, "misses": 1, "invalidations": 0, "size": 1})
+
+    def test_find_all_not_cached(self):
+        self.page.find_elements("result")
+        self.page.find_elements("result")
+        self.assertEquals(self.browser.find_elements_by_css_selector.call_count, 2)
+
+    def test_navigation_invalidates(self):
+        from robotpageobjects import elementcache
+        from selenium.webdriver.remote.command import Command
+
+        self.find_first("result")
+        elementcache.invalidate(self.browser, Command.GET_TITLE)
+        self.find_first("result")
+        elementcache.invalidate(self.browser, Command.GET)
+        self.find_first("result")
+        self.assertEquals(self.browser.find_elements_by_css_selector.call_count, 2)
+        self.assertEquals(self.page.get_element_cache_stats()["invalidations"], 1)
+
+    def test_stale_element_found_again(self):
+        from selenium.common.exceptions import StaleElementReferenceException
+        from selenium.webdriver.remote.webelement import WebElement
+
+        element = self.find_first("result")
+        self.browser.find_elements_by_css_selector.return_value = [WebElement(self.parent, "id2")]
+        self.parent.execute.side_effect = [StaleElementReferenceException(), {"value": "text"}]
+        self.assertEquals(element.text, "text")
+        self.assertEquals(element.id, "id2")
+        self.assertEquals(self.parent.execute.call_args[0][1]["id"], "id2")
+        self.assertIs(self.find_first("result"), element)
+        self.assertEquals(self.browser.find_elements_by_css_selector.call_count, 2)
+
+    def test_removed_element_stays_stale(self):
+        from selenium.common.exceptions import StaleElementReferenceException
+
+        element = self.find_first("result")
+        self.browser.find_elements_by_css_selector.return_value = []
+        self.parent.execute.side_effect = StaleElementReferenceException()
+        with patch.object(self.page, "_element_find_uncached", wraps=self.page._element_find_uncached) as find:
+            self.assertRaises(StaleElementReferenceException, element.is_displayed)
+        self.assertEquals(find.call_args[0][1], 0)
+
+    def test_removed_element_not_present(self):
+        self.page.page_should_contain_element("result")
+        self.browser.find_elements_by_css_selector.return_value = []
+        self.page.page_should_not_contain_element("result")
+        self.assertFalse(self.page._is_element_present("result"))
+
+
+class ImplicitWaitTestCase(BaseTestCase):
+    def setUp(self):
+        super(ImplicitWaitTestCase, self).setUp()
+        from selenium.webdriver.remote.command import Command
+        from selenium.webdriver.remote.errorhandler import ErrorHandler
+        from selenium.webdriver.remote.webdriver import WebDriver
+
+        class MyPage(Page):
+            selectors = {"result": "css=div.result"}
+
+        self.page = MyPage()
+
+        # A WebDriver that sends its commands nowhere, so they can be counted.
+        self.commands = []
+        def execute(command, params):
+            self.commands.append(command)
+            return {"status": 0, "value": [{"ELEMENT": "id1"}] if command == Command.FIND_ELEMENTS else None}
+        browser = WebDriver.__new__(WebDriver)
+        browser.w3c = False
+        browser.session_id = "session"
+        browser.error_handler = ErrorHandler()
+        browser.command_executor = Mock()
+        browser.command_executor.execute.side_effect = execute
+        browser.implicitly_wait(self.page.selenium_implicit_wait)
+        self.page._current_browser = lambda: browser
+        del self.commands[:]
+
+    def test_keyword_sends_no_implicit_wait(self):
+        from selenium.webdriver.remote.command import Command
+
+        self.page.click_element("result")
+        self.assertEquals(self.commands, [Command.FIND_ELEMENTS, Command.CLICK_ELEMENT])
+
+    def test_wait_sent_when_different(self):
+        from selenium.webdriver.remote.command import Command
+
+        self.page.find_elements("result", wait=0)
+        self.assertEquals(self.commands, [Command.IMPLICIT_WAIT, Command.FIND_ELEMENTS, Command.IMPLICIT_WAIT])
+
+
+class FindElementModeTestCase(BaseTestCase):
+    def setUp(self):
+        super(FindElementModeTestCase, self).setUp()
+
+        class MyPage(Page):
+            selectors = {"result": "css=div.result"}
+
+        self.browser = Mock()
+        self.page = MyPage()
+        self.page._current_browser = lambda: self.browser
+
+    def test_strict_counts_in_browser(self):
+        self.browser.execute_script.return_value = ["el", 1]
+        self.assertEquals(self.page.find_element("result"), "el")
+        self.assertEquals(self.browser.execute_script.call_args[0][1:], (["css", "div.result", True], None))
+        self.assertFalse(self.browser.find_elements_by_css_selector.called)
+
+    @raises(exceptions.SelectorError)
+    def test_strict_more_than_one(self):
+        self.browser.execute_script.return_value = ["el", 300]
+        self.page.find_element("result")
+
+    def test_first(self):
+        self.browser.execute_script.return_value = ["el", 300]
+        self.assertEquals(self.page.find_element("result", mode="first"), "el")
+
+    def test_mode_option(self):
+        class FirstMatchPage(Page):
+            options = {"find_element_mode": "first"}
+
+        self.assertEquals(self.page.find_element_mode, "strict")
+        self.assertEquals(FirstMatchPage().find_element_mode, "first")
+
+    @raises(ValueError)
+    def test_invalid_mode(self):
+        self.page.find_element("result", mode="any")
+
+    def test_not_found_waits(self):
+        self.browser.execute_script.return_value = [None, 0]
+        self.browser.find_elements_by_css_selector.return_value = ["el"]
+        self.assertEquals(self.page.find_element("result"), "el")
+        self.assertEquals(self.page.find_element("result", mode="first"), "el")
+        self.assertEquals(self.browser.find_elements_by_css_selector.call_count, 2)
+
+
+class FindElementsBatchTestCase(BaseTestCase):
+    def setUp(self):
+        super(FindElementsBatchTestCase, self).setUp()
+
+        class MyPage(Page):
+            selectors = {"title": "css=h1", "authors": "xpath=//div[@class='auths']/a",
+                         "abstract": ["id=abstract", "css=.abstr"]}
+
+        self.browser = Mock()
+        self.page = MyPage()
+        self.page._current_browser = lambda: self.browser
+
+    def test_one_script(self):
+        self.browser.execute_script.return_value = [["h1"], ["a1", "a2"], ["abstr"], ["el"]]
+        ret = self.page.find_elements_batch(["title", "authors", "abstract", "name=q"])
+        self.assertEquals(ret, {"title": ["h1"], "authors": ["a1", "a2"], "abstract": ["abstr"], "name=q": ["el"]})
+        self.assertEquals(self.browser.execute_script.call_count, 1)
+        self.assertEquals(self.browser.execute_script.call_args[0][1],
+                          [[["css", "h1", True]], [["xpath", "//div[@class='auths']/a", True]],
+                           [["id", "abstract", True], ["css", ".abstr", True]], [["name", "q", True]]])
+
+    def test_not_found(self):
+        self.browser.execute_script.return_value = [["h1"], []]
+        self.assertEquals(self.page.find_elements_batch(["title", "id=foo"], required=False, wait=0),
+                          {"title": ["h1"], "id=foo": []})
+        self.assertRaises(ValueError, self.page.find_elements_batch, ["title", "id=foo"], wait=0)
+
+    @raises(exceptions.SelectorError)
+    def test_strategy_not_in_browser(self):
+        self.page.find_elements_batch(["title", "scLocator=//Foo"])
+
+    @raises(exceptions.SelectorError)
+    def test_misspelled_selector(self):
+        self.browser.execute_script.return_value = [["h1"], []]
+        self.page.find_elements_batch(["title", "titel"], wait=0)
+
+    def test_default_strategy(self):
+        self.browser.execute_script.return_value = [["el"]]
+        self.assertEquals(self.page.find_elements_batch(["q"]), {"q": ["el"]})
+        self.assertEquals(self.browser.execute_script.call_args[0][1], [[["identifier", "q", True]]])
+
+    def test_polls_with_wait_options(self):
+        self.browser.execute_script.side_effect = [[["h1"], []], [["h1"], ["el"]]]
+        with patch("robotpageobjects.waiting.time.sleep") as sleep:
+            self.page.find_elements_batch(["title", "id=foo"], wait=5)
+        sleep.assert_called_once_with(self.page.wait_poll_interval)
+
+
+class WaitEngineTestCase(BaseTestCase):
+    def setUp(self):
+        super(WaitEngineTestCase, self).setUp()
+
+        class MyPage(Page):
+            options = {"wait_engine": "client", "wait_poll_interval": 0.01}
+
+        self.browser = Mock()
+        self.page = MyPage()
+        self.page._current_browser = lambda: self.browser
+
+    def test_browser_does_not_wait(self):
+        self.assertEquals(self.page._implicit_wait_in_secs, 0)
+        self.assertEquals(self.page.selenium_implicit_wait, 10)
+        self.assertEquals(Page().wait_engine, "implicit")
+
+    def test_absent_answered_immediately(self):
+        self.browser.find_elements_by_id.return_value = []
+        self.assertIsNone(self.page.is_visible("id=missing"))
+        self.assertEquals(self.browser.find_elements_by_id.call_count, 1)
+        self.assertFalse(any(call[0] != (0,) for call in self.browser.implicitly_wait.call_args_list))
+
+    def test_find_polls(self):
+        self.browser.find_elements_by_id.side_effect = [[], [], ["el"]]
+        self.assertEquals(self.page._element_find("id=foo", True, True, wait=1), "el")
+        self.assertEquals(self.browser.find_elements_by_id.call_count, 3)
+
+    @raises(ValueError)
+    def test_find_times_out(self):
+        self.browser.find_elements_by_id.return_value = []
+        self.page._element_find("id=foo", True, True, wait=0.05)
+
+    @raises(selenium.common.exceptions.TimeoutException)
+    def test_wait_for_times_out(self):
+        self.page.wait_for(lambda: False, timeout=0.05)
+
+    def test_intervals_back_off(self):
+        from itertools import islice
+        from robotpageobjects import waiting
+
+        self.assertEquals([round(i, 3) for i in islice(waiting.intervals(0.1, 2), 6)], [0.1, 0.2, 0.4, 0.8, 1.0, 1.0])
+        self.assertEquals(list(islice(waiting.intervals(0.2, 1), 3)), [0.2, 0.2, 0.2])
+
+
+class DomWaitTestCase(BaseTestCase):
+    def setUp(self):
+        super(DomWaitTestCase, self).setUp()
+
+        class MyPage(Page):
+            selectors = {"results": "css=#results li", "applet": "scLocator=//Foo"}
+
+        self.browser = Mock()
+        self.page = MyPage()
+        self.page._current_browser = lambda: self.browser
+
+    def test_waits_in_browser(self):
+        from robotpageobjects import domwait
+
+        self.browser.execute_async_script.return_value = [True, None, []]
+        self.assertIs(self.page.wait_for(domwait.count_equals("results", "20"), timeout=5), self.page)
+        script, condition, element, timeout = self.browser.execute_async_script.call_args[0]
+        self.assertEquals(condition, ["count equals", [["css", "#results li", True]], 20])
+        self.assertIsNone(element)
+        self.assertTrue(4900 < timeout <= 5000)
+
+    @raises(selenium.common.exceptions.TimeoutException)
+    def test_times_out(self):
+        from robotpageobjects import domwait
+
+        self.browser.execute_async_script.return_value = [False, None, [[]]]
+        self.page.wait_for(domwait.element_visible("results"), timeout=0.01)
+
+    @raises(ValueError)
+    def test_script_error(self):
+        from robotpageobjects import domwait
+
+        self.browser.execute_async_script.return_value = [False, "SyntaxError", []]
+        self.page.wait_for(domwait.text_contains("results", "cat"))
+
+    def test_compound_in_one_script(self):
+        from robotpageobjects import domwait
+
+        self.browser.execute_async_script.return_value = [True, None, []]
+        self.page.wait_for_all(domwait.not_(domwait.element_visible("id=spinner")),
+                               domwait.any_of(domwait.element_present("results"), domwait.text_contains("id=msg", "No")))
+        self.assertEquals(self.browser.execute_async_script.call_count, 1)
+        self.assertEquals(self.browser.execute_async_script.call_args[0][1],
+                          ["all of", [["not", [["visible", [["id", "spinner", True]], None]]],
+                                      ["any of", [["present", [["css", "#results li", True]], None],
+                                                  ["text contains", [["id", "msg", True]], "No"]]]]])
+
+    def test_compound_says_what_was_not_met(self):
+        from robotpageobjects import domwait
+
+        self.browser.execute_async_script.return_value = [False, None, [[1]]]
+        try:
+            self.page.wait_for_all(domwait.not_(domwait.element_visible("id=spinner")),
+                                   domwait.count_equals("results", 20), timeout=0.01)
+        except selenium.common.exceptions.TimeoutException, e:
+            self.assertTrue(e.msg.endswith("Not met: \"results\" matching 20 elements"), e.msg)
+        else:
+            self.fail("Didn't time out")
+
+    def test_falls_back_to_polling(self):
+        from robotpageobjects import domwait
+
+        with patch.object(domwait.Condition, "check", return_value=True) as check:
+            self.page.wait_for(domwait.element_present("applet"), timeout=1)
+        check.assert_called_with(self.page)
+        self.assertFalse(self.browser.execute_async_script.called)
+
+
+class MockLibrary(object):
+    def __init__(self, name):
+        self.name = name
+
+
+class MockNamespace(object):
+    def __init__(self, *libnames):
+        self.libraries = [MockLibrary(name) for name in libnames]
+        self._kw_store = Mock(search_order=())
+
+
+class ContextTestCase(BaseTestCase):
+    def setUp(self):
+        super(ContextTestCase, self).setUp()
+        self.namespace = MockNamespace("BuiltIn", "Selenium2Library", "mypageobjects.HomePage")
+        get_namespace_patcher = patch.object(Context, "_get_namespace", return_value=self.namespace)
+        get_namespace_patcher.start()
+        self.addCleanup(get_namespace_patcher.stop)
+        set_order_patcher = patch.object(BuiltIn, "set_library_search_order")
+        self.set_library_search_order = set_order_patcher.start()
+        self.set_library_search_order.side_effect = self.set_search_order
+        self.addCleanup(set_order_patcher.stop)
+        self.addCleanup(setattr, Context, "_current_page", None)
+        self.addCleanup(setattr, Context, "_library_names", None)
+
+    def set_search_order(self, *search_order):
+        Context._get_namespace()._kw_store.search_order = search_order
+
+    def test_get_library_name(self):
+        self.assertEquals(Context.get_library_name("HomePage"), "mypageobjects.HomePage")
+        self.assertIsNone(Context.get_library_name("ResultsPage"))
+
+    def test_get_library_name_sees_newly_imported_libraries(self):
+        self.assertIsNone(Context.get_library_name("ResultsPage"))
+        self.namespace.libraries.append(MockLibrary("mypageobjects.ResultsPage"))
+        self.assertEquals(Context.get_library_name("ResultsPage"), "mypageobjects.ResultsPage")
+
+    def test_set_current_page_only_sets_search_order_when_page_changes(self):
+        Context.set_current_page("mypageobjects.HomePage")
+        Context.set_current_page("mypageobjects.HomePage")
+        self.assertEquals(self.set_library_search_order.call_count, 1)
+        Context.set_current_page("Selenium2Library")
+        self.assertEquals(self.set_library_search_order.call_count, 2)
+
+    def test_set_current_page_after_suite_sets_search_order(self):
+        Context.set_current_page("mypageobjects.HomePage")
+        # Set Library Search Order, called by the suite itself.
+        self.set_search_order("Selenium2Library")
+        Context.set_current_page("mypageobjects.HomePage")
+        self.assertEquals(self.set_library_search_order.call_count, 2)
+        self.assertEquals(self.namespace._kw_store.search_order, ("mypageobjects.HomePage",))
+
+    def test_set_current_page_in_new_namespace_sets_search_order(self):
+        Context.set_current_page("mypageobjects.HomePage")
+        self.assertTrue(Context.has_current_page())
+        Context._get_namespace.return_value = MockNamespace("mypageobjects.HomePage")
+        self.assertFalse(Context.has_current_page())
+        Context.set_current_page("mypageobjects.HomePage")
+        self.assertEquals(self.set_library_search_order.call_count, 2)
+
+
+class KeywordManifestTestCase(BaseTestCase):
+    def setUp(self):
+        super(KeywordManifestTestCase, self).setUp()
+        self.manifest_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.manifest_dir)
+        self.addCleanup(KeywordManifest._manifests.clear)
+        KeywordManifest._manifests.clear()
+        self.p = BaseHomePage()
+        self.p.keyword_manifest_dir = self.manifest_dir
+        self.path = KeywordManifest.get_path(BaseHomePage, self.manifest_dir)
+
+    def test_manifest_written(self):
+        self.assertEquals(self.p.get_keyword_arguments("click_element"), ["locator"])
+        self.assertTrue(os.path.exists(self.path))
+        manifest = KeywordManifest.read(self.path, KeywordManifest._manifests[(BaseHomePage, self.manifest_dir)].key)
+        keyword = manifest.get("click_element")
+        self.assertEquals(keyword["args"], ["locator"])
+        self.assertTrue(keyword["in_s2l"])
+        self.assertTrue(keyword["source"].endswith("_element.py"))
+        self.assertNotIn("get_keyword_names", manifest.names)
+
+    def test_manifest_matches_introspection(self):
+        introspected = BaseHomePage()
+        introspected.keyword_manifest_dir = None
+        for name in self.p.get_keyword_names():
+            self.assertEquals(self.p.get_keyword_arguments(name), introspected.get_keyword_arguments(name))
+            self.assertEquals(self.p.get_keyword_documentation(name), introspected.get_keyword_documentation(name))
+
+    def test_manifest_reused(self):
+        self.p.get_keyword_arguments("click_element")
+        KeywordManifest._manifests.clear()
+        with patch.object(KeywordManifest, "build") as build:
+            self.assertEquals(self.p.get_keyword_arguments("click_element"), ["locator"])
+            self.assertFalse(build.called)
+
+    def test_stale_manifest_rebuilt(self):
+        self.p.get_keyword_arguments("click_element")
+        KeywordManifest._manifests.clear()
+        with patch("robotpageobjects.manifest.get_manifest_key", return_value="changed"):
+            self.assertEquals(self.p.get_keyword_arguments("click_element"), ["locator"])
+        with open(self.path) as f:
+            self.assertTrue('"key":"changed"' in f.read())
+
+    def test_manifest_key_changes_with_exclusions(self):
+        key = get_manifest_key(BaseHomePage)
+        self.addCleanup(_Keywords._exclusions.pop, "click_link", None)
+
+        # Excluded from a module that isn't in BaseHomePage's MRO.
+        @not_keyword
+        def click_link(self, locator):
+            pass
+
+        self.assertNotEquals(get_manifest_key(BaseHomePage), key)
+
+    def test_no_manifest_for_classes_defined_in_functions(self):
+        class P(Page):
+            def foo(self, bar):
+                return self
+
+        p = P()
+        p.keyword_manifest_dir = self.manifest_dir
+        self.assertEquals(p.get_keyword_arguments("foo"), ["bar"])
+        self.assertEquals(os.listdir(self.manifest_dir), [])
+
+
+class LibdocTestCase(BaseTestCase):
+    def test_library_doc_matches_dynamic_api(self):
+        p = BaseHomePage()
+        doc = libdoc.build_library_doc(BaseHomePage)
+        self.assertEquals(doc.name, "basepageobjects.homepage.BaseHomePage")
+        self.assertEquals(doc.scope, "test suite")
+        self.assertEquals(doc.doc, p.get_keyword_documentation("__intro__"))
+        keywords = dict((kw.name, kw) for kw in doc.keywords)
+        self.assertNotIn("Click Element", keywords)
+        self.assertEquals(keywords["Log"].args, p.get_keyword_arguments("log"))
+        # Like libdoc, trailing whitespace is stripped.
+        self.assertEquals(keywords["Get Hash"].doc, p.get_keyword_documentation("get_hash").rstrip())
+        self.assertTrue(keywords["Get Hash"].doc.startswith("*Alias: Get Hash On Base Home Page"))
+
+    def test_keyword_args(self):
+        class MyPage(Page):
+            def search(self, term, wait=10, *args, **kwargs):
+                return self
+
+        keywords = dict((kw.name, kw) for kw in libdoc.build_library_doc(MyPage).keywords)
+        self.assertEquals(keywords["Search"].args, ["term", "wait=10", "*args", "**keywords"])
+
+    def test_library_doc_does_not_instantiate_page_objects(self):
+        with patch.object(BaseHomePage, "__init__") as init:
+            libdoc.build_library_doc(BaseHomePage)
+            self.assertFalse(init.called)
+
+    def test_generate_for_package(self):
+        output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_dir)
+        paths = libdoc.generate("basepageobjects", output_dir, "xml")
+        self.assertEquals(sorted(os.path.basename(path) for path in paths),
+                          ["basepageobjects.homepage.BaseHomePage.xml",
+                           "basepageobjects.resultspage.BaseResultsPage.xml"])
+        with open(paths[0]) as f:
+            self.assertTrue("<keywordspec" in f.read())
+
+    @raises(ValueError)
+    def test_generate_unknown_format(self):
+        libdoc.generate("basepageobjects", os.path.join(tempfile.gettempdir(), "never-created"), "pdf")
+
+
+@skipUnless(selectorcheck, "Needs lxml and cssselect")
+class SelectorCheckTestCase(BaseTestCase):
+    def setUp(self):
+        super(SelectorCheckTestCase, self).setUp()
+        from robotpageobjects import Component
+
+        class ResultComponent(Component):
+            selectors = {"title": "css=p.title",
+                         "bad css": "css=p[title",
+                         "bad prefix": "cs=p"}
+
+        class BasePage(Page):
+            selectors = {"results": "id=results",
+                         "nth result": "xpath=(%(results)s//div[@class='rslt'])[{n}]",
+                         "bad xpath": "//div[@id='results'"}
+            components = {ResultComponent: "css=div.rslt"}
+
+        class SubPage(BasePage):
+            selectors = {Override("bad xpath"): "link=Next"}
+
+        self.component_class, self.base_page_class, self.sub_page_class = ResultComponent, BasePage, SubPage
+
+    def get_messages(self, klass, document=None):
+        return dict((problem.name, (problem.level, problem.message))
+                    for problem in selectorcheck.check_class(klass, document))
+
+    def test_syntax_errors(self):
+        messages = self.get_messages(self.component_class)
+        self.assertEquals(sorted(messages), ['selector "bad css"', 'selector "bad prefix"'])
+        self.assertTrue(messages['selector "bad css"'][1].startswith("invalid CSS selector"))
+        messages = self.get_messages(self.base_page_class)
+        self.assertEquals(messages.keys(), ['selector "bad xpath"'])
+        self.assertEquals(messages['selector "bad xpath"'][0], selectorcheck.ERROR)
+
+    def test_only_own_selectors_and_components_checked(self):
+        self.assertEquals(self.get_messages(self.sub_page_class), {})
+
+    def test_snapshot_matches(self):
+        from lxml import html
+        document = html.fromstring("""<html><body><div id="results">
+            <div class="rslt"><p class="title">One</p></div>
+            <div class="rslt"><p class="title">Two</p></div>
+            </div></body></html>""")
+        self.assertEquals(self.get_messages(self.sub_page_class, document),
+                          {'selector "bad xpath"': (selectorcheck.WARN, "matches no elements")})
+        self.assertEquals(self.get_messages(self.component_class, document)['selector "title"'],
+                          (selectorcheck.WARN, "matches 2 elements"))
+
+    def test_package(self):
+        self.assertEquals(selectorcheck.check_package("basepageobjects"), [])
+
 
 class GetSubclassFromPOModuleTestCase(BaseTestCase):
     def setUp(self):